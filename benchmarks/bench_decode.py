@@ -0,0 +1,70 @@
+"""Response body -> models: json + model_mappers vs compiled schemas
+
+python -m benchmarks.bench_decode
+"""
+
+import timeit
+
+from tmrailwaysapi import json_codec, model_decoders, model_mappers
+
+from . import payloads
+
+
+def mapped_trips(body):
+    return [
+        model_mappers.trip_from_json(trip)
+        for trip in json_codec.loads(body)["data"]["trips"]
+    ]
+
+
+def mapped_price_summary(body):
+    return model_mappers.price_summary_from_json(json_codec.loads(body)["data"])
+
+
+def mapped_seats(body):
+    return model_mappers.seats_from_json(json_codec.loads(body)["data"])
+
+
+def run(number: int = 20) -> None:
+    cases = [
+        (
+            "trip_from_json (2000 trips)",
+            json_codec.dumps(payloads.trips_response(trips=2000)),
+            mapped_trips,
+            model_decoders.trips_from_bytes,
+        ),
+        (
+            "seats_from_json (3x20x54)",
+            json_codec.dumps(payloads.seats_response(wagons=20, seats=54, journeys=3)),
+            mapped_seats,
+            model_decoders.seats_from_bytes,
+        ),
+        (
+            "price_summary_from_json",
+            json_codec.dumps(payloads.price_summary_response(journeys=4)),
+            mapped_price_summary,
+            model_decoders.price_summary_from_bytes,
+        ),
+    ]
+
+    print("json backend: {}".format(json_codec.get_backend()))
+    print("compiled schemas: {}".format(model_decoders.is_compiled()))
+    print(
+        "{:<30}{:>12}{:>12}{:>9}".format("case", "mapped ms", "compiled ms", "speedup")
+    )
+
+    for name, body, mapped, compiled in cases:
+        mapped_time = timeit.timeit(lambda: mapped(body), number=number) / number
+        compiled_time = timeit.timeit(lambda: compiled(body), number=number) / number
+        print(
+            "{:<30}{:>12.3f}{:>12.3f}{:>8.1f}x".format(
+                name,
+                mapped_time * 1000,
+                compiled_time * 1000,
+                mapped_time / compiled_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    run()
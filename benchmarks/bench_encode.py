@@ -0,0 +1,146 @@
+"""Request bodies: dicts built per request vs `request_encoders`
+
+Every booking is for different passengers, as in production.
+
+python -m benchmarks.bench_encode
+"""
+
+import datetime
+import itertools
+import timeit
+from typing import List
+
+from tmrailwaysapi import json_codec, request_encoders
+from tmrailwaysapi.models import RWPassenger
+
+
+def make_passengers(count: int) -> List[RWPassenger]:
+    return [
+        RWPassenger(
+            "Aman",
+            "Amanow",
+            datetime.datetime(1950, 1, 1) + datetime.timedelta(days=i % 20000),
+            "adult",
+            "male",
+            "passport",
+            "I-AS {:06}".format(i),
+        )
+        for i in range(count)
+    ]
+
+
+PASSENGERS = make_passengers(4)
+JOURNEYS = [(7298282, [(350186, 73 + i) for i in range(4)])]
+
+
+def inline_search():
+    return json_codec.dumps(
+        {
+            "source": str(17),
+            "destination": str(21),
+            "date": "01-09-2025",
+            "adult": 2,
+            "child": 0,
+        }
+    )
+
+
+def encoded_search():
+    return request_encoders.encode_search_trips(17, 21, "01-09-2025", 2, 0)
+
+
+def inline_booking(passengers=PASSENGERS):
+    # what the clients and sessions did before `request_encoders`
+    passengers = [
+        {
+            "name": passenger.name,
+            "surname": passenger.surname,
+            "dob": passenger.dob.strftime("%d-%m-%Y"),
+            "tariff": passenger.tariff,
+            "gender": passenger.gender,
+            "identity_type": passenger.identity_type,
+            "identity_number": passenger.identity_number,
+        }
+        for passenger in passengers
+    ]
+    return json_codec.dumps(
+        {
+            "has_media_wifi": False,
+            "has_lunchbox": False,
+            "bedding_type": "default",
+            "api_client": "web",
+            "contact": {
+                "mobile": "+99364000000",
+                "email": "a@example.com",
+                "main_contact": "Aman Amanow",
+            },
+            "passengers": passengers,
+            "outbound": {
+                "selected_journeys": [
+                    {
+                        "id": journey_id,
+                        "seats": [
+                            {"id": seat_id, "train_wagon_id": wagon_id}
+                            for wagon_id, seat_id in seats
+                        ],
+                    }
+                    for journey_id, seats in JOURNEYS
+                ],
+            },
+            "inbound": None,
+        }
+    )
+
+
+def encoded_booking(passengers=PASSENGERS):
+    return request_encoders.encode_booking(
+        "+99364000000", "a@example.com", "Aman Amanow", passengers, JOURNEYS
+    )
+
+
+def distinct_bookings(encode, number):
+    """`encode` called with 4 new passengers every time"""
+    passengers = make_passengers(4 * number)
+    batches = itertools.cycle(
+        [passengers[i : i + 4] for i in range(0, len(passengers), 4)]
+    )
+    return lambda: encode(next(batches))
+
+
+def run(number: int = 20000) -> None:
+    cases = [
+        ("search", inline_search, encoded_search),
+        ("booking (4 pax)", inline_booking, encoded_booking),
+    ]
+
+    print(
+        "{:<18}{:<10}{:>12}{:>12}".format(
+            "payload", "backend", "inline us", "encoder us"
+        )
+    )
+
+    for backend in json_codec.get_available_backends():
+        json_codec.set_backend(backend)
+
+        for name, inline, encoded in cases:
+            assert json_codec.loads(inline()) == json_codec.loads(encoded())
+
+            if inline is inline_booking:
+                inline = distinct_bookings(inline, number)
+                encoded = distinct_bookings(encoded, number)
+
+            inline_time = timeit.timeit(inline, number=number)
+            encoded_time = timeit.timeit(encoded, number=number)
+
+            print(
+                "{:<18}{:<10}{:>12.2f}{:>12.2f}".format(
+                    name,
+                    backend,
+                    inline_time / number * 1e6,
+                    encoded_time / number * 1e6,
+                )
+            )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,46 @@
+"""Decode/encode cost of each JSON backend on representative payloads
+
+python -m benchmarks.bench_json
+"""
+
+import timeit
+
+from tmrailwaysapi import json_codec
+
+from . import payloads
+
+
+def run(number: int = 20) -> None:
+    documents = {
+        "trips (500)": payloads.trips_response(trips=500),
+        "seats (20x54)": payloads.seats_response(wagons=20, seats=54),
+        "price summary": payloads.price_summary_response(),
+    }
+
+    print(
+        "{:<16}{:<10}{:>12}{:>12}{:>10}".format(
+            "payload", "backend", "loads ms", "dumps ms", "KiB"
+        )
+    )
+
+    for name, document in documents.items():
+        for backend in json_codec.get_available_backends():
+            json_codec.set_backend(backend)
+            encoded = json_codec.dumps(document)
+
+            loads = timeit.timeit(lambda: json_codec.loads(encoded), number=number)
+            dumps = timeit.timeit(lambda: json_codec.dumps(document), number=number)
+
+            print(
+                "{:<16}{:<10}{:>12.3f}{:>12.3f}{:>10.1f}".format(
+                    name,
+                    backend,
+                    loads / number * 1000,
+                    dumps / number * 1000,
+                    len(encoded) / 1024,
+                )
+            )
+
+
+if __name__ == "__main__":
+    run()
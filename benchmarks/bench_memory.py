@@ -0,0 +1,83 @@
+"""Memory retained by decoded search results and seat maps
+
+python -m benchmarks.bench_memory
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Callable
+
+from tmrailwaysapi import json_codec, model_decoders, model_mappers
+
+from . import payloads
+
+
+def mapped_trips(body):
+    return [
+        model_mappers.trip_from_json(trip)
+        for trip in json_codec.loads(body)["data"]["trips"]
+    ]
+
+
+def mapped_seats(body):
+    return model_mappers.seats_from_json(json_codec.loads(body)["data"])
+
+
+def lazy_trips(body):
+    return model_decoders.trips_from_bytes(body, lazy=True)
+
+
+def lazy_seats(body):
+    return model_decoders.seats_from_bytes(body, lazy=True)
+
+
+def measure(decode: Callable[[bytes], Any], body: bytes) -> int:
+    """Bytes still allocated by `decode(body)` while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = decode(body)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return retained
+
+
+def run(trips: int = 5000, wagons: int = 20, seats: int = 54) -> None:
+    trips_body = json_codec.dumps(payloads.trips_response(trips=trips))
+    seats_body = json_codec.dumps(
+        payloads.seats_response(wagons=wagons, seats=seats, journeys=3)
+    )
+    seat_count = wagons * seats * 3
+
+    cases = [
+        ("trips", "mapped", mapped_trips, trips_body, trips),
+        ("trips", "compiled", model_decoders.trips_from_bytes, trips_body, trips),
+        ("trips", "lazy", lazy_trips, trips_body, trips),
+        ("seats", "mapped", mapped_seats, seats_body, seat_count),
+        ("seats", "compiled", model_decoders.seats_from_bytes, seats_body, seat_count),
+        ("seats", "lazy", lazy_seats, seats_body, seat_count),
+    ]
+
+    print("json backend: {}".format(json_codec.get_backend()))
+    print("compiled schemas: {}".format(model_decoders.is_compiled()))
+    print(
+        "{:<8}{:<10}{:>10}{:>12}{:>12}".format(
+            "result", "path", "items", "KiB", "B/item"
+        )
+    )
+
+    for name, path, decode, body, items in cases:
+        retained = measure(decode, body)
+        print(
+            "{:<8}{:<10}{:>10}{:>12.1f}{:>12.1f}".format(
+                name, path, items, retained / 1024, retained / items
+            )
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,82 @@
+"""CPU cost of each endpoint without a network, through `RWFakeTransport`
+
+Time spent building the request, in the client and parsing the
+response, i.e. the floor any transport adds its I/O to.
+
+python -m benchmarks.bench_protocol
+"""
+
+import datetime
+import timeit
+
+from tmrailwaysapi import RWClient, RWFakeTransport, RWLocation, json_codec
+from tmrailwaysapi.models import RWContact, RWPassenger
+
+from . import payloads
+
+SRC = RWLocation(id=17, name="Aşgabat")
+DEST = RWLocation(id=21, name="Daşoguz")
+CONTACT = RWContact("+99364000000", "a@example.com", "Aman Amanow")
+PASSENGER = RWPassenger(
+    "Aman",
+    "Amanow",
+    datetime.datetime(1990, 1, 1),
+    "adult",
+    "male",
+    "passport",
+    "I-AS 000001",
+)
+BOOKING = {
+    "success": True,
+    "data": {
+        "booking": {
+            "booking_number": "NKXNCZ",
+            "expire_time": "2025-08-17T18:14:46.547555+05:00",
+            "orderNumber": "NKXNCZ-17082025175946",
+            "formUrl": "https://example.com/pay",
+        }
+    },
+}
+
+
+def run(number: int = 20) -> None:
+    transport = RWFakeTransport()
+    transport.add_response("POST", "/railway-api/trips", payloads.trips_response())
+    transport.add_response(
+        "POST", "/railway-api/trips/7000000", payloads.seats_response()
+    )
+    transport.add_response(
+        "GET",
+        "/railway-api/trips/7000000/price_summary?",
+        payloads.price_summary_response(),
+    )
+    transport.add_response("POST", "/railway-api/bookings", BOOKING)
+    client = RWClient(transport=transport)
+
+    date = datetime.date(2025, 9, 1)
+    trip = client.search_trips(SRC, DEST, date, 1)[0]
+    journey = client.get_seats(trip, trip.wagon_types[0], 1).outbound.journeys[0]
+    wagon = journey.train_wagons[0]
+
+    cases = [
+        ("search (500 trips)", lambda: client.search_trips(SRC, DEST, date, 1)),
+        ("seats (20x54)", lambda: client.get_seats(trip, trip.wagon_types[0], 1)),
+        ("price summary", lambda: client.get_price_summary(trip)),
+        (
+            "booking",
+            lambda: client.book_tickets(
+                CONTACT, [PASSENGER], journey, wagon, wagon.seats[0]
+            ),
+        ),
+    ]
+
+    print("json backend: {}".format(json_codec.get_backend()))
+    print("{:<20}{:>12}".format("endpoint", "ms"))
+
+    for name, call in cases:
+        elapsed = timeit.timeit(call, number=number)
+        print("{:<20}{:>12.3f}".format(name, elapsed / number * 1000))
+
+
+if __name__ == "__main__":
+    run()
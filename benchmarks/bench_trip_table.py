@@ -0,0 +1,58 @@
+"""Filter + rank search results: loops over RWTrip vs RWTripTable
+
+python -m benchmarks.bench_trip_table
+"""
+
+import timeit
+
+from tmrailwaysapi import json_codec, model_decoders
+from tmrailwaysapi.trip_table import RWTripTable
+
+from . import payloads
+
+
+def min_price(trip):
+    prices = [wagon.price for wagon in trip.wagon_types if wagon.has_seats]
+    return min(prices) if prices else float("inf")
+
+
+def query_trips(trips):
+    matching = [
+        trip
+        for trip in trips
+        if trip.travel_time <= 600 and trip.distance <= 900 and min_price(trip) <= 150
+    ]
+    return sorted(matching, key=min_price)[:10]
+
+
+def query_table(table):
+    return table.filter(max_travel_time=600, max_distance=900, max_price=150).top_k(
+        10, "price"
+    )
+
+
+def run(number: int = 20) -> None:
+    print(
+        "{:<10}{:>12}{:>12}{:>12}{:>9}".format(
+            "trips", "build ms", "loops ms", "table ms", "speedup"
+        )
+    )
+
+    for size in (1000, 10000, 50000):
+        trips = model_decoders.trips_from_bytes(
+            json_codec.dumps(payloads.trips_response(trips=size))
+        )
+        build = timeit.timeit(lambda: RWTripTable(trips), number=1)
+        table = RWTripTable(trips)
+
+        loops = timeit.timeit(lambda: query_trips(trips), number=number) / number
+        vectorized = timeit.timeit(lambda: query_table(table), number=number) / number
+        print(
+            "{:<10}{:>12.3f}{:>12.3f}{:>12.3f}{:>8.1f}x".format(
+                size, build * 1000, loops * 1000, vectorized * 1000, loops / vectorized
+            )
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,169 @@
+"""Response payloads shaped like the ones the railway API returns
+
+Sizes are tunable so the benchmarks can be run on search results and
+seat maps larger than a typical single response.
+"""
+
+import datetime
+import random
+from typing import Any, Dict, List
+
+STATIONS = [
+    "Aşgabat",
+    "Daşoguz",
+    "Türkmenabat",
+    "Türkmenbaşy",
+    "Mary",
+    "Balkanabat",
+    "Tejen",
+    "Baýramaly",
+]
+WAGON_TYPES = [(1, "Kupe"), (2, "Platskart"), (3, "Oturgyçly"), (4, "SW")]
+SERVICE_TYPES = [(1, "Ýolagçy otlusy"), (2, "Çalt otly")]
+
+
+def _time(base: datetime.datetime, minutes: int) -> str:
+    return (base + datetime.timedelta(minutes=minutes)).isoformat()
+
+
+def journey_json(
+    rng: random.Random, journey_id: int, base: datetime.datetime
+) -> Dict[str, Any]:
+    source, destination = rng.sample(STATIONS, 2)
+    service_type_id, service_type_title = rng.choice(SERVICE_TYPES)
+    travel_time = rng.randint(120, 900)
+
+    return {
+        "id": journey_id,
+        "source": source,
+        "destination": destination,
+        "departure_time": _time(base, 0),
+        "arrival_time": _time(base, travel_time),
+        "travel_time": travel_time,
+        "train_run_number": str(rng.randint(1, 99)).zfill(3),
+        "service_type_id": service_type_id,
+        "service_type_title": service_type_title,
+        "distance": rng.randint(50, 1100),
+    }
+
+
+def trip_json(rng: random.Random, trip_id: int, journeys: int = 1) -> Dict[str, Any]:
+    base = datetime.datetime(
+        2025, 9, 1, 6, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=5))
+    )
+    base += datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+    journey_list = [
+        journey_json(rng, trip_id * 10 + i, base + datetime.timedelta(hours=16 * i))
+        for i in range(journeys)
+    ]
+
+    return {
+        "id": trip_id,
+        "source": journey_list[0]["source"],
+        "destination": journey_list[-1]["destination"],
+        "departure_time": journey_list[0]["departure_time"],
+        "arrival_time": journey_list[-1]["arrival_time"],
+        "travel_time": sum(journey["travel_time"] for journey in journey_list),
+        "distance": sum(journey["distance"] for journey in journey_list),
+        "wagon_types": [
+            {
+                "wagon_type_id": wagon_type_id,
+                "wagon_type_title": wagon_type_title,
+                "price": round(rng.uniform(20, 300), 2),
+                "has_seats": rng.random() > 0.2,
+            }
+            for wagon_type_id, wagon_type_title in WAGON_TYPES
+        ],
+        "journeys": journey_list,
+    }
+
+
+def trips_response(trips: int = 500, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "success": True,
+        "data": {
+            "trips": [
+                trip_json(rng, 7000000 + i, journeys=1 + (i % 5 == 0))
+                for i in range(trips)
+            ]
+        },
+    }
+
+
+def wagon_seats_json(
+    rng: random.Random, wagon_id: int, number: int, seats: int
+) -> Dict[str, Any]:
+    wagon_type_id, wagon_type_title = rng.choice(WAGON_TYPES)
+
+    return {
+        "id": wagon_id,
+        "layout_map": "kupe_36" if wagon_type_id == 1 else "platskart_54",
+        "number": number,
+        "seats": [
+            {
+                "id": seat,
+                "available": rng.random() > 0.6,
+                "label": str(seat),
+                "level": str(2 if seat % 2 == 0 else 1),
+            }
+            for seat in range(1, seats + 1)
+        ],
+        "wagon_type_id": wagon_type_id,
+        "wagon_type_title": wagon_type_title,
+    }
+
+
+def seats_response(
+    wagons: int = 20, seats: int = 54, journeys: int = 1, seed: int = 1
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    base = datetime.datetime(2025, 9, 1, 6, 0)
+    journey_list = []
+
+    for i in range(journeys):
+        journey = journey_json(rng, 7298282 + i, base)
+        journey["train_wagons"] = [
+            wagon_seats_json(rng, 350000 + i * 100 + number, number, seats)
+            for number in range(1, wagons + 1)
+        ]
+        journey_list.append(journey)
+
+    return {
+        "success": True,
+        "data": {"outbound": {"trip_id": 7298282, "journeys": journey_list}},
+    }
+
+
+def price_summary_response(journeys: int = 2, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    trip = trip_json(rng, 7298282, journeys=journeys)
+    del trip["wagon_types"]
+
+    for journey in trip["journeys"]:
+        journey["prices"] = [
+            {
+                "wagon_type_id": wagon_type_id,
+                "wagon_type_title": wagon_type_title,
+                "adult": round(rng.uniform(20, 300), 2),
+                "child": round(rng.uniform(10, 150), 2),
+            }
+            for wagon_type_id, wagon_type_title in WAGON_TYPES
+        ]
+
+    return {
+        "success": True,
+        "data": {
+            "outbound": trip,
+            "inbound": trip,
+            "price_formation": [
+                {"id": 1, "title": "Bilet", "amount": 100},
+                {"id": 2, "title": "Düşek", "amount": 15},
+                {"id": 3, "title": "Media Wi-Fi", "amount": 10},
+            ],
+        },
+    }
+
+
+def trips_list(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return response["data"]["trips"]
@@ -0,0 +1,28 @@
+import datetime
+from collections import UserList
+
+
+def as_data(value):
+    """Comparable form of a model tree, keeping leaf types"""
+    if isinstance(value, (list, UserList)):
+        return [as_data(item) for item in value]
+    if isinstance(value, tuple):
+        return (type(value).__name__,) + tuple(as_data(item) for item in value)
+    if hasattr(value, "__dict__") or hasattr(type(value), "__slots__"):
+        names = getattr(type(value), "__slots__", None) or vars(value)
+        return (type(value).__name__,) + tuple(
+            as_data(getattr(value, name)) for name in names
+        )
+    if isinstance(value, datetime.datetime):
+        return (value, value.utcoffset())
+    return (type(value), value)
+
+
+class FakeClock:
+    """Clock callable whose time only moves when `now` is set"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from tmrailwaysapi import RWAsyncClient, RWPoolConfig
+from tmrailwaysapi.pool import create_connector
+
+
+async def hello(request):
+    # keeps the connection acquired until the body is read
+    response = web.StreamResponse()
+    await response.prepare(request)
+    await response.write(b'{"success": ')
+    await asyncio.sleep(0.01)
+    await response.write(b"true}")
+    await response.write_eof()
+    return response
+
+
+class TestAsyncSession:
+    def test_context_manager_closes_fast(self):
+        async def main():
+            started_at = time.monotonic()
+            async with RWAsyncClient() as client:
+                pass
+            return client, time.monotonic() - started_at
+
+        client, elapsed = asyncio.run(main())
+
+        assert client._session._client_session.closed
+        assert elapsed < 0.5
+
+    def test_close_waits_for_connections(self):
+        async def main():
+            app = web.Application()
+            app.router.add_get("/", hello)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            session = aiohttp.ClientSession(connector=create_connector(RWPoolConfig()))
+            async with session.get("http://127.0.0.1:{}/".format(port)) as response:
+                sock = response.connection.transport.get_extra_info("socket")
+                await response.read()
+
+            await session.close()
+            closed = sock.fileno() == -1
+            await runner.cleanup()
+            return closed
+
+        # RWAsyncSession.close relies on it, see the aiohttp floor in pyproject
+        assert asyncio.run(main())
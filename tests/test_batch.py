@@ -0,0 +1,95 @@
+import asyncio
+import datetime
+
+from tmrailwaysapi import RWAsyncClient, RWLocation, RWTripQuery
+from tmrailwaysapi.batch import bounded_as_completed, date_range
+
+
+SRC = RWLocation(id=17, name="Aşgabat")
+DEST = RWLocation(id=21, name="Daşoguz")
+
+
+class FakeSearchClient(RWAsyncClient):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search_trips(self, src_location, dest_location, date, adults, children=0):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if date.day == 3:
+            raise RuntimeError("bad day")
+        return [date]
+
+
+class TestBatch:
+    def test_date_range(self):
+        dates = date_range(datetime.date(2025, 8, 30), datetime.datetime(2025, 9, 2))
+        assert dates[0] == datetime.date(2025, 8, 30)
+        assert dates[-1] == datetime.date(2025, 9, 2)
+        assert len(dates) == 4
+
+    def test_bounded_as_completed(self):
+        async def main():
+            async def value(delay, result):
+                await asyncio.sleep(delay)
+                return result
+
+            awaitables = (value(delay, delay) for delay in (0.03, 0.01, 0.02))
+            return [result async for result in bounded_as_completed(awaitables, 3)]
+
+        assert asyncio.run(main()) == [0.01, 0.02, 0.03]
+
+    def test_search_trips_range(self):
+        async def main():
+            client = FakeSearchClient()
+            try:
+                results = await client.search_trips_range(
+                    SRC,
+                    DEST,
+                    datetime.date(2025, 9, 1),
+                    datetime.date(2025, 9, 10),
+                    adults=1,
+                    concurrency=3,
+                )
+            finally:
+                await client.close()
+            return client, results
+
+        client, results = asyncio.run(main())
+
+        assert client.max_in_flight == 3
+        assert len(results) == 10
+        assert not results[datetime.date(2025, 9, 3)].ok
+        assert results[datetime.date(2025, 9, 4)].trips == [datetime.date(2025, 9, 4)]
+
+    def test_search_trips_batch(self):
+        async def main():
+            client = FakeSearchClient()
+            date = datetime.date(2025, 9, 1)
+            queries = [
+                RWTripQuery(SRC, DEST, date, 1),
+                RWTripQuery(DEST, SRC, date, 1),
+                RWTripQuery(SRC, DEST, date, 1),
+                RWTripQuery(SRC, DEST, date.replace(day=3), 1),
+            ]
+            try:
+                batch = client.search_trips_batch(queries, concurrency=2)
+                results = [result async for result in batch]
+            finally:
+                await client.close()
+            return batch.stats, results
+
+        stats, results = asyncio.run(main())
+
+        assert len(results) == 3
+        assert stats.submitted == 4
+        assert stats.duplicates == 1
+        assert stats.completed == 3
+        assert stats.failed == 1
+        assert stats.throughput > 0
+        assert stats.get_latency_percentile(95) >= stats.get_latency_percentile(50)
@@ -0,0 +1,264 @@
+import asyncio
+import datetime
+
+import pytest
+import requests
+
+from benchmarks import payloads
+from tmrailwaysapi import RWAsyncClient, RWClient, json_codec, model_mappers
+from tmrailwaysapi.fake_transport import RWAsyncFakeTransport
+from tmrailwaysapi.models import RWContact, RWPassenger
+from tmrailwaysapi.seat_selection import RWJourneySelection
+from tmrailwaysapi.session import RWSession
+
+BOOKING_RESPONSE = {
+    "success": True,
+    "data": {
+        "booking": {
+            "booking_number": "NKXNCZ",
+            "expire_time": "2025-08-17T18:14:46.547555+05:00",
+            "orderNumber": "NKXNCZ-17082025175946",
+            "formUrl": "https://example.com/pay",
+        }
+    },
+}
+
+CONTACT = RWContact("+99364000000", "a@example.com", "Aman Amanow")
+PASSENGERS = [
+    RWPassenger(
+        "Aman",
+        "Amanow",
+        datetime.datetime(1990, 1, 1),
+        "adult",
+        "male",
+        "passport",
+        "I-AS 000001",
+    ),
+    RWPassenger(
+        "Jeren",
+        "Amanowa",
+        datetime.datetime(2015, 1, 1),
+        "child",
+        "female",
+        "birth_certificate",
+        "I-AS 000002",
+    ),
+]
+
+
+class RecordingAdapter(requests.adapters.BaseAdapter):
+    """Records request bodies instead of sending them"""
+
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = bodies
+
+    def send(self, request, **kwargs):
+        self.bodies.append(json_codec.loads(request.body))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json_codec.dumps(BOOKING_RESPONSE)
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingSession(RWSession):
+    def __init__(self):
+        super().__init__(hostname="example.com")
+        self.bodies = []
+        self._http_session.mount("https://", RecordingAdapter(self.bodies))
+
+
+def get_journey(seed=1):
+    response = payloads.seats_response(wagons=3, seats=36, seed=seed)
+    return model_mappers.seats_from_json(response["data"]).outbound.journeys[0]
+
+
+def get_seats(journeys=2):
+    response = payloads.seats_response(wagons=3, seats=36, journeys=journeys)
+    return model_mappers.seats_from_json(response["data"])
+
+
+def free_seats(wagon, count):
+    return [(wagon, seat) for seat in wagon.seats if seat.available][:count]
+
+
+def selected_seats(body, direction):
+    return [
+        (seat["train_wagon_id"], seat["id"])
+        for journey in body[direction]["selected_journeys"]
+        for seat in journey["seats"]
+    ]
+
+
+class TestBooking:
+    def setup_method(self):
+        self.client = RWClient(hostname="example.com")
+        self.session = self.client._session = RecordingSession()
+
+    def test_single_seat(self):
+        journey = get_journey()
+        wagon = journey.train_wagons[0]
+
+        booking = self.client.book_tickets(
+            CONTACT, PASSENGERS[:1], journey, wagon, wagon.seats[4]
+        )
+
+        assert booking.booking_number == "NKXNCZ"
+        (body,) = self.session.bodies
+        assert selected_seats(body, "outbound") == [(wagon.id, wagon.seats[4].id)]
+        assert body["inbound"] is None
+
+    def test_multiple_seats(self):
+        outbound = get_journey(1)
+        inbound = get_journey(2)
+        first, second = outbound.train_wagons[:2]
+
+        self.client.book_tickets(
+            CONTACT,
+            PASSENGERS,
+            outbound,
+            outbound_seats=[(first, first.seats[0]), (second, second.seats[5])],
+            inbound_journey=inbound,
+            inbound_seats=[
+                (inbound.train_wagons[2], seat)
+                for seat in inbound.train_wagons[2].seats[:2]
+            ],
+        )
+
+        (body,) = self.session.bodies
+        assert len(body["passengers"]) == 2
+        assert body["outbound"]["selected_journeys"][0]["id"] == outbound.id
+        assert selected_seats(body, "outbound") == [
+            (first.id, first.seats[0].id),
+            (second.id, second.seats[5].id),
+        ]
+        assert body["inbound"]["selected_journeys"][0]["id"] == inbound.id
+        assert selected_seats(body, "inbound") == [
+            (inbound.train_wagons[2].id, 1),
+            (inbound.train_wagons[2].id, 2),
+        ]
+
+    def test_multiple_journeys(self):
+        seats = get_seats(journeys=2)
+        first, second = seats.outbound.journeys
+        selections = [
+            RWJourneySelection(first, free_seats(first.train_wagons[0], 2)),
+            RWJourneySelection(second, free_seats(second.train_wagons[2], 2)),
+        ]
+
+        self.client.book_tickets(
+            CONTACT, PASSENGERS, outbound_selections=selections, seats=seats
+        )
+
+        (body,) = self.session.bodies
+        assert [
+            (
+                journey["id"],
+                [(seat["train_wagon_id"], seat["id"]) for seat in journey["seats"]],
+            )
+            for journey in body["outbound"]["selected_journeys"]
+        ] == [
+            (
+                selection.journey.id,
+                [(wagon.id, seat.id) for wagon, seat in selection.seats],
+            )
+            for selection in selections
+        ]
+        assert body["inbound"] is None
+
+    def test_validation_against_fetched_seats(self):
+        seats = get_seats(journeys=2)
+        first, second = seats.outbound.journeys
+        wagon = first.train_wagons[0]
+        taken = next(seat for seat in wagon.seats if not seat.available)
+        valid = [
+            RWJourneySelection(first, free_seats(wagon, 2)),
+            RWJourneySelection(second, free_seats(second.train_wagons[0], 2)),
+        ]
+        invalid = [
+            # second journey missing
+            valid[:1],
+            # journey selected twice
+            [valid[0], valid[0]],
+            # seat already taken
+            [RWJourneySelection(first, [(wagon, taken)]), valid[1]],
+            # wagon of another journey
+            [
+                RWJourneySelection(first, free_seats(second.train_wagons[1], 2)),
+                valid[1],
+            ],
+            # different number of seats per journey
+            [valid[0], RWJourneySelection(second, valid[1].seats[:1])],
+        ]
+
+        for selections in invalid:
+            with pytest.raises(ValueError):
+                self.client.book_tickets(
+                    CONTACT, PASSENGERS, outbound_selections=selections, seats=seats
+                )
+        with pytest.raises(ValueError):
+            # a single journey does not cover the trip
+            self.client.book_tickets(
+                CONTACT, PASSENGERS, first, outbound_seats=valid[0].seats, seats=seats
+            )
+        assert self.session.bodies == []
+
+    def test_invalid_selections(self):
+        journey = get_journey()
+        wagon = journey.train_wagons[0]
+
+        with pytest.raises(ValueError):
+            self.client.book_tickets(CONTACT, PASSENGERS, journey)
+        with pytest.raises(ValueError):
+            self.client.book_tickets(
+                CONTACT,
+                PASSENGERS,
+                journey,
+                wagon,
+                wagon.seats[0],
+                outbound_seats=[(wagon, wagon.seats[1])],
+            )
+        with pytest.raises(ValueError):
+            self.client.book_tickets(
+                CONTACT,
+                PASSENGERS,
+                journey,
+                outbound_seats=[(wagon, wagon.seats[1]), (wagon, wagon.seats[1])],
+            )
+        with pytest.raises(ValueError):
+            self.client.book_tickets(
+                CONTACT,
+                PASSENGERS,
+                journey,
+                outbound_seats=[(wagon, wagon.seats[1])],
+                inbound_journey=journey,
+            )
+        assert self.session.bodies == []
+
+    def test_async(self):
+        async def main():
+            transport = RWAsyncFakeTransport()
+            transport.add_response("POST", "/railway-api/bookings", BOOKING_RESPONSE)
+            client = RWAsyncClient(transport=transport)
+            journey = get_journey()
+            wagon = journey.train_wagons[1]
+
+            booking = await client.book_tickets(
+                CONTACT,
+                PASSENGERS,
+                journey,
+                outbound_seats=[(wagon, seat) for seat in wagon.seats[:2]],
+            )
+
+            assert booking.order_number == "NKXNCZ-17082025175946"
+            (request,) = transport.requests
+            body = json_codec.loads(request.body)
+            assert body["outbound"]["selected_journeys"][0]["id"] == journey.id
+            assert selected_seats(body, "outbound") == [(wagon.id, 1), (wagon.id, 2)]
+            assert body["inbound"] is None
+
+        asyncio.run(main())
@@ -0,0 +1,129 @@
+import asyncio
+import datetime
+import time
+
+from tmrailwaysapi import RWAsyncClient
+from tmrailwaysapi.bulk_booking import RWBookingRequest, RWHoldTracker
+from tmrailwaysapi.models import RWBooking, RWContact
+from tests.helpers import FakeClock
+
+CONTACT = RWContact(mobile="+99361234567", email="a@b.tm", main_contact="A B")
+EPOCH = datetime.datetime(2025, 9, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_booking(number, expires_in, now=None):
+    now = EPOCH.timestamp() if now is None else now
+    expire_time = datetime.datetime.fromtimestamp(
+        now + expires_in, datetime.timezone.utc
+    )
+    return RWBooking(str(number), expire_time, "o" + str(number), "")
+
+
+class FakeBookingClient(RWAsyncClient):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def book_tickets(self, contact, passengers, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if passengers[0] == "taken":
+            raise RuntimeError("seat taken")
+        return make_booking(passengers[0], 600, time.time())
+
+
+class TestBulkBooking:
+    def test_book_tickets_batch(self):
+        async def main():
+            client = FakeBookingClient()
+            tracker = RWHoldTracker()
+            requests = [RWBookingRequest(CONTACT, [str(i)]) for i in range(10)]
+            requests.append(RWBookingRequest(CONTACT, ["taken"], bedding_type="none"))
+
+            batch = client.book_tickets_batch(requests, 3, tracker)
+            results = [result async for result in batch]
+            await client.close()
+            return client, tracker, batch, results
+
+        client, tracker, batch, results = asyncio.run(main())
+
+        assert client.max_in_flight == 3
+        assert client.calls[-1]["bedding_type"] == "none"
+        assert client.calls[-1]["seats"] is None
+        assert len(results) == 11
+        failed = [result for result in results if not result.ok]
+        assert len(failed) == 1
+        assert failed[0].request.passengers == ["taken"]
+        assert isinstance(failed[0].error, RuntimeError)
+        assert len(tracker) == 10
+        assert "3" in tracker and "taken" not in tracker
+        assert batch.stats.completed == 11
+        assert batch.stats.failed == 1
+
+    def test_pop_due(self):
+        clock = FakeClock(EPOCH.timestamp())
+        tracker = RWHoldTracker(lead_time=60, clock=clock)
+
+        for number, expires_in in [(1, 300), (2, 100), (3, 200), (4, 50)]:
+            tracker.add(make_booking(number, expires_in))
+        tracker.remove("3")
+
+        assert tracker.get_next_due() == EPOCH.timestamp() - 10
+        events = tracker.pop_due()
+        assert [event.booking.booking_number for event in events] == ["4"]
+        assert events[0].expires_in == 50
+
+        clock.now += 250
+        events = tracker.pop_due()
+        assert [event.booking.booking_number for event in events] == ["2", "1"]
+        assert events[1].expires_in == 50
+        assert len(tracker) == 0
+        assert tracker.get_next_due() is None
+
+    def test_readded_booking_uses_new_expiry(self):
+        clock = FakeClock(EPOCH.timestamp())
+        tracker = RWHoldTracker(lead_time=0, clock=clock)
+
+        tracker.add(make_booking(1, 10))
+        tracker.add(make_booking(1, 100))
+
+        clock.now += 50
+        assert tracker.pop_due() == []
+        clock.now += 50
+        assert len(tracker.pop_due()) == 1
+
+    def test_callbacks(self):
+        async def main():
+            sync_events = []
+            async_events = []
+
+            async def on_expiring(event):
+                async_events.append(event)
+
+            def failing(event):
+                raise RuntimeError("callback")
+
+            async with RWHoldTracker(lead_time=60) as tracker:
+                tracker.add_callback(sync_events.append)
+                tracker.add_callback(failing)
+                tracker.add_callback(on_expiring)
+
+                await asyncio.sleep(0.01)
+                tracker.add(make_booking(1, 60.05, time.time()))
+                tracker.add(make_booking(2, 3600, time.time()))
+
+                await asyncio.sleep(0.2)
+
+            return tracker, sync_events, async_events
+
+        tracker, sync_events, async_events = asyncio.run(main())
+
+        assert [event.booking.booking_number for event in sync_events] == ["1"]
+        assert async_events == sync_events
+        assert len(tracker) == 1
@@ -0,0 +1,111 @@
+import asyncio
+import datetime
+
+from benchmarks import payloads
+from tmrailwaysapi import json_codec, model_decoders
+from tmrailwaysapi.batch import RWTripBatch
+from tmrailwaysapi.fare_calendar import RWFareCalendar, get_min_prices
+from tmrailwaysapi.models import RWLocation
+from tests.helpers import FakeClock
+
+SRC = RWLocation(id=1, name="Aşgabat")
+DEST = RWLocation(id=2, name="Mary")
+
+
+class FakeClient:
+    def __init__(self):
+        self.searches = []
+        self.failing = set()
+
+    def search_trips_batch(self, queries, concurrency=16):
+        return RWTripBatch(self, queries, concurrency)
+
+    async def search_trips(self, src, dest, date, adults, children=0):
+        self.searches.append(date)
+        await asyncio.sleep(0)
+        if date in self.failing:
+            raise ConnectionError("down")
+
+        body = json_codec.dumps(payloads.trips_response(trips=8, seed=date.toordinal()))
+        return model_decoders.trips_from_bytes(body)
+
+
+START = datetime.date(2025, 9, 1)
+END = datetime.date(2025, 9, 30)
+
+
+class TestFareCalendar:
+    def test_min_prices(self):
+        async def main():
+            client = FakeClient()
+            calendar = RWFareCalendar(client)
+            days = await calendar.get(SRC, DEST, START, END)
+
+            assert [day.date for day in days] == [
+                START + datetime.timedelta(days=i) for i in range(30)
+            ]
+            for day in days:
+                trips = await client.search_trips(SRC, DEST, day.date, 1)
+                expected = get_min_prices(trips)
+                assert day.min_prices == expected
+                assert day.min_price == min(expected.values())
+                assert all(
+                    day.min_prices[wagon.id] <= wagon.price
+                    for trip in trips
+                    for wagon in trip.wagon_types
+                    if wagon.has_seats
+                )
+
+        asyncio.run(main())
+
+    def test_refreshes_only_stale_days(self):
+        async def main():
+            client = FakeClient()
+            clock = FakeClock()
+            calendar = RWFareCalendar(client, ttl=60, clock=clock)
+
+            await calendar.get(SRC, DEST, START, START + datetime.timedelta(days=9))
+            assert len(client.searches) == 10
+
+            clock.now = 30
+            await calendar.get(SRC, DEST, START, END)
+            assert len(client.searches) == 30
+
+            client.searches.clear()
+            await calendar.get(SRC, DEST, START, END)
+            assert client.searches == []
+
+            # the first ten days were fetched 70s ago, the rest 40s ago
+            clock.now = 70
+            await calendar.get(SRC, DEST, START, END)
+            assert sorted(client.searches) == [
+                START + datetime.timedelta(days=i) for i in range(10)
+            ]
+
+        asyncio.run(main())
+
+    def test_failed_days(self):
+        async def main():
+            client = FakeClient()
+            clock = FakeClock()
+            calendar = RWFareCalendar(client, ttl=60, clock=clock)
+            await calendar.get(SRC, DEST, START, START)
+
+            second = START + datetime.timedelta(days=1)
+            client.failing = {START, second}
+            clock.now = 100
+            first_day, second_day = await calendar.get(SRC, DEST, START, second)
+
+            # stale prices are kept, the day is retried on the next view
+            assert not first_day.ok
+            assert first_day.min_price is not None
+            assert not second_day.ok
+            assert second_day.min_price is None
+
+            client.failing = set()
+            client.searches.clear()
+            days = await calendar.get(SRC, DEST, START, second)
+            assert all(day.ok for day in days)
+            assert sorted(client.searches) == [START, second]
+
+        asyncio.run(main())
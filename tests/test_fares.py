@@ -0,0 +1,114 @@
+import pytest
+
+from benchmarks import payloads
+from tmrailwaysapi import model_mappers
+from tmrailwaysapi.fares import RWFareEngine, get_trip_prices
+from tmrailwaysapi.response_cache import RWResponseCache
+
+
+def make_summary(seed=1, journeys=2, round_trip=True):
+    data = payloads.price_summary_response(journeys=journeys, seed=seed)["data"]
+    data["outbound"] = dict(data["outbound"], id=7000000 + seed)
+    if not round_trip:
+        del data["inbound"]
+    return model_mappers.price_summary_from_json(data)
+
+
+def walk(trip_price, wagon_type_id, adults, children):
+    """What every caller used to write by hand"""
+    total = 0
+    for journey in trip_price.journeys:
+        for price in journey.prices:
+            if price.id == wagon_type_id:
+                total += price.adult * adults + price.child * children
+    return total
+
+
+class TestFareEngine:
+    def setup_class(self):
+        self.engine = RWFareEngine()
+
+    def test_trip_prices(self):
+        summary = make_summary()
+        prices = get_trip_prices(summary.outbound)
+
+        assert sorted(prices) == [1, 2, 3, 4]
+        assert prices[2][0] == pytest.approx(walk(summary.outbound, 2, 1, 0))
+        assert prices[2][1] == pytest.approx(walk(summary.outbound, 2, 0, 1))
+
+    def test_one_way(self):
+        summary = make_summary(round_trip=False)
+        fare = self.engine.compute(summary, adults=2, children=1, wagon_type_id=3)
+
+        assert fare.inbound == 0
+        assert fare.inbound_trip_id == -1
+        assert fare.total == pytest.approx(walk(summary.outbound, 3, 2, 1), abs=0.01)
+
+    def test_round_trip_and_extras(self):
+        summary = make_summary()
+        fare = self.engine.compute(
+            summary,
+            adults=1,
+            children=2,
+            wagon_type_id=1,
+            inbound_wagon_type_id=4,
+            extras=[2, 3],
+        )
+
+        assert fare.outbound == pytest.approx(walk(summary.outbound, 1, 1, 2), abs=0.01)
+        assert fare.inbound == pytest.approx(walk(summary.inbound, 4, 1, 2), abs=0.01)
+        # 25 per passenger per direction
+        assert fare.extras == 25 * 3 * 2
+        assert fare.total == pytest.approx(
+            fare.outbound + fare.inbound + fare.extras, abs=0.01
+        )
+
+    def test_cheapest_by_default(self):
+        summary = make_summary()
+        fare = self.engine.compute(summary, adults=1)
+        prices = get_trip_prices(summary.outbound)
+
+        assert prices[fare.wagon_type_id][0] == min(
+            adult for adult, _ in prices.values()
+        )
+
+    def test_errors(self):
+        summary = make_summary()
+
+        with pytest.raises(ValueError):
+            self.engine.compute(summary, adults=1, wagon_type_id=99)
+        with pytest.raises(ValueError):
+            self.engine.compute(summary, adults=1, wagon_type_id=1, extras=[42])
+
+    def test_compute_many(self):
+        summaries = [make_summary(seed=seed) for seed in range(5)]
+        mixes = [(1, 0), (2, 1), (0, 3)]
+        fares = self.engine.compute_many(summaries, mixes, wagon_type_ids=[1, 2, 9])
+
+        assert len(fares) == 5 * 2 * 3
+        for fare in fares:
+            summary = self.engine.get(fare.outbound_trip_id, fare.inbound_trip_id)
+            assert fare == self.engine.compute(
+                summary, fare.adults, fare.children, fare.wagon_type_id
+            )
+
+    def test_cache(self):
+        cache = RWResponseCache()
+        engine = RWFareEngine(cache)
+        summary = make_summary()
+
+        class Client:
+            calls = 0
+
+            def get_price_summary(self, outbound_trip, inbound_trip=None):
+                Client.calls += 1
+                return summary
+
+        client = Client()
+        outbound, inbound = summary.outbound, summary.inbound
+
+        assert engine.fetch(client, outbound, inbound) is summary
+        assert engine.fetch(client, outbound, inbound) is summary
+        assert Client.calls == 1
+        # same key as RWClient.get_price_summary
+        assert cache.get(("price_summary", outbound.id, inbound.id)) is summary
@@ -0,0 +1,27 @@
+import pytest
+
+from tmrailwaysapi import json_codec
+
+DOCUMENT = {"success": True, "data": {"stations": [{"id": 17, "title_tm": "Aşgabat"}]}}
+
+
+class TestJSONCodec:
+    def setup_method(self):
+        self.backend = json_codec.get_backend()
+
+    def teardown_method(self):
+        json_codec.set_backend(self.backend)
+
+    @pytest.mark.parametrize("backend", json_codec.get_available_backends())
+    def test_roundtrip(self, backend):
+        json_codec.set_backend(backend)
+        encoded = json_codec.dumps(DOCUMENT)
+
+        assert isinstance(encoded, bytes)
+        assert b" " not in encoded
+        assert json_codec.loads(encoded) == DOCUMENT
+        assert json_codec.loads(encoded.decode("utf-8")) == DOCUMENT
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            json_codec.set_backend("simplejson")
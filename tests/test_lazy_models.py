@@ -0,0 +1,81 @@
+import copy
+
+import pytest
+
+from benchmarks import payloads
+from tmrailwaysapi import json_codec, model_decoders, model_mappers
+from tmrailwaysapi.lazy_models import RWLazyList, RWLazyTrip
+from tests.helpers import as_data
+
+TRIP_FIELDS = (
+    "id",
+    "source",
+    "destination",
+    "departure_time",
+    "arrival_time",
+    "travel_time",
+    "distance",
+    "wagon_types",
+    "journeys",
+)
+
+
+class TestLazyModels:
+    def test_lazy_trips_match_eager(self):
+        body = json_codec.dumps(payloads.trips_response(trips=5))
+        eager = model_decoders.trips_from_bytes(body)
+        lazy = model_decoders.trips_from_bytes(body, lazy=True)
+
+        assert all(isinstance(trip, RWLazyTrip) for trip in lazy)
+        for lazy_trip, eager_trip in zip(lazy, eager):
+            for name in TRIP_FIELDS:
+                assert as_data(getattr(lazy_trip, name)) == as_data(
+                    getattr(eager_trip, name)
+                )
+
+    def test_lazy_trip_parses_on_first_access(self):
+        body = json_codec.dumps(payloads.trips_response(trips=1))
+        (trip,) = model_decoders.trips_from_bytes(body, lazy=True)
+
+        assert not hasattr(trip, "_journeys")
+        assert not hasattr(trip, "_departure_time")
+
+        journeys = trip.journeys
+
+        assert trip.journeys is journeys
+        assert hasattr(trip, "_journeys")
+        assert not hasattr(trip, "_departure_time")
+        assert trip.get_available_wagons() == [
+            wagon for wagon in trip.wagon_types if wagon.has_seats
+        ]
+
+    def test_lazy_seats_match_eager(self):
+        body = json_codec.dumps(payloads.seats_response(wagons=3, journeys=2))
+        eager = model_mappers.seats_from_json(json_codec.loads(body)["data"])
+        lazy = model_decoders.seats_from_bytes(body, lazy=True)
+
+        wagons = lazy.outbound.journeys[0].train_wagons
+        assert not wagons.is_materialized
+
+        assert as_data(lazy) == as_data(eager)
+        assert wagons.is_materialized
+
+    def test_lazy_list(self):
+        lazy = RWLazyList(["1", "2", "3"], int)
+
+        assert not lazy.is_materialized
+        assert lazy == [1, 2, 3]
+        assert lazy.is_materialized
+        assert lazy[1:] == [2, 3]
+        assert copy.copy(lazy) == [1, 2, 3]
+        assert list(reversed(lazy)) == [3, 2, 1]
+        assert len(lazy) == 3
+        # not a list, see RWLazyList
+        assert not isinstance(lazy, list)
+        assert json_codec.dumps(list(lazy)) == b"[1,2,3]"
+
+    def test_malformed_item_raises_on_first_access(self):
+        lazy = RWLazyList(["1", "x"], int)
+
+        with pytest.raises(ValueError):
+            len(lazy)
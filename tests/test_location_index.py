@@ -0,0 +1,37 @@
+from tmrailwaysapi import RWLocation
+from tmrailwaysapi.location_index import RWLocationIndex, normalize_name
+
+
+LOCATIONS = [
+    RWLocation(id=17, name="Aşgabat"),
+    RWLocation(id=21, name="Daşoguz"),
+    RWLocation(id=30, name="Türkmenabat"),
+    RWLocation(id=31, name="Türkmenbaşy"),
+    RWLocation(id=40, name="Mary"),
+]
+
+
+class TestLocationIndex:
+    def setup_class(self):
+        self.index = RWLocationIndex(LOCATIONS)
+
+    def test_normalize_name(self):
+        assert normalize_name(" AŞGABAT ") == "asgabat"
+        assert normalize_name("Türkmenbaşy") == "turkmenbasy"
+
+    def test_get_by_id(self):
+        assert self.index.get_by_id(21).name == "Daşoguz"
+        assert self.index.get_by_id("Helluwa") is None
+
+    def test_get_by_name(self):
+        assert self.index.get_by_name("Aşgabat").id == 17
+        assert self.index.get_by_name("Asgabat").id == 17
+        assert self.index.get_by_name("Helluwa") is None
+
+    def test_search_prefix(self):
+        names = [location.name for location in self.index.search_prefix("turkm")]
+        assert names == ["Türkmenabat", "Türkmenbaşy"]
+
+    def test_search_fuzzy(self):
+        assert self.index.search("Dashoguz")[0].id == 21
+        assert self.index.search("zzzz") == []
@@ -18,3 +18,9 @@ class TestClientLocations:
     def test_get_nonexisting_location_by_id_and_name(self):
         assert self.client.get_location_by_id("Helluwa") is None
         assert self.client.get_location_by_name("Helluwa") is None
+
+    def test_get_location_by_normalized_name(self):
+        assert self.client.get_location_by_name("asgabat").id == 17
+
+    def test_search_locations(self):
+        assert self.client.search_locations("Aşg")[0].id == 17
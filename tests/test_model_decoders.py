@@ -0,0 +1,162 @@
+import pytest
+
+from benchmarks import payloads
+from tmrailwaysapi import json_codec, model_decoders, model_mappers
+from tmrailwaysapi.exceptions import APIStatusError
+from tests.helpers import as_data
+
+
+def decoded(decode, body):
+    """`as_data` of what `decode` returns, or the type of what it raises"""
+    try:
+        return as_data(decode(body))
+    except Exception as ex:
+        return type(ex)
+
+
+DELETE = object()
+
+
+def set_key(path, value):
+    """Edit of a response that sets (or `DELETE`s) the value at `path`"""
+
+    def edit(response):
+        *keys, last = path
+        json_data = response
+        for key in keys:
+            json_data = json_data[key]
+        if value is DELETE:
+            del json_data[last]
+        else:
+            json_data[last] = value
+
+    return edit
+
+
+TRIP = ("data", "trips", 0)
+WAGON = TRIP + ("wagon_types", 0)
+SEAT = ("data", "outbound", "journeys", 0, "train_wagons", 0, "seats", 0)
+EDGE_CASES = [
+    ("trips", set_key(WAGON + ("price",), "120.50")),
+    ("trips", set_key(WAGON + ("has_seats",), 1)),
+    ("trips", set_key(WAGON + ("has_seats",), None)),
+    ("trips", set_key(TRIP + ("id",), "7000000")),
+    ("trips", set_key(TRIP + ("source",), None)),
+    ("trips", set_key(WAGON + ("wagon_type_title",), 5)),
+    ("trips", set_key(("data",), DELETE)),
+    ("trips", set_key(("data",), None)),
+    ("price_summary", set_key(("data", "inbound"), None)),
+    ("price_summary", set_key(("data", "inbound"), DELETE)),
+    ("price_summary", set_key(("data", "price_formation", 0, "amount"), "100")),
+    (
+        "price_summary",
+        set_key(("data", "outbound", "journeys", 0, "prices", 0, "child"), DELETE),
+    ),
+    ("price_summary", set_key(("data",), DELETE)),
+    ("seats", set_key(SEAT + ("available",), 0)),
+    ("seats", set_key(SEAT + ("level",), 2)),
+    ("seats", set_key(SEAT + ("level",), 2.0)),
+    ("seats", set_key(SEAT + ("level",), "x")),
+    ("seats", set_key(SEAT + ("label",), None)),
+    ("seats", set_key(("data", "inbound"), None)),
+    ("seats", set_key(("data",), DELETE)),
+]
+RESPONSES = {
+    "trips": lambda: payloads.trips_response(trips=2),
+    "price_summary": payloads.price_summary_response,
+    "seats": lambda: payloads.seats_response(wagons=2),
+}
+MAPPED = {
+    "trips": model_decoders._mapped_trips,
+    "price_summary": model_decoders._mapped_price_summary,
+    "seats": model_decoders._mapped_seats,
+}
+DECODED = {
+    "trips": model_decoders.trips_from_bytes,
+    "price_summary": model_decoders.price_summary_from_bytes,
+    "seats": model_decoders.seats_from_bytes,
+}
+
+
+class TestModelDecoders:
+    def test_trips_match_mappers(self):
+        body = json_codec.dumps(payloads.trips_response(trips=50))
+        expected = [
+            model_mappers.trip_from_json(trip)
+            for trip in json_codec.loads(body)["data"]["trips"]
+        ]
+
+        assert as_data(model_decoders.trips_from_bytes(body)) == as_data(expected)
+
+    def test_price_summary_matches_mappers(self):
+        body = json_codec.dumps(payloads.price_summary_response())
+        expected = model_mappers.price_summary_from_json(json_codec.loads(body)["data"])
+
+        assert as_data(model_decoders.price_summary_from_bytes(body)) == as_data(
+            expected
+        )
+
+    def test_seats_match_mappers(self):
+        body = json_codec.dumps(payloads.seats_response(wagons=3, journeys=2))
+        expected = model_mappers.seats_from_json(json_codec.loads(body)["data"])
+
+        assert as_data(model_decoders.seats_from_bytes(body)) == as_data(expected)
+
+    def test_unexpected_payload_falls_back_to_mappers(self):
+        response = payloads.trips_response(trips=2)
+        response["data"]["trips"][0]["departure_time"] = "2025-09-01"
+        body = json_codec.dumps(response)
+        expected = [
+            model_mappers.trip_from_json(trip) for trip in response["data"]["trips"]
+        ]
+
+        assert as_data(model_decoders.trips_from_bytes(body)) == as_data(expected)
+
+    @pytest.mark.parametrize("endpoint, edit", EDGE_CASES)
+    def test_edge_cases_match_mappers(self, endpoint, edit):
+        response = RESPONSES[endpoint]()
+        edit(response)
+        body = json_codec.dumps(response)
+
+        assert decoded(DECODED[endpoint], body) == decoded(MAPPED[endpoint], body)
+
+    @pytest.mark.skipif(not model_decoders.is_compiled(), reason="needs msgspec")
+    def test_api_payloads_fit_schemas(self):
+        # they must not fall back to the mappers
+        model_decoders._compiled_trips(json_codec.dumps(RESPONSES["trips"]()))
+        model_decoders._compiled_price_summary(
+            json_codec.dumps(RESPONSES["price_summary"]())
+        )
+        model_decoders._compiled_seats(json_codec.dumps(RESPONSES["seats"]()))
+
+    def test_non_string_names_are_kept(self):
+        response = payloads.trips_response(trips=1)
+        response["data"]["trips"][0]["source"] = None
+        response["data"]["trips"][0]["wagon_types"][0]["wagon_type_title"] = 5
+
+        (trip,) = model_decoders.trips_from_bytes(json_codec.dumps(response))
+
+        assert trip.source is None
+        assert trip.wagon_types[0].title == 5
+
+    def test_error_response(self):
+        body = json_codec.dumps(
+            {"success": False, "error": {"id": "x", "message": "Not found"}}
+        )
+
+        with pytest.raises(APIStatusError):
+            model_decoders.trips_from_bytes(body)
+
+    def test_models_are_compact(self):
+        body = json_codec.dumps(payloads.trips_response(trips=20))
+        mapped = [
+            model_mappers.trip_from_json(trip)
+            for trip in json_codec.loads(body)["data"]["trips"]
+        ]
+
+        for trips in (model_decoders.trips_from_bytes(body), mapped):
+            assert not hasattr(trips[0], "__dict__")
+            # station names are shared between trips instead of copied
+            sources = {}
+            for trip in trips:
+                assert sources.setdefault(trip.source, trip.source) is trip.source
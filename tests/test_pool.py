@@ -0,0 +1,61 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from urllib3.exceptions import EmptyPoolError
+
+from tmrailwaysapi import RWPoolConfig
+from tmrailwaysapi.pool import RWHTTPAdapter, RWPoolStats
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPool:
+    def setup_class(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:{}/".format(self.server.server_port)
+
+    def teardown_class(self):
+        self.server.shutdown()
+
+    def test_pool_stats(self):
+        stats = RWPoolStats()
+        session = requests.Session()
+        session.mount("http://", RWHTTPAdapter(RWPoolConfig(pool_maxsize=1), stats))
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: session.get(self.url), range(4)))
+
+        assert stats.acquisitions == 4
+        assert stats.waits >= 1
+        assert stats.max_wait >= 0.04
+
+    def test_pool_timeout(self):
+        config = RWPoolConfig(pool_maxsize=1, pool_timeout=0.01)
+        session = requests.Session()
+        session.mount("http://", RWHTTPAdapter(config, RWPoolStats()))
+
+        with ThreadPoolExecutor(2) as executor:
+            futures = [executor.submit(session.get, self.url) for _ in range(2)]
+            errors = [future.exception() for future in futures]
+
+        timeouts = [
+            error for error in errors if isinstance(error, requests.ConnectionError)
+        ]
+        assert len(timeouts) == 1
+        assert isinstance(timeouts[0].__cause__, EmptyPoolError)
@@ -0,0 +1,186 @@
+import asyncio
+import datetime
+import inspect
+
+import pytest
+
+from benchmarks import payloads
+from tmrailwaysapi import (
+    RWAsyncClient,
+    RWAsyncFakeTransport,
+    RWClient,
+    RWFakeTransport,
+    json_codec,
+    protocol,
+)
+from tmrailwaysapi.async_session import RWAsyncSession
+from tmrailwaysapi.exceptions import APIStatusError, HTTPStatusError
+from tmrailwaysapi.session import RWSession
+
+STATIONS = {
+    "success": True,
+    "data": {
+        "stations": [
+            {"id": 17, "title_tm": "Aşgabat"},
+            {"id": 21, "title_tm": "Daşoguz"},
+        ]
+    },
+}
+
+DATE = datetime.date(2025, 9, 1)
+
+
+def make_transport(transport_class):
+    transport = transport_class()
+    transport.add_response("GET", "/railway-api/stations", STATIONS)
+    transport.add_response(
+        "POST", "/railway-api/trips", payloads.trips_response(trips=5)
+    )
+    transport.add_response(
+        "POST", "/railway-api/trips/7000000", payloads.seats_response(wagons=2)
+    )
+    transport.add_response(
+        "GET",
+        "/railway-api/trips/7000000/price_summary?",
+        payloads.price_summary_response(),
+    )
+    return transport
+
+
+class TestProtocol:
+    def test_build_requests(self):
+        search = protocol.build_search_trips_request(17, 21, "2025-09-01", 1)
+        seats = protocol.build_seats_request(1, 5, 2, 0, inbound_trip_id=3)
+        summary = protocol.build_price_summary_request(1)
+        booking = protocol.build_booking_request("+993", "a@b.tm", "A B", [], 1, 2, 3)
+
+        assert (search.method, search.path) == ("POST", "/railway-api/trips")
+        assert json_codec.loads(search.body)["destination"] == "21"
+        assert seats.path == "/railway-api/roundtrips/outbound/1/inbound/3"
+        assert summary == (
+            "GET",
+            "/railway-api/trips/1/price_summary?",
+            None,
+            None,
+            True,
+        )
+        assert not booking.idempotent
+        assert json_codec.loads(booking.body)["outbound"] == {
+            "selected_journeys": [{"id": 1, "seats": [{"id": 3, "train_wagon_id": 2}]}]
+        }
+        # nothing to book is not sent with the -1 defaults
+        with pytest.raises(ValueError):
+            protocol.build_booking_request("+993", "a@b.tm", "A B", [])
+
+    def test_parse_error(self):
+        body = json_codec.dumps(
+            {"success": False, "error": {"id": "E1", "message": "Sold out"}}
+        )
+
+        with pytest.raises(APIStatusError):
+            protocol.parse_booking(body)
+        with pytest.raises(APIStatusError):
+            protocol.parse_stations(body)
+
+    def test_parse_error_without_details(self):
+        with pytest.raises(APIStatusError):
+            protocol.parse_trips(json_codec.dumps({"success": False}))
+
+    def test_check_status(self):
+        ok = protocol.RWResponse(200, {}, b"{}")
+        not_modified = protocol.RWResponse(304, {}, b"")
+        bad_gateway = protocol.RWResponse(502, {}, b"<html>Bad Gateway</html>")
+
+        protocol.check_status(ok)
+        protocol.check_status(not_modified, allow_not_modified=True)
+        with pytest.raises(HTTPStatusError):
+            protocol.check_status(not_modified)
+        with pytest.raises(HTTPStatusError) as info:
+            protocol.check_status(bad_gateway)
+        assert info.value.status == 502
+        assert info.value.body == bad_gateway.body
+
+    def test_client_checks_status(self):
+        transport = make_transport(RWFakeTransport)
+        transport.add_response(
+            "POST", "/railway-api/trips", b"<html>Bad Gateway</html>", status=502
+        )
+        transport.add_response(
+            "POST", "/railway-api/trips/7000000", {"success": False}, status=500
+        )
+        client = RWClient(transport=transport)
+        src = client.get_location_by_id(17)
+
+        with pytest.raises(HTTPStatusError) as info:
+            client.search_trips(src, src, DATE, 1)
+        assert info.value.status == 502
+
+        trip = protocol.parse_trips(json_codec.dumps(payloads.trips_response(1)))[0]
+        with pytest.raises(HTTPStatusError) as info:
+            client.get_seats(trip, trip.wagon_types[0], 1)
+        assert info.value.status == 500
+
+    def test_async_client_checks_status(self):
+        async def main():
+            transport = make_transport(RWAsyncFakeTransport)
+            transport.add_response(
+                "POST", "/railway-api/trips", b"<html>Bad Gateway</html>", status=502
+            )
+            async with RWAsyncClient(transport=transport) as client:
+                src = await client.get_location_by_id(17)
+                with pytest.raises(HTTPStatusError) as info:
+                    await client.search_trips(src, src, DATE, 1)
+            return info.value
+
+        assert asyncio.run(main()).status == 502
+
+    def test_book_tickets_signatures(self):
+        expected = inspect.signature(protocol.build_booking_request).parameters
+
+        for session_class in (RWSession, RWAsyncSession):
+            parameters = dict(inspect.signature(session_class.book_tickets).parameters)
+            del parameters["self"]
+            assert list(parameters.values()) == list(expected.values())
+
+    def test_client_over_fake_transport(self):
+        transport = make_transport(RWFakeTransport)
+        client = RWClient(transport=transport)
+
+        src = client.get_location_by_id(17)
+        dest = client.get_location_by_name("Daşoguz")
+        trips = client.search_trips(src, dest, DATE, 2)
+        seats = client.get_seats(trips[0], trips[0].wagon_types[0], 2)
+        summary = client.get_price_summary(trips[0])
+
+        assert len(trips) == 5
+        assert len(seats.outbound.journeys[0].train_wagons) == 2
+        assert summary.outbound.id == 7298282
+        assert [request.path for request in transport.requests] == [
+            "/railway-api/stations",
+            "/railway-api/trips",
+            "/railway-api/trips/7000000",
+            "/railway-api/trips/7000000/price_summary?",
+        ]
+        assert json_codec.loads(transport.requests[1].body)["adult"] == 2
+
+    def test_async_client_over_fake_transport(self):
+        async def main():
+            transport = make_transport(RWAsyncFakeTransport)
+            async with RWAsyncClient(transport=transport) as client:
+                src = await client.get_location_by_id(17)
+                dest = await client.get_location_by_id(21)
+                trips = await client.search_trips(src, dest, DATE, 1)
+                seats = await client.get_seats(trips[0], trips[0].wagon_types[0], 1)
+            return transport, trips, seats
+
+        transport, trips, seats = asyncio.run(main())
+
+        assert len(trips) == 5
+        assert seats.outbound.id == 7298282
+        assert len(transport.requests) == 3
+
+    def test_missing_fake_response(self):
+        client = RWClient(transport=RWFakeTransport())
+
+        with pytest.raises(LookupError):
+            client.get_location_by_id(17)
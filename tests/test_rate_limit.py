@@ -0,0 +1,80 @@
+import asyncio
+import time
+from multiprocessing import Pool
+
+from tmrailwaysapi import RWFileRateLimiter, RWRateLimiter
+from tests.helpers import FakeClock
+
+
+def acquire_from_file(path):
+    return RWFileRateLimiter(path, rate=5, burst=1).acquire()
+
+
+class TestRateLimiter:
+    def test_burst_then_rate(self):
+        limiter = RWRateLimiter(rate=10, burst=3, clock=FakeClock())
+
+        assert [limiter._reserve() for _ in range(3)] == [0, 0, 0]
+        assert abs(limiter._reserve() - 0.1) < 1e-9
+        assert abs(limiter._reserve() - 0.2) < 1e-9
+
+    def test_refill(self):
+        clock = FakeClock()
+        limiter = RWRateLimiter(rate=10, burst=2, clock=clock)
+        limiter._reserve()
+        limiter._reserve()
+
+        clock.now = 10
+        assert limiter._reserve() == 0
+
+    def test_acquire_async_shared(self):
+        limiter = RWRateLimiter(rate=100, burst=1)
+
+        async def main():
+            started_at = time.monotonic()
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(6)))
+            return time.monotonic() - started_at
+
+        assert asyncio.run(main()) >= 0.045
+        assert limiter.stats.acquisitions == 6
+        assert limiter.stats.waits == 5
+
+    def test_file_limiter_across_processes(self, tmp_path):
+        path = str(tmp_path / "bucket")
+
+        with Pool(4) as pool:
+            waits = pool.map(acquire_from_file, [path] * 4)
+
+        # one token in the bucket, the other processes had to queue
+        assert sorted(waits)[0] == 0
+        assert max(waits) >= 0.1
+
+    def test_cancelled_waiter_refunds_token(self):
+        limiter = RWRateLimiter(rate=1, burst=1, clock=FakeClock())
+        limiter._reserve()
+
+        async def main():
+            waiter = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+
+        asyncio.run(main())
+
+        # the next caller gets the cancelled waiter's slot
+        assert abs(limiter._reserve() - 1.0) < 1e-9
+
+    def test_file_limiter_async(self, tmp_path):
+        limiter = RWFileRateLimiter(str(tmp_path / "bucket"), rate=1, burst=1)
+
+        async def main():
+            assert await limiter.acquire_async() == 0
+            waiter = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            # let the refund run in the executor
+            await asyncio.sleep(0.05)
+            return limiter._reserve()
+
+        assert asyncio.run(main()) <= 1.0
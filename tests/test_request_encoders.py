@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+
+from tmrailwaysapi import json_codec, request_encoders
+from tmrailwaysapi.models import RWPassenger
+
+PASSENGER = RWPassenger(
+    "Aman",
+    "Amanow",
+    datetime.datetime(1990, 1, 1),
+    "adult",
+    "male",
+    "passport",
+    "I-AS 000001",
+)
+
+
+class TestRequestEncoders:
+    def test_encode_search_trips(self):
+        body = request_encoders.encode_search_trips(17, 21, "01-09-2025", 2, 1)
+
+        assert isinstance(body, bytes)
+        assert json_codec.loads(body) == {
+            "source": "17",
+            "destination": "21",
+            "date": "01-09-2025",
+            "adult": 2,
+            "child": 1,
+        }
+
+    def test_encode_seats(self):
+        one_way = json_codec.loads(request_encoders.encode_seats(5, 1, 0))
+        round_trip = json_codec.loads(request_encoders.encode_seats(5, 1, 0, 7))
+
+        assert one_way == {"adult": 1, "child": 0, "outbound_wagon_type_id": 5}
+        assert round_trip == dict(one_way, inbound_wagon_type_id=7)
+
+    def test_get_passenger_json(self):
+        passenger_json = request_encoders.get_passenger_json(PASSENGER)
+
+        assert passenger_json == {
+            "name": "Aman",
+            "surname": "Amanow",
+            "dob": "01-01-1990",
+            "tariff": "adult",
+            "gender": "male",
+            "identity_type": "passport",
+            "identity_number": "I-AS 000001",
+        }
+        old = PASSENGER._replace(dob=datetime.date(987, 12, 31))
+        assert request_encoders.get_passenger_json(old)["dob"] == "31-12-0987"
+        assert request_encoders.get_passenger_json(passenger_json) is passenger_json
+
+    def test_get_journey_seat_ids(self):
+        get = request_encoders.get_journey_seat_ids
+
+        assert get(1, 2, 3, None, None) == [(1, [(2, 3)])]
+        assert get(1, -1, -1, [(2, 3), (2, 4)], None) == [(1, [(2, 3), (2, 4)])]
+        assert get(-1, -1, -1, None, [(1, [(2, 3)])]) == [(1, [(2, 3)])]
+        assert get(-1, -1, -1, None, None) is None
+        assert get(1, 2, 3, None, None, required=True) == [(1, [(2, 3)])]
+        for args in [(-1, 2, 3, None), (1, -1, -1, None), (1, -1, -1, [])]:
+            with pytest.raises(ValueError):
+                get(*args, None, required=True)
+
+    def test_encode_booking(self):
+        body = request_encoders.encode_booking(
+            "+99364000000",
+            "a@example.com",
+            "Aman Amanow",
+            [PASSENGER],
+            outbound_journeys=[(1, [(2, 3)])],
+            has_lunchbox=True,
+        )
+        json_data = json_codec.loads(body)
+
+        assert json_data["passengers"] == [
+            request_encoders.get_passenger_json(PASSENGER)
+        ]
+        assert json_data["has_lunchbox"] is True
+        assert json_data["outbound"] == {
+            "selected_journeys": [{"id": 1, "seats": [{"id": 3, "train_wagon_id": 2}]}]
+        }
+        assert json_data["inbound"] is None
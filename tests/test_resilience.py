@@ -0,0 +1,208 @@
+import asyncio
+
+import pytest
+import requests
+
+from tmrailwaysapi import RWCircuitBreaker, RWClient, RWRetryPolicy, protocol
+from tmrailwaysapi.async_session import RWAsyncSession
+from tmrailwaysapi.exceptions import CircuitOpenError, HTTPStatusError
+from tmrailwaysapi.session import RWSession
+from tests.helpers import FakeClock
+
+
+def make_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+class ScriptedAdapter(requests.adapters.BaseAdapter):
+    """Answers from `statuses` instead of the network, 0 times out"""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        status = self.statuses.pop(0)
+        if status == 0:
+            raise requests.ConnectTimeout("connect timed out", request=request)
+
+        response = make_response(status)
+        response._content = b'{"success":true}'
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class ScriptedSession(RWSession):
+    def __init__(self, statuses, **kwargs):
+        super().__init__(hostname="example.com", **kwargs)
+        self.adapter = ScriptedAdapter(statuses)
+        self._http_session.mount("https://", self.adapter)
+
+    @property
+    def sent(self):
+        return self.adapter.sent
+
+
+class ScriptedClientSession:
+    """Stands in for `aiohttp.ClientSession`, answering from `statuses`"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.sent = 0
+
+    def request(self, method, url, **kwargs):
+        self.sent += 1
+        return ScriptedClientResponse(self.statuses.pop(0))
+
+
+class ScriptedClientResponse:
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self):
+        return b'{"success":true}'
+
+
+NO_BACKOFF = RWRetryPolicy(attempts=3, backoff_base=0)
+
+
+class TestRetryPolicy:
+    def test_can_retry(self):
+        policy = RWRetryPolicy(attempts=3)
+
+        assert policy.can_retry(0, 503)
+        assert policy.can_retry(1, 0)
+        assert not policy.can_retry(2, 503)
+        assert not policy.can_retry(0, 404)
+
+    def test_booking_policy(self):
+        policy = RWRetryPolicy(retry_statuses=frozenset(), retry_after_send=False)
+
+        assert policy.can_retry(0, 0, connect_error=True)
+        assert not policy.can_retry(0, 0)
+        assert not policy.can_retry(0, 503)
+
+    def test_delay_is_bounded(self):
+        policy = RWRetryPolicy(backoff_base=1, backoff_max=3)
+        assert all(0 <= policy.get_delay(attempt) <= 3 for attempt in range(10))
+
+
+class TestCircuitBreaker:
+    def test_open_and_recover(self):
+        clock = FakeClock()
+        breaker = RWCircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        clock.now = 11
+        breaker.before_request()
+        assert breaker.state == RWCircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == RWCircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = RWCircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state == RWCircuitBreaker.OPEN
+
+
+class TestSessionRetries:
+    def test_retry_transient_errors(self):
+        session = ScriptedSession([503, 0, 200], retry_policy=NO_BACKOFF)
+
+        assert session.get_stations().status_code == 200
+        assert session.sent == 3
+
+    def test_no_retry_on_client_error(self):
+        session = ScriptedSession([404], retry_policy=NO_BACKOFF)
+
+        assert session.get_stations().status_code == 404
+        assert session.sent == 1
+
+    def test_last_response_is_returned(self):
+        session = ScriptedSession([503, 503, 503], retry_policy=NO_BACKOFF)
+
+        assert session.send(protocol.build_stations_request()).status == 503
+        assert session.sent == 3
+
+    def test_connect_error_is_raised(self):
+        session = ScriptedSession([0, 0, 0], retry_policy=NO_BACKOFF)
+
+        with pytest.raises(requests.ConnectTimeout):
+            session.get_stations()
+        assert session.sent == 3
+
+    def test_booking_not_retried_after_send(self):
+        session = ScriptedSession([503, 200], retry_policy=NO_BACKOFF)
+
+        response = session.post("/railway-api/bookings", idempotent=False, json={})
+        assert response.status_code == 503
+        assert session.sent == 1
+
+    def test_client_checks_status(self):
+        session = ScriptedSession([404], retry_policy=NO_BACKOFF)
+        client = RWClient(transport=session)
+
+        with pytest.raises(HTTPStatusError) as info:
+            client.locations
+        assert info.value.status == 404
+
+    def test_circuit_breaker_fails_fast(self):
+        session = ScriptedSession(
+            [500, 500],
+            retry_policy=RWRetryPolicy(attempts=1),
+            circuit_breaker=RWCircuitBreaker(failure_threshold=2),
+        )
+
+        for _ in range(2):
+            assert session.get_stations().status_code == 500
+        with pytest.raises(CircuitOpenError):
+            session.get_stations()
+        assert session.sent == 2
+
+    def test_send(self):
+        session = ScriptedSession([200])
+
+        response = session.send(protocol.build_stations_request())
+
+        assert response.status == 200
+        assert response.body == b'{"success":true}'
+
+    def test_async_last_response_is_returned(self):
+        async def main():
+            session = RWAsyncSession("example.com", retry_policy=NO_BACKOFF)
+            await session.close()
+            session._client_session = ScriptedClientSession([503, 404])
+
+            response = await session.send(protocol.build_stations_request())
+            return response, session._client_session.sent
+
+        response, sent = asyncio.run(main())
+
+        assert response.status == 404
+        assert sent == 2
@@ -0,0 +1,39 @@
+from tmrailwaysapi import RWResponseCache
+from tests.helpers import FakeClock
+
+
+class TestResponseCache:
+    def test_hit_and_miss(self):
+        cache = RWResponseCache()
+        key = RWResponseCache.make_key("search_trips", "17", "21", "2025-08-20", 1, 0)
+
+        assert cache.get(key) is None
+        cache.set(key, [])
+        assert cache.get(key) == []
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_per_endpoint_ttl(self):
+        clock = FakeClock()
+        cache = RWResponseCache(ttls={"seats": 5, "price_summary": 50}, clock=clock)
+        seats_key = RWResponseCache.make_key("seats", 1, 2, 1, 0, -1, -1)
+        price_key = RWResponseCache.make_key("price_summary", 1, -1)
+        cache.set(seats_key, "seats")
+        cache.set(price_key, "price")
+
+        clock.now = 10
+        assert cache.get(seats_key) is None
+        assert cache.get(price_key) == "price"
+        assert cache.stats.expirations == 1
+
+    def test_lru_eviction(self):
+        cache = RWResponseCache(maxsize=2)
+        cache.set(("seats", 1), 1)
+        cache.set(("seats", 2), 2)
+        cache.get(("seats", 1))
+        cache.set(("seats", 3), 3)
+
+        assert cache.get(("seats", 2)) is None
+        assert cache.get(("seats", 1)) == 1
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 2
@@ -0,0 +1,103 @@
+from benchmarks import payloads
+from tmrailwaysapi import model_mappers
+from tmrailwaysapi.seat_diff import RWSeatTracker
+
+
+def poll(seed=1, taken=(), freed=(), wagons=3):
+    response = payloads.seats_response(wagons=wagons, seats=36, seed=seed)
+    for journey in response["data"]["outbound"]["journeys"]:
+        for wagon in journey["train_wagons"]:
+            for seat in wagon["seats"]:
+                if (wagon["number"], seat["id"]) in taken:
+                    seat["available"] = False
+                if (wagon["number"], seat["id"]) in freed:
+                    seat["available"] = True
+    return model_mappers.seats_from_json(response["data"]).outbound
+
+
+def free_seats(trip_seats):
+    return {
+        (wagon.number, seat.id)
+        for journey in trip_seats.journeys
+        for wagon in journey.train_wagons
+        for seat in wagon.seats
+        if seat.available
+    }
+
+
+class TestSeatTracker:
+    def test_first_poll(self):
+        tracker = RWSeatTracker()
+        trip_seats = poll()
+        diff = tracker.update(trip_seats)
+
+        assert diff.changed
+        assert len(diff.wagons) == 3
+        assert all(wagon.is_new for wagon in diff.wagons)
+        assert diff.became_free == diff.free_count == len(free_seats(trip_seats))
+        assert diff.became_taken == 0
+        assert len(tracker) == 3
+
+    def test_no_change(self):
+        tracker = RWSeatTracker()
+        tracker.update(poll())
+        diff = tracker.update(poll())
+
+        assert not diff.changed
+        assert diff.wagons == []
+        assert diff.free_count == len(free_seats(poll()))
+
+    def test_changes(self):
+        tracker = RWSeatTracker()
+        first = poll()
+        tracker.update(first)
+
+        free = sorted(free_seats(first))
+        taken = {free[0], free[-1]}
+        freed = {(2, seat) for seat in range(1, 37) if (2, seat) not in free}
+        diff = tracker.update(poll(taken=taken, freed=freed))
+
+        assert diff.changed
+        assert diff.became_taken == 2
+        assert diff.became_free == len(freed)
+        assert {
+            (wagon.wagon.number, seat.id)
+            for wagon in diff.wagons
+            for seat in wagon.became_taken
+        } == taken
+        assert {
+            (wagon.wagon.number, seat.id)
+            for wagon in diff.wagons
+            for seat in wagon.became_free
+        } == freed
+        assert not any(wagon.is_new for wagon in diff.wagons)
+        assert {wagon.wagon.number for wagon in diff.wagons} <= {1, 2, 3}
+
+    def test_removed_wagons_and_forget(self):
+        tracker = RWSeatTracker()
+        tracker.update(poll(wagons=3))
+        diff = tracker.update(poll(wagons=2))
+
+        assert diff.changed
+        assert len(diff.removed_wagon_ids) == 1
+        assert len(tracker) == 2
+
+        tracker.forget(diff.trip_id)
+        assert len(tracker) == 0
+        assert all(wagon.is_new for wagon in tracker.update(poll()).wagons)
+
+    def test_duplicate_labels(self):
+        tracker = RWSeatTracker()
+        first = poll(wagons=1)
+        wagon = first.journeys[0].train_wagons[0]
+        seats = [seat._replace(label="12", available=True) for seat in wagon.seats[:2]]
+        wagon = wagon._replace(seats=seats)
+        journey = first.journeys[0]._replace(train_wagons=[wagon])
+        tracker.update(first._replace(journeys=[journey]))
+
+        wagon = wagon._replace(seats=[seats[0], seats[1]._replace(available=False)])
+        journey = journey._replace(train_wagons=[wagon])
+        diff = tracker.update(first._replace(journeys=[journey]))
+
+        assert diff.wagons[0].became_taken == [wagon.seats[1]]
+        assert diff.free_count == 1
@@ -0,0 +1,161 @@
+import random
+
+from benchmarks import payloads
+from tmrailwaysapi import model_mappers
+from tmrailwaysapi.models import RWSeat, RWWagonSeats
+from tmrailwaysapi.seat_map import (
+    RWJourneySeatMap,
+    RWWagonSeatMap,
+    get_compartment_masks,
+    get_seat_positions,
+)
+
+
+def make_wagon(layout_map, free, capacity, number=1, wagon_type_id=1):
+    return RWWagonSeats(
+        id=350000 + number,
+        layout_map=layout_map,
+        number=number,
+        seats=[
+            RWSeat(
+                id=seat,
+                available=seat in free,
+                label=str(seat),
+                level=2 if seat % 2 == 0 else 1,
+            )
+            for seat in range(1, capacity + 1)
+        ],
+        wagon_type_id=wagon_type_id,
+        wagon_type_title="Kupe",
+    )
+
+
+def labelled_wagon(labels, layout_map="seated_60"):
+    return RWWagonSeats(
+        id=350001,
+        layout_map=layout_map,
+        number=1,
+        seats=[
+            RWSeat(id=9000000 + i, available=True, label=label, level=1)
+            for i, label in enumerate(labels)
+        ],
+        wagon_type_id=1,
+        wagon_type_title="Kupe",
+    )
+
+
+def numbers(seats):
+    return [int(seat.label) for seat in seats]
+
+
+class TestSeatMap:
+    def test_compartments(self):
+        kupe = get_compartment_masks("kupe_36")
+        platskart = get_compartment_masks("platskart_54")
+
+        assert len(kupe) == 9
+        assert kupe[0] == 0b1111
+        assert len(platskart) == 9
+        # bay 1 is seats 1-4 and side seats 53-54
+        assert platskart[0] == 0b1111 | (0b11 << 52)
+        assert get_compartment_masks("unknown") == []
+
+    def test_counts(self):
+        seat_map = RWWagonSeatMap(make_wagon("kupe_36", {1, 2, 3, 8, 36}, 36))
+
+        assert seat_map.count_free() == 5
+        assert seat_map.count_free(level=1) == 2
+        assert seat_map.count_free(level=2) == 3
+        assert numbers(seat_map.get_free_seats(level=2)) == [2, 8, 36]
+
+    def test_together_in_compartment(self):
+        seat_map = RWWagonSeatMap(make_wagon("kupe_36", {4, 5, 7, 9, 10, 11}, 36))
+
+        assert numbers(seat_map.get_seats(seat_map.find_together(2))) == [5, 7]
+        assert numbers(seat_map.get_seats(seat_map.find_together(3))) == [9, 10, 11]
+        assert seat_map.find_together(4) is None
+        assert numbers(seat_map.get_seats(seat_map.find_together(1, level=2))) == [4]
+        assert seat_map.find_together(2, level=2) is None
+
+    def test_together_consecutive(self):
+        seat_map = RWWagonSeatMap(make_wagon("seated_60", {1, 3, 4, 6, 7, 8}, 60))
+
+        assert numbers(seat_map.get_seats(seat_map.find_together(2))) == [3, 4]
+        assert numbers(seat_map.get_seats(seat_map.find_together(3))) == [6, 7, 8]
+        assert seat_map.find_together(4) is None
+
+    def test_matches_scan(self):
+        rng = random.Random(3)
+
+        for _ in range(50):
+            free = {seat for seat in range(1, 55) if rng.random() > 0.6}
+            seat_map = RWWagonSeatMap(make_wagon("platskart_54", free, 54))
+
+            for n in range(1, 7):
+                expected = None
+                for bay in range(1, 10):
+                    seats = [4 * bay - 3, 4 * bay - 2, 4 * bay - 1, 4 * bay]
+                    seats += [55 - 2 * bay, 56 - 2 * bay]
+                    bay_free = sorted(seat for seat in seats if seat in free)
+                    if len(bay_free) >= n:
+                        expected = bay_free[:n]
+                        break
+
+                bits = seat_map.find_together(n)
+                assert (numbers(seat_map.get_seats(bits)) if bits else None) == (
+                    expected
+                )
+
+    def test_journey(self):
+        response = payloads.seats_response(wagons=10, seats=36)
+        journey = model_mappers.seats_from_json(response["data"]).outbound.journeys[0]
+        seat_map = RWJourneySeatMap(journey)
+
+        assert seat_map.count_free() == sum(
+            seat.available for wagon in journey.train_wagons for seat in wagon.seats
+        )
+        assert seat_map.count_free(level=1) == sum(
+            seat.available and seat.level == 1
+            for wagon in journey.train_wagons
+            for seat in wagon.seats
+        )
+
+        wagon = seat_map.get_first_wagon_with(15)
+        assert wagon.wagon is next(
+            wagon
+            for wagon in journey.train_wagons
+            if sum(seat.available for seat in wagon.seats) >= 15
+        )
+        assert seat_map.get_first_wagon_with(100) is None
+
+        wagon, seats = seat_map.find_together(3)
+        assert len(seats) == 3
+        assert all(seat.available for seat in seats)
+        assert all(seat in wagon.wagon.seats for seat in seats)
+
+    def test_positions(self):
+        wagon = labelled_wagon(["1", "2", "2A", "x", "0", "", "3B"])
+
+        assert get_seat_positions(wagon.seats) == [0, 1, 3, 4, 5, 6, 2]
+
+    def test_duplicate_labels(self):
+        seat_map = RWWagonSeatMap(labelled_wagon(["12A", "12B", "13", "14"]))
+
+        assert seat_map.count_free() == 4
+        assert [seat.label for seat in seat_map.get_free_seats()] == [
+            "12A",
+            "13",
+            "14",
+            "12B",
+        ]
+        together = seat_map.get_seats(seat_map.find_together(3))
+        assert [seat.label for seat in together] == ["12A", "13", "14"]
+        assert seat_map.find_together(4) is None
+
+    def test_labels_without_number(self):
+        seat_map = RWWagonSeatMap(labelled_wagon(["A", "0", "B"], "kupe_36"))
+
+        assert seat_map.count_free() == 3
+        assert seat_map.free == 0b111
+        assert [seat.label for seat in seat_map.get_free_seats()] == ["A", "0", "B"]
+        assert seat_map.find_together(2) is None
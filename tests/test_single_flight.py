@@ -0,0 +1,79 @@
+import asyncio
+
+from tmrailwaysapi import RWAsyncClient
+from tmrailwaysapi.protocol import RWResponse
+from tmrailwaysapi.single_flight import RWSingleFlight
+
+
+STATIONS = b'{"success": true, "data": {"stations": [{"id": 17, "title_tm": "A"}]}}'
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get_hostname(self):
+        return "example.com"
+
+    async def send(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return RWResponse(200, {}, STATIONS)
+
+    async def close(self):
+        pass
+
+
+class TestSingleFlight:
+    def test_coalesce(self):
+        async def main():
+            single_flight = RWSingleFlight()
+            calls = []
+
+            async def fetch():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return object()
+
+            results = await asyncio.gather(
+                *(single_flight.run("key", fetch) for _ in range(5))
+            )
+            return calls, results, single_flight
+
+        calls, results, single_flight = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert len(single_flight) == 0
+
+    def test_coalesce_error(self):
+        async def main():
+            single_flight = RWSingleFlight()
+
+            async def fetch():
+                await asyncio.sleep(0.01)
+                raise RuntimeError("upstream down")
+
+            return await asyncio.gather(
+                *(single_flight.run("key", fetch) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        errors = asyncio.run(main())
+
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert errors[0] is errors[1]
+
+    def test_concurrent_get_locations(self):
+        async def main():
+            client = RWAsyncClient()
+            await client._session.close()
+            client._session = CountingSession()
+
+            await asyncio.gather(*(client.get_locations() for _ in range(10)))
+            return client
+
+        client = asyncio.run(main())
+
+        assert client._session.calls == 1
+        assert len(client._locations) == 1
@@ -0,0 +1,67 @@
+import time
+
+from tmrailwaysapi import RWClient, RWStationCache
+from tmrailwaysapi.protocol import RWResponse
+
+
+STATIONS = [
+    {"id": 17, "title_tm": "Aşgabat"},
+    {"id": 21, "title_tm": "Daşoguz"},
+]
+
+
+class OfflineSession:
+    def get_hostname(self):
+        return "example.com"
+
+    def send(self, request):
+        raise AssertionError("station catalog must be served from cache")
+
+
+class TestStationCache:
+    def test_store_and_load(self, tmp_path):
+        cache = RWStationCache(str(tmp_path))
+        cache.store("example.com", STATIONS, etag='"abc"')
+
+        entry = cache.load("example.com")
+        assert entry.stations == STATIONS
+        assert entry.etag == '"abc"'
+        assert cache.is_fresh(entry)
+        assert RWStationCache.get_conditional_headers(entry) == {
+            "If-None-Match": '"abc"'
+        }
+
+    def test_missing_entry(self, tmp_path):
+        assert RWStationCache(str(tmp_path)).load("example.com") is None
+
+    def test_expired_entry(self, tmp_path):
+        cache = RWStationCache(str(tmp_path), ttl=60)
+        entry = cache.store("example.com", STATIONS)
+
+        assert not cache.is_fresh(entry._replace(saved_at=time.time() - 120))
+
+    def test_cold_start_without_network(self, tmp_path):
+        cache = RWStationCache(str(tmp_path))
+        cache.store("example.com", STATIONS)
+
+        client = RWClient(station_cache=cache)
+        client._session = OfflineSession()
+
+        assert client.get_location_by_id(17).name == "Aşgabat"
+
+    def test_revalidate_not_modified(self, tmp_path):
+        class RevalidatingSession(OfflineSession):
+            sent_headers = None
+
+            def send(self, request):
+                RevalidatingSession.sent_headers = request.headers
+                return RWResponse(304, {}, b"")
+
+        cache = RWStationCache(str(tmp_path), ttl=0)
+        cache.store("example.com", STATIONS, last_modified="yesterday")
+
+        client = RWClient(station_cache=cache)
+        client._session = RevalidatingSession()
+
+        assert client.get_location_by_name("Daşoguz").id == 21
+        assert RevalidatingSession.sent_headers == {"If-Modified-Since": "yesterday"}
@@ -0,0 +1,105 @@
+import datetime
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks import payloads
+from tmrailwaysapi import json_codec, model_decoders
+from tmrailwaysapi.trip_table import RWTripTable
+
+
+def min_price(trip):
+    prices = [wagon.price for wagon in trip.wagon_types if wagon.has_seats]
+    return min(prices) if prices else math.inf
+
+
+class TestTripTable:
+    def setup_class(self):
+        body = json_codec.dumps(payloads.trips_response(trips=300))
+        self.trips = model_decoders.trips_from_bytes(body)
+        self.table = RWTripTable(self.trips)
+
+    def test_columns(self):
+        assert len(self.table) == len(self.trips)
+        assert self.table.to_trips() == self.trips
+        assert self.table[3] is self.trips[3]
+        assert list(self.table.column("id")) == [trip.id for trip in self.trips]
+        assert list(self.table.column("departure")) == [
+            trip.departure_time.timestamp() for trip in self.trips
+        ]
+        assert list(self.table.column("min_price")) == pytest.approx(
+            [min_price(trip) for trip in self.trips]
+        )
+        assert list(self.table.wagon_type_ids) == [1, 2, 3, 4]
+
+    def test_filter(self):
+        start = self.trips[0].departure_time
+        end = start + datetime.timedelta(days=7)
+
+        result = self.table.filter(
+            departure_from=start, departure_to=end, max_travel_time=600, max_price=150
+        )
+
+        assert result.to_trips() == [
+            trip
+            for trip in self.trips
+            if start <= trip.departure_time <= end
+            and trip.travel_time <= 600
+            and min_price(trip) <= 150
+        ]
+
+    def test_filter_wagon_type(self):
+        result = self.table.filter(wagon_type_id=2, max_price=100)
+
+        assert result.to_trips() == [
+            trip
+            for trip in self.trips
+            if any(
+                wagon.id == 2 and wagon.has_seats and wagon.price <= 100
+                for wagon in trip.wagon_types
+            )
+        ]
+        assert len(self.table.filter(wagon_type_id=99)) == 0
+
+    def test_sort(self):
+        by_distance = self.table.sort("distance", descending=True).to_trips()
+        by_price = self.table.sort("price").to_trips()
+
+        assert by_distance == sorted(
+            self.trips, key=lambda trip: trip.distance, reverse=True
+        )
+        assert by_price == sorted(self.trips, key=min_price)
+
+    def test_top_k(self):
+        for k in (0, 1, 10, 299, 300, 500):
+            assert self.table.top_k(k, "travel_time").to_trips() == (
+                self.table.sort("travel_time").to_trips()[:k]
+            )
+            assert self.table.top_k(k, "price").to_trips() == (
+                self.table.sort("price").to_trips()[:k]
+            )
+
+    def test_chained_queries(self):
+        cheap = self.table.filter(max_price=200)
+        result = cheap.sort("departure").filter(max_distance=500).top_k(5, "price")
+
+        assert (
+            result.to_trips()
+            == sorted(
+                (
+                    trip
+                    for trip in self.trips
+                    if min_price(trip) <= 200 and trip.distance <= 500
+                ),
+                key=lambda trip: (min_price(trip), trip.departure_time),
+            )[:5]
+        )
+
+    def test_empty(self):
+        table = RWTripTable([])
+
+        assert len(table) == 0
+        assert table.sort().to_trips() == []
+        assert len(table.filter(max_price=10)) == 0
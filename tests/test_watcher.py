@@ -0,0 +1,230 @@
+import asyncio
+
+from benchmarks import payloads
+from tmrailwaysapi import json_codec, model_decoders, model_mappers
+from tmrailwaysapi.watcher import RWPollPolicy, RWSeatWatcher
+
+FAST = RWPollPolicy(min_interval=0.01, max_interval=0.02, departure_factor=1)
+
+
+class FakeClient:
+    """get_seats flips one seat every `change_every` polls"""
+
+    def __init__(self, change_every=1, delay=0.005):
+        self.change_every = change_every
+        self.delay = delay
+        self.polls = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def get_seats(self, trip, wagon, adults, children=0):
+        self.polls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+
+        response = payloads.seats_response(wagons=2, seats=36)
+        response["data"]["outbound"]["trip_id"] = trip.id
+        version = self.polls // self.change_every
+        seat = response["data"]["outbound"]["journeys"][0]["train_wagons"][0]["seats"][
+            0
+        ]
+        seat["available"] = version % 2 == 0
+        return model_mappers.seats_from_json(response["data"])
+
+
+def make_trips(count):
+    body = json_codec.dumps(payloads.trips_response(trips=count))
+    return model_decoders.trips_from_bytes(body)
+
+
+def clock_before(trips, seconds):
+    start = min(trip.departure_time.timestamp() for trip in trips) - seconds
+    return lambda: start
+
+
+async def collect(subscription, count, timeout=2):
+    events = []
+
+    async def read():
+        async for event in subscription:
+            events.append(event)
+            if len(events) == count:
+                break
+
+    await asyncio.wait_for(read(), timeout)
+    return events
+
+
+class TestPollPolicy:
+    def test_intervals(self):
+        policy = RWPollPolicy(min_interval=10, max_interval=600, departure_factor=0.01)
+
+        # a week out hits max_interval, an hour out is polled every 36s
+        assert policy.get_interval(None, False, 7 * 86400) == 600
+        assert policy.get_interval(None, False, 3600) == 36
+        assert policy.get_interval(None, False, 60) == 10
+        assert policy.get_interval(100, True, 86400) == 50
+        assert policy.get_interval(100, False, 86400) == 150
+        assert policy.get_interval(500, False, 3600) == 36
+        assert policy.get_interval(12, True, 86400) == 10
+
+
+class TestSeatWatcher:
+    def test_publishes_changes(self):
+        async def main():
+            trips = make_trips(3)
+            client = FakeClient()
+            async with RWSeatWatcher(
+                client, policy=FAST, clock=clock_before(trips, 86400)
+            ) as watcher:
+                subscription = watcher.subscribe()
+                for trip in trips:
+                    watcher.watch(trip, trip.wagon_types[0], adults=1)
+
+                events = await collect(subscription, 9)
+
+            first = [event for event in events if event.diff.wagons[0].is_new]
+            assert {event.watch.trip.id for event in first} == {
+                trip.id for trip in trips
+            }
+            later = [event for event in events if event not in first]
+            assert later
+            assert all(
+                event.diff.became_free + event.diff.became_taken == 1 for event in later
+            )
+            assert all(event.next_poll_in <= 0.02 for event in events)
+
+        asyncio.run(main())
+
+    def test_concurrency_budget(self):
+        async def main():
+            trips = make_trips(20)
+            client = FakeClient(delay=0.01)
+            watcher = RWSeatWatcher(
+                client, concurrency=3, policy=FAST, clock=clock_before(trips, 86400)
+            )
+            for trip in trips:
+                watcher.watch(trip, trip.wagon_types[0], adults=1)
+
+            watcher.start()
+            await asyncio.sleep(0.2)
+            await watcher.close()
+
+            assert client.polls > 20
+            assert client.max_running == 3
+
+        asyncio.run(main())
+
+    def test_failed_polls_are_rescheduled(self):
+        class BrokenClient(FakeClient):
+            async def get_seats(self, trip, wagon, adults, children=0):
+                seats = await super().get_seats(trip, wagon, adults, children)
+                # fails after the request, while diffing
+                return seats._replace(outbound=None) if self.polls % 2 else seats
+
+        async def main():
+            trips = make_trips(1)
+            client = BrokenClient(change_every=2)
+            async with RWSeatWatcher(
+                client, policy=FAST, clock=clock_before(trips, 86400)
+            ) as watcher:
+                subscription = watcher.subscribe()
+                watcher.watch(trips[0], trips[0].wagon_types[0], adults=1)
+
+                events = await collect(subscription, 2)
+
+            assert len(events) == 2
+            assert client.polls >= 3
+
+        asyncio.run(main())
+
+    def test_departed_failing_trip_is_unwatched(self):
+        class FailingClient(FakeClient):
+            async def get_seats(self, trip, wagon, adults, children=0):
+                await super().get_seats(trip, wagon, adults, children)
+                raise ConnectionError
+
+        async def main():
+            trips = make_trips(1)
+            client = FailingClient()
+            async with RWSeatWatcher(
+                client, policy=FAST, clock=clock_before(trips, -60)
+            ) as watcher:
+                watcher.watch(trips[0], trips[0].wagon_types[0], adults=1)
+                await asyncio.sleep(0.05)
+
+                assert len(watcher) == 0
+                assert client.polls == 1
+
+        asyncio.run(main())
+
+    def test_backpressure(self):
+        async def main():
+            trips = make_trips(1)
+            client = FakeClient()
+            async with RWSeatWatcher(
+                client, policy=FAST, clock=clock_before(trips, 86400)
+            ) as watcher:
+                subscription = watcher.subscribe(maxsize=2)
+                watcher.watch(trips[0], trips[0].wagon_types[0], adults=1)
+
+                await asyncio.sleep(0.2)
+                # queue full plus one publish waiting on it
+                assert client.polls == 3
+
+                events = await collect(subscription, 5)
+                assert len(events) == 5
+
+        asyncio.run(main())
+
+    def test_closing_full_subscription_releases_poll(self):
+        async def main():
+            trips = make_trips(1)
+            client = FakeClient()
+            async with RWSeatWatcher(
+                client, concurrency=1, policy=FAST, clock=clock_before(trips, 86400)
+            ) as watcher:
+                subscription = watcher.subscribe(maxsize=1)
+                watcher.watch(trips[0], trips[0].wagon_types[0], adults=1)
+
+                await asyncio.sleep(0.1)
+                # queue full plus one publish waiting on it
+                assert client.polls == 2
+
+                subscription.close()
+                await asyncio.sleep(0.1)
+                assert client.polls > 2
+
+        asyncio.run(main())
+
+    def test_unwatch_and_departure(self):
+        async def main():
+            trips = make_trips(2)
+            client = FakeClient()
+            now = [trips[1].departure_time.timestamp() - 3600]
+            watcher = RWSeatWatcher(client, policy=FAST, clock=lambda: now[0])
+            subscription = watcher.subscribe()
+            watch = watcher.watch(trips[1], trips[1].wagon_types[0], adults=1)
+            watcher.start()
+
+            await collect(subscription, 2)
+            watcher.unwatch(watch)
+            assert len(watcher) == 0
+            polls = client.polls
+            await asyncio.sleep(0.05)
+            assert client.polls <= polls + 1
+
+            watcher.watch(trips[1], trips[1].wagon_types[0], adults=1)
+            now[0] += 7200
+            await collect(subscription, 1)
+            await asyncio.sleep(0.05)
+            assert len(watcher) == 0
+
+            await watcher.close()
+            assert [event async for event in subscription] == []
+
+        asyncio.run(main())
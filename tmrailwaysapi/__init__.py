@@ -1,13 +1,43 @@
 from .client import RWClient
 from .async_client import RWAsyncClient
+from .batch import RWTripQuery
+from .bulk_booking import RWBookingRequest, RWHoldTracker
+from .fake_transport import RWAsyncFakeTransport, RWFakeTransport
+from .fare_calendar import RWFareCalendar
+from .fares import RWFareEngine
 from .models import RWLocation, RWTrip, RWWagon, RWJourney
+from .pool import RWPoolConfig
+from .rate_limit import RWFileRateLimiter, RWRateLimiter
+from .resilience import RWCircuitBreaker, RWRetryPolicy, RWTimeout
+from .response_cache import RWResponseCache
+from .station_cache import RWStationCache
+from .trip_table import RWTripTable
+from .watcher import RWPollPolicy, RWSeatWatcher
 
 
 __all__ = [
     "RWAsyncClient",
+    "RWAsyncFakeTransport",
+    "RWBookingRequest",
+    "RWCircuitBreaker",
     "RWClient",
+    "RWFakeTransport",
+    "RWFareCalendar",
+    "RWFareEngine",
+    "RWFileRateLimiter",
+    "RWHoldTracker",
     "RWLocation",
+    "RWPollPolicy",
+    "RWPoolConfig",
+    "RWRateLimiter",
+    "RWResponseCache",
+    "RWRetryPolicy",
+    "RWSeatWatcher",
+    "RWStationCache",
+    "RWTimeout",
     "RWTrip",
+    "RWTripQuery",
+    "RWTripTable",
     "RWWagon",
     "RWJourney",
 ]
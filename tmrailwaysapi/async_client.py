@@ -1,8 +1,18 @@
+import asyncio
 import datetime
-from typing import Optional, List, Awaitable
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, List, Awaitable
 
-from . import model_mappers
+from . import model_mappers, protocol
+from .batch import (
+    RWDateTrips,
+    RWTripBatch,
+    RWTripQuery,
+    bounded_as_completed,
+    date_range,
+)
 from .async_session import RWAsyncSession
+from .bulk_booking import RWBookingBatch, RWBookingRequest, RWHoldTracker
 from .constants import RWConstants
 from .models import (
     RWBooking,
@@ -12,61 +22,189 @@ from .models import (
     RWPassenger,
     RWPriceSummary,
     RWSeat,
+    RWSeats,
     RWTrip,
     RWTripSeats,
     RWWagon,
     RWWagonSeats,
 )
-from .exceptions import APIStatusError
+from .location_index import RWLocationIndex
+from .pool import RWPoolConfig, RWPoolStats
+from .protocol import RWAsyncTransport
+from .rate_limit import RWRateLimiter
+from .resilience import RWCircuitBreaker, RWRetryPolicy, RWTimeout
+from .response_cache import RWResponseCache
+from .seat_selection import (
+    RWJourneySelection,
+    RWSeatChoice,
+    get_selected_journeys,
+)
+from .single_flight import RWSingleFlight
+from .station_cache import RWStationCache, RWStationCacheEntry
+
+
+logger = logging.getLogger(__name__)
 
 
 class RWAsyncClient:
     """The async version of RWClient"""
 
-    def __init__(self, hostname: Optional[str] = None) -> None:
-        hostname = hostname or RWConstants.HOSTNAME
-        self._session = RWAsyncSession(hostname=hostname)
+    def __init__(
+        self,
+        hostname: Optional[str] = None,
+        station_cache: Optional[RWStationCache] = None,
+        response_cache: Optional[RWResponseCache] = None,
+        pool_config: Optional[RWPoolConfig] = None,
+        timeout: Optional[RWTimeout] = None,
+        retry_policy: Optional[RWRetryPolicy] = None,
+        booking_retry_policy: Optional[RWRetryPolicy] = None,
+        circuit_breaker: Optional[RWCircuitBreaker] = None,
+        rate_limiter: Optional[RWRateLimiter] = None,
+        lazy: bool = False,
+        transport: Optional[RWAsyncTransport] = None,
+    ) -> None:
+        # anything with `send(RWRequest) -> RWResponse`, `RWAsyncSession`
+        # by default, the arguments above only configure the latter
+        if transport is None:
+            transport = RWAsyncSession(
+                hostname=hostname or RWConstants.HOSTNAME,
+                pool_config=pool_config,
+                timeout=timeout,
+                retry_policy=retry_policy,
+                booking_retry_policy=booking_retry_policy,
+                circuit_breaker=circuit_breaker,
+                rate_limiter=rate_limiter,
+            )
+        self._session = transport
+        self._station_cache = station_cache
+        self._response_cache = response_cache
+        # parse nested models and timestamps on first access
+        self._lazy = lazy
+        self._refresh_task = None
+        self._single_flight = RWSingleFlight()
 
         self._locations = []
+        self._location_index = RWLocationIndex(())
+
+    @property
+    def pool_stats(self) -> RWPoolStats:
+        """Connection pool saturation, see `RWPoolStats`"""
+        return self._session.pool_stats
+
+    @property
+    def response_cache(self) -> Optional[RWResponseCache]:
+        return self._response_cache
+
+    def _get_cached(self, key: tuple) -> Optional[Any]:
+        if self._response_cache is None:
+            return None
+        return self._response_cache.get(key)
+
+    def _set_cached(self, key: tuple, value: Any) -> None:
+        if self._response_cache is not None:
+            self._response_cache.set(key, value)
+
+    def _set_locations(self, stations: List[Dict[str, Any]]) -> None:
+        locations = [
+            model_mappers.location_from_json(station) for station in stations
+        ]
+        self._location_index = RWLocationIndex(locations)
+        self._locations = locations
+
+    async def _download_stations(
+        self, cache_entry: Optional[RWStationCacheEntry] = None
+    ) -> Awaitable[List[Dict[str, Any]]]:
+        """Download stations, revalidating `cache_entry` if it is given"""
+        headers = None
+        if cache_entry is not None:
+            headers = RWStationCache.get_conditional_headers(cache_entry)
+
+        response = await self._session.send(protocol.build_stations_request(headers))
+        protocol.check_status(response, allow_not_modified=cache_entry is not None)
+
+        if response.status == 304:
+            return self._station_cache.touch(
+                self._session.get_hostname(), cache_entry
+            ).stations
+
+        stations = protocol.parse_stations(response.body)
+
+        if self._station_cache is not None:
+            self._station_cache.store(
+                self._session.get_hostname(),
+                stations,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return stations
+
+    async def _refresh_locations(self) -> Awaitable:
+        """Background station catalog refresh"""
+        try:
+            self._set_locations(await self._download_stations())
+        except Exception:
+            logger.warning("Failed to refresh station catalog", exc_info=True)
 
     async def _fetch_locations(self) -> Awaitable:
         """Fetch stations/locations"""
-        response = await self._session.get_stations()
-        json_data = await response.json()
-        APIStatusError.raise_for_status(json_data)
+        if self._station_cache is None:
+            self._set_locations(await self._download_stations())
+            return
+
+        cache_entry = self._station_cache.load(self._session.get_hostname())
+
+        if cache_entry is None:
+            self._set_locations(await self._download_stations())
+        elif self._station_cache.is_fresh(cache_entry):
+            self._set_locations(cache_entry.stations)
+        elif RWStationCache.can_revalidate(cache_entry):
+            self._set_locations(await self._download_stations(cache_entry))
+        else:
+            # serve stale catalog, fresh one will replace it when ready
+            self._set_locations(cache_entry.stations)
+            self._refresh_task = asyncio.ensure_future(self._refresh_locations())
 
-        for station in json_data["data"]["stations"]:
-            location = model_mappers.location_from_json(station)
-            self._locations.append(location)
+    async def __aenter__(self) -> "RWAsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     async def close(self) -> Awaitable:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
         # aiohttp.ClientSession has to be closed explicitly
-        await self._session._close()
+        await self._session.close()
 
     async def get_locations(self) -> Awaitable[List[RWLocation]]:
         if not self._locations:
-            await self._fetch_locations()
+            await self._single_flight.run(("locations",), self._fetch_locations)
         return self._locations
 
+    async def get_location_index(self) -> Awaitable[RWLocationIndex]:
+        if not self._locations:
+            await self._single_flight.run(("locations",), self._fetch_locations)
+        return self._location_index
+
     async def get_location_by_id(
         self, location_id: int
     ) -> Awaitable[Optional[RWLocation]]:
         """Gets location by id"""
-        async for location in self.get_locations():
-            if location.id == location_id:
-                return location
-
-        return None
+        return (await self.get_location_index()).get_by_id(location_id)
 
     async def get_location_by_name(
         self, location_name: str
     ) -> Awaitable[Optional[RWLocation]]:
-        """Gets location by name"""
-        for location in await self.get_locations():
-            if location.name == location_name:
-                return location
+        """Gets location by name, ignoring case and diacritics if no exact match"""
+        return (await self.get_location_index()).get_by_name(location_name)
 
-        return None
+    async def search_locations(
+        self, query: str, limit: int = 10
+    ) -> Awaitable[List[RWLocation]]:
+        """Autocomplete locations by (partial or misspelled) name"""
+        return (await self.get_location_index()).search(query, limit)
 
     async def search_trips(
         self,
@@ -78,24 +216,118 @@ class RWAsyncClient:
     ) -> Awaitable[List[RWTrip]]:
         """Search trips by given critteria"""
         date_str = date.strftime("%Y-%m-%d")
-
-        response = await self._session.search_trips(
-            src_location.id,
-            dest_location.id,
+        cache_key = RWResponseCache.make_key(
+            "search_trips",
+            str(src_location.id),
+            str(dest_location.id),
             date_str,
             adults,
             children,
         )
-        response_json = await response.json()
-        APIStatusError.raise_for_status(response_json)
-        trips = []
+        trips = self._get_cached(cache_key)
+        if trips is not None:
+            return trips
 
-        for trip_data in response_json["data"]["trips"]:
-            trip = model_mappers.trip_from_json(trip_data)
-            trips.append(trip)
+        return await self._single_flight.run(
+            cache_key,
+            lambda: self._fetch_trips(
+                cache_key, src_location.id, dest_location.id, date_str, adults, children
+            ),
+        )
 
+    async def _fetch_trips(
+        self,
+        cache_key: tuple,
+        src_location_id: int,
+        dest_location_id: int,
+        date_str: str,
+        adults: int,
+        children: int,
+    ) -> Awaitable[List[RWTrip]]:
+        response = await self._session.send(
+            protocol.build_search_trips_request(
+                src_location_id, dest_location_id, date_str, adults, children
+            )
+        )
+        protocol.check_status(response)
+        trips = protocol.parse_trips(response.body, lazy=self._lazy)
+
+        self._set_cached(cache_key, trips)
         return trips
 
+    async def _search_trips_on_date(
+        self,
+        src_location: RWLocation,
+        dest_location: RWLocation,
+        date: datetime.date,
+        adults: int,
+        children: int,
+    ) -> Awaitable[RWDateTrips]:
+        try:
+            trips = await self.search_trips(
+                src_location, dest_location, date, adults, children
+            )
+        except Exception as ex:
+            return RWDateTrips(date=date, trips=None, error=ex)
+
+        return RWDateTrips(date=date, trips=trips, error=None)
+
+    async def iter_search_trips_range(
+        self,
+        src_location: RWLocation,
+        dest_location: RWLocation,
+        start: datetime.date,
+        end: datetime.date,
+        adults: int,
+        children: int = 0,
+        concurrency: int = 8,
+    ) -> AsyncIterator[RWDateTrips]:
+        """Search trips for every day from `start` to `end` (inclusive)
+
+        Days are searched concurrently, at most `concurrency` at a time,
+        and yielded in completion order. A failed day is yielded with
+        its `error` set and does not affect the other days.
+        """
+        searches = (
+            self._search_trips_on_date(
+                src_location, dest_location, date, adults, children
+            )
+            for date in date_range(start, end)
+        )
+
+        async for result in bounded_as_completed(searches, concurrency):
+            yield result
+
+    async def search_trips_range(
+        self,
+        src_location: RWLocation,
+        dest_location: RWLocation,
+        start: datetime.date,
+        end: datetime.date,
+        adults: int,
+        children: int = 0,
+        concurrency: int = 8,
+    ) -> Awaitable[Dict[datetime.date, RWDateTrips]]:
+        """Same as `iter_search_trips_range`, but waits for all days"""
+        results = {}
+
+        async for result in self.iter_search_trips_range(
+            src_location, dest_location, start, end, adults, children, concurrency
+        ):
+            results[result.date] = result
+
+        return dict(sorted(results.items()))
+
+    def search_trips_batch(
+        self, queries: Iterable[RWTripQuery], concurrency: int = 16
+    ) -> RWTripBatch:
+        """Search many (src, dest, date, pax) queries with bounded concurrency
+
+        Returns an async iterable of per-query results,
+        see `RWTripBatch` for details.
+        """
+        return RWTripBatch(self, queries, concurrency)
+
     async def get_price_summary(
         self, outbound_trip: RWTrip, inbound_trip: Optional[RWTrip] = None
     ) -> Awaitable[RWPriceSummary]:
@@ -104,14 +336,33 @@ class RWAsyncClient:
         Actually this does not really give you price summary.
         All calculations has to be done manually on the client side.
         This only returns prices for services like how much for an adult or child.
+        `RWFareEngine` computes totals from it.
         """
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        cache_key = RWResponseCache.make_key(
+            "price_summary", outbound_trip.id, inbound_trip_id
+        )
+        price_summary = self._get_cached(cache_key)
+        if price_summary is not None:
+            return price_summary
+
+        return await self._single_flight.run(
+            cache_key,
+            lambda: self._fetch_price_summary(
+                cache_key, outbound_trip.id, inbound_trip_id
+            ),
+        )
 
-        response = await self._session.get_price_summary(
-            outbound_trip.id, inbound_trip.id if inbound_trip is not None else -1
+    async def _fetch_price_summary(
+        self, cache_key: tuple, outbound_trip_id: int, inbound_trip_id: int
+    ) -> Awaitable[RWPriceSummary]:
+        response = await self._session.send(
+            protocol.build_price_summary_request(outbound_trip_id, inbound_trip_id)
         )
-        response_json = await response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.price_summary_from_json(response_json["data"])
+        protocol.check_status(response)
+        price_summary = protocol.parse_price_summary(response.body)
+        self._set_cached(cache_key, price_summary)
+        return price_summary
 
     async def get_seats(
         self,
@@ -123,72 +374,128 @@ class RWAsyncClient:
         inbound_wagon: Optional[RWWagon] = None,
     ) -> Awaitable[RWTripSeats]:
         """Get available seats for given wagons/trains"""
-        response = await self._session.get_seats(
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        inbound_wagon_id = inbound_wagon.id if inbound_wagon is not None else -1
+        cache_key = RWResponseCache.make_key(
+            "seats",
             outbound_trip.id,
             outbound_wagon.id,
             adults,
             children,
-            inbound_trip.id if inbound_trip is not None else -1,
-            inbound_wagon.id if inbound_wagon is not None else -1,
+            inbound_trip_id,
+            inbound_wagon_id,
+        )
+        seats = self._get_cached(cache_key)
+        if seats is not None:
+            return seats
+
+        return await self._single_flight.run(
+            cache_key,
+            lambda: self._fetch_seats(
+                cache_key,
+                outbound_trip.id,
+                outbound_wagon.id,
+                adults,
+                children,
+                inbound_trip_id,
+                inbound_wagon_id,
+            ),
+        )
+
+    async def _fetch_seats(
+        self,
+        cache_key: tuple,
+        outbound_trip_id: int,
+        outbound_wagon_id: int,
+        adults: int,
+        children: int,
+        inbound_trip_id: int,
+        inbound_wagon_id: int,
+    ) -> Awaitable[RWSeats]:
+        response = await self._session.send(
+            protocol.build_seats_request(
+                outbound_trip_id,
+                outbound_wagon_id,
+                adults,
+                children,
+                inbound_trip_id,
+                inbound_wagon_id,
+            )
         )
-        response_json = await response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.seats_from_json(response_json["data"])
+        protocol.check_status(response)
+        seats = protocol.parse_seats(response.body, lazy=self._lazy)
+        self._set_cached(cache_key, seats)
+        return seats
 
     async def book_tickets(
         self,
         contact: RWContact,
         passengers: List[RWPassenger],
-        outbound_journey: RWJourneySeats,
-        outbound_wagon: RWWagonSeats,
-        outbound_seat: RWSeat,
+        outbound_journey: Optional[RWJourneySeats] = None,
+        outbound_wagon: Optional[RWWagonSeats] = None,
+        outbound_seat: Optional[RWSeat] = None,
         has_media_wifi: bool = False,
         has_lunchbox: bool = False,
         bedding_type: str = "default",
         inbound_journey: Optional[RWJourneySeats] = None,
         inbound_wagon: Optional[RWWagonSeats] = None,
         inbound_seat: Optional[RWSeat] = None,
+        outbound_seats: Optional[List[RWSeatChoice]] = None,
+        inbound_seats: Optional[List[RWSeatChoice]] = None,
+        outbound_selections: Optional[List[RWJourneySelection]] = None,
+        inbound_selections: Optional[List[RWJourneySelection]] = None,
+        seats: Optional[RWSeats] = None,
     ) -> Awaitable[RWBooking]:
-        """Proceed to booking tickets"""
-
-        if inbound_journey and inbound_wagon and inbound_seat:
-            inbound_journey_id = inbound_journey.id
-            inbound_wagon_id = inbound_wagon.id
-            inbound_seat_id = inbound_seat.id
-        elif inbound_journey or inbound_wagon or inbound_seat:
-            raise ValueError(
-                "You are trying to book tickets, but not all `inbound_*` arguments are set"
+        """Proceed to booking tickets, see `RWClient.book_tickets`"""
+
+        outbound_journeys = get_selected_journeys(
+            "outbound",
+            outbound_journey,
+            outbound_wagon,
+            outbound_seat,
+            outbound_seats,
+            outbound_selections,
+            seats.outbound if seats is not None else None,
+        )
+        if outbound_journeys is None:
+            raise ValueError("No outbound seat to book")
+
+        inbound_journeys = get_selected_journeys(
+            "inbound",
+            inbound_journey,
+            inbound_wagon,
+            inbound_seat,
+            inbound_seats,
+            inbound_selections,
+            seats.inbound if seats is not None else None,
+        )
+
+        response = await self._session.send(
+            protocol.build_booking_request(
+                contact_mobile=contact.mobile,
+                contact_email=contact.email,
+                contact_main_contact=contact.main_contact,
+                passengers=passengers,
+                api_client="web",
+                has_media_wifi=has_media_wifi,
+                has_lunchbox=has_lunchbox,
+                bedding_type=bedding_type,
+                outbound_journeys=outbound_journeys,
+                inbound_journeys=inbound_journeys,
             )
-        else:
-            inbound_journey_id = inbound_wagon_id = inbound_seat_id = -1
-
-        response = await self._session.book_tickets(
-            contact_mobile=contact.mobile,
-            contact_email=contact.email,
-            contact_main_contact=contact.main_contact,
-            passengers=[
-                {
-                    "name": passenger.name,
-                    "surname": passenger.surname,
-                    "dob": passenger.dob.strftime("%d-%m-%Y"),
-                    "tariff": passenger.tariff,
-                    "gender": passenger.gender,
-                    "identity_type": passenger.identity_type,
-                    "identity_number": passenger.identity_number,
-                }
-                for passenger in passengers
-            ],
-            outbound_journey_id=outbound_journey.id,
-            outbound_wagon_id=outbound_wagon.id,
-            outbound_seat_id=outbound_seat.id,
-            api_client="web",
-            has_media_wifi=has_media_wifi,
-            has_lunchbox=has_lunchbox,
-            bedding_type=bedding_type,
-            inbound_journey_id=inbound_journey_id,
-            inbound_wagon_id=inbound_wagon_id,
-            inbound_seat_id=inbound_seat_id,
         )
-        response_json = await response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.booking_from_json(response_json["data"]["booking"])
+        protocol.check_status(response)
+        return protocol.parse_booking(response.body)
+
+    def book_tickets_batch(
+        self,
+        requests: Iterable[RWBookingRequest],
+        concurrency: int = 4,
+        hold_tracker: Optional[RWHoldTracker] = None,
+    ) -> RWBookingBatch:
+        """Make many bookings with bounded concurrency
+
+        Returns an async iterable of per-request results, successful
+        bookings are added to `hold_tracker`, see `RWBookingBatch`.
+        """
+        return RWBookingBatch(self, requests, concurrency, hold_tracker)
@@ -1,43 +1,148 @@
-from typing import Dict, List, Awaitable
+from typing import Dict, Awaitable, List, Optional, Union
 
 import asyncio
 import aiohttp
 
+from . import json_codec, protocol
+from .pool import (
+    RWPoolConfig,
+    RWPoolStats,
+    create_connector,
+    create_trace_config,
+)
+from .protocol import RWRequest, RWResponse
+from .rate_limit import RWRateLimiter
+from .models import RWPassenger
+from .request_encoders import JSON_HEADERS, JourneySeatIds, SeatIds
+from .resilience import (
+    DEFAULT_BOOKING_RETRY_POLICY,
+    DEFAULT_RETRY_POLICY,
+    RWCircuitBreaker,
+    RWRetryPolicy,
+    RWTimeout,
+)
 from .session import RWSession
 
 
 class RWAsyncSession:
     """The async version of RWSession"""
 
-    def __init__(self, hostname: str) -> None:
+    def __init__(
+        self,
+        hostname: str,
+        pool_config: Optional[RWPoolConfig] = None,
+        timeout: Optional[RWTimeout] = None,
+        retry_policy: Optional[RWRetryPolicy] = None,
+        booking_retry_policy: Optional[RWRetryPolicy] = None,
+        circuit_breaker: Optional[RWCircuitBreaker] = None,
+        rate_limiter: Optional[RWRateLimiter] = None,
+    ) -> None:
         self._hostname = hostname
 
+        timeout = timeout or RWTimeout()
+        self._timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout.connect, sock_read=timeout.read
+        )
+        self._retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self._booking_retry_policy = booking_retry_policy or DEFAULT_BOOKING_RETRY_POLICY
+        self.circuit_breaker = circuit_breaker or RWCircuitBreaker()
+        self.rate_limiter = rate_limiter
+
+        self.pool_stats = RWPoolStats()
         self._client_session = aiohttp.ClientSession(
-            headers=RWSession.get_default_headers(), raise_for_status=True
+            connector=create_connector(pool_config or RWPoolConfig()),
+            headers=RWSession.get_default_headers(),
+            trace_configs=[create_trace_config(self.pool_stats)],
         )
 
-    async def _close(self) -> Awaitable:
+    async def close(self) -> Awaitable:
+        # waits until every connection is closed, see pyproject's aiohttp
         await self._client_session.close()
-        await asyncio.sleep(1)
-
-    async def get(self, path: str = "", *args, **kwargs) -> Awaitable[aiohttp.ClientResponse]:
-        return await self._client_session.get(
-            "https://" + self._hostname + path, *args, **kwargs
-        )
 
-    async def post(self, path: str = "", *args, **kwargs) -> Awaitable[aiohttp.ClientResponse]:
-        return await self._client_session.post(
-            "https://" + self._hostname + path, *args, **kwargs
-        )
+    async def _send(
+        self, method: str, path: str, retry_policy: RWRetryPolicy, **kwargs
+    ) -> Awaitable[aiohttp.ClientResponse]:
+        """Send request with timeouts, retries and circuit breaker
+
+        The last response is returned whatever its status, see
+        `protocol.check_status`.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        if "json" in kwargs:
+            kwargs["data"] = json_codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **JSON_HEADERS)
+        attempt = 0
+
+        while True:
+            self.circuit_breaker.before_request()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                # read the body right away so the connection goes back
+                # to the pool now, not whenever the response is collected
+                async with self._client_session.request(
+                    method, "https://" + self._hostname + path, **kwargs
+                ) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                self.circuit_breaker.record_failure()
+
+                connect_error = isinstance(
+                    ex, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)
+                )
+                if not retry_policy.can_retry(attempt, 0, connect_error):
+                    raise
+            else:
+                if response.status >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+                if not retry_policy.can_retry(attempt, response.status):
+                    return response
+
+            await asyncio.sleep(retry_policy.get_delay(attempt))
+            attempt += 1
+
+    async def get(self, path: str = "", **kwargs) -> Awaitable[aiohttp.ClientResponse]:
+        return await self._send("GET", path, self._retry_policy, **kwargs)
+
+    async def post(
+        self, path: str = "", idempotent: bool = True, **kwargs
+    ) -> Awaitable[aiohttp.ClientResponse]:
+        retry_policy = self._retry_policy if idempotent else self._booking_retry_policy
+        return await self._send("POST", path, retry_policy, **kwargs)
 
     def get_hostname(self) -> str:
         return self._hostname
 
+    async def _send_request(
+        self, request: RWRequest
+    ) -> Awaitable[aiohttp.ClientResponse]:
+        retry_policy = (
+            self._retry_policy if request.idempotent else self._booking_retry_policy
+        )
+        return await self._send(
+            request.method,
+            request.path,
+            retry_policy,
+            data=request.body,
+            headers=request.headers,
+        )
+
+    async def send(self, request: RWRequest) -> Awaitable[RWResponse]:
+        """Transport for `RWAsyncClient`, see `protocol`"""
+        response = await self._send_request(request)
+        return RWResponse(response.status, response.headers, await response.read())
+
     async def get_main_page(self) -> Awaitable[aiohttp.ClientResponse]:
-        return await self.get()
+        return await self._send_request(protocol.build_main_page_request())
 
-    async def get_stations(self) -> Awaitable[aiohttp.ClientResponse]:
-        return await self.get("/railway-api/stations")
+    async def get_stations(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> Awaitable[aiohttp.ClientResponse]:
+        return await self._send_request(protocol.build_stations_request(headers))
 
     async def search_trips(
         self,
@@ -47,26 +152,17 @@ class RWAsyncSession:
         adults: int,
         children: int = 0,
     ) -> Awaitable[aiohttp.ClientResponse]:
-        return await self.post(
-            "/railway-api/trips",
-            json={
-                "source": str(src_location),
-                "destination": str(dest_location),
-                "date": date,
-                "adult": adults,
-                "child": children,
-            },
+        return await self._send_request(
+            protocol.build_search_trips_request(
+                src_location, dest_location, date, adults, children
+            )
         )
 
     async def get_price_summary(
         self, outbound_trip_id: int, inbound_trip_id: int = -1
     ) -> Awaitable[aiohttp.ClientResponse]:
-        if inbound_trip_id == -1:
-            return await self.get(f"/railway-api/trips/{outbound_trip_id}/price_summary?")
-
-        return await self.get(
-            "/railway-api/roundtrips"
-            f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}/price_summary?"
+        return await self._send_request(
+            protocol.build_price_summary_request(outbound_trip_id, inbound_trip_id)
         )
 
     async def get_seats(
@@ -78,25 +174,15 @@ class RWAsyncSession:
         inbound_trip_id: int = -1,
         inbound_wagon_id: int = -1,
     ) -> Awaitable[aiohttp.ClientResponse]:
-        if inbound_trip_id == -1:
-            return await self.post(
-                f"/railway-api/trips/{outbound_trip_id}",
-                json={
-                    "adult": adults,
-                    "child": children,
-                    "outbound_wagon_type_id": outbound_wagon_id,
-                },
+        return await self._send_request(
+            protocol.build_seats_request(
+                outbound_trip_id,
+                outbound_wagon_id,
+                adults,
+                children,
+                inbound_trip_id,
+                inbound_wagon_id,
             )
-
-        return await self.post(
-            "/railway-api/roundtrips"
-            f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}",
-            json={
-                "adult": adults,
-                "child": children,
-                "outbound_wagon_type_id": outbound_wagon_id,
-                "inbound_wagon_type_id": inbound_wagon_id,
-            },
         )
 
     async def book_tickets(
@@ -104,10 +190,10 @@ class RWAsyncSession:
         contact_mobile: str,
         contact_email: str,
         contact_main_contact: str,
-        passengers: List[Dict[str, str]],
-        outbound_journey_id: int,
-        outbound_wagon_id: int,
-        outbound_seat_id: int,
+        passengers: List[Union[RWPassenger, Dict[str, str]]],
+        outbound_journey_id: int = -1,
+        outbound_wagon_id: int = -1,
+        outbound_seat_id: int = -1,
         api_client: str = "web",
         has_media_wifi: bool = False,
         has_lunchbox: bool = False,
@@ -115,53 +201,31 @@ class RWAsyncSession:
         inbound_journey_id: int = -1,
         inbound_wagon_id: int = -1,
         inbound_seat_id: int = -1,
+        outbound_seats: Optional[SeatIds] = None,
+        inbound_seats: Optional[SeatIds] = None,
+        outbound_journeys: Optional[JourneySeatIds] = None,
+        inbound_journeys: Optional[JourneySeatIds] = None,
     ) -> Awaitable[aiohttp.ClientResponse]:
-        if (
-            inbound_journey_id != -1
-            and inbound_wagon_id != -1
-            and inbound_seat_id != -1
-        ):
-            inbound = {
-                "selected_journeys": [
-                    {
-                        "id": inbound_journey_id,
-                        "seats": [
-                            {
-                                "id": inbound_seat_id,
-                                "train_wagon_id": inbound_wagon_id,
-                            },
-                        ],
-                    },
-                ],
-            }
-        else:
-            inbound = None
-
-        json_data = {
-            "has_media_wifi": has_media_wifi,
-            "has_lunchbox": has_lunchbox,
-            "bedding_type": bedding_type,
-            "api_client": api_client,
-            "contact": {
-                "mobile": contact_mobile,
-                "email": contact_email,
-                "main_contact": contact_main_contact,
-            },
-            "passengers": passengers,
-            "outbound": {
-                "selected_journeys": [
-                    {
-                        "id": outbound_journey_id,
-                        "seats": [
-                            {
-                                "id": outbound_seat_id,
-                                "train_wagon_id": outbound_wagon_id,
-                            },
-                        ],
-                    },
-                ],
-            },
-            "inbound": inbound,
-        }
-
-        return await self.post("/railway-api/bookings", json=json_data)
+        """Book seats, see `RWSession.book_tickets`"""
+        return await self._send_request(
+            protocol.build_booking_request(
+                contact_mobile,
+                contact_email,
+                contact_main_contact,
+                passengers,
+                outbound_journey_id=outbound_journey_id,
+                outbound_wagon_id=outbound_wagon_id,
+                outbound_seat_id=outbound_seat_id,
+                api_client=api_client,
+                has_media_wifi=has_media_wifi,
+                has_lunchbox=has_lunchbox,
+                bedding_type=bedding_type,
+                inbound_journey_id=inbound_journey_id,
+                inbound_wagon_id=inbound_wagon_id,
+                inbound_seat_id=inbound_seat_id,
+                outbound_seats=outbound_seats,
+                inbound_seats=inbound_seats,
+                outbound_journeys=outbound_journeys,
+                inbound_journeys=inbound_journeys,
+            )
+        )
@@ -0,0 +1,236 @@
+import asyncio
+import datetime
+import itertools
+import time
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .models import RWLocation, RWTrip
+
+if TYPE_CHECKING:
+    from .async_client import RWAsyncClient
+
+
+T = TypeVar("T")
+
+
+class RWDateTrips(NamedTuple):
+    date: datetime.date
+    trips: Optional[List[RWTrip]]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def date_range(start: datetime.date, end: datetime.date) -> List[datetime.date]:
+    """Dates from `start` to `end`, both inclusive"""
+    if isinstance(start, datetime.datetime):
+        start = start.date()
+    if isinstance(end, datetime.datetime):
+        end = end.date()
+
+    return [
+        start + datetime.timedelta(days=offset)
+        for offset in range((end - start).days + 1)
+    ]
+
+
+async def bounded_as_completed(
+    awaitables: Iterable[Awaitable[T]], concurrency: int
+) -> AsyncIterator[T]:
+    """Run awaitables with at most `concurrency` in flight, yield results as they finish
+
+    `awaitables` is consumed lazily, so a generator of coroutines
+    only creates coroutines when there is a free slot for them.
+    Unfinished tasks are cancelled if the consumer stops early.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    iterator = iter(awaitables)
+    pending = {
+        asyncio.ensure_future(awaitable)
+        for awaitable in itertools.islice(iterator, concurrency)
+    }
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for awaitable in itertools.islice(iterator, len(done)):
+                pending.add(asyncio.ensure_future(awaitable))
+
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class RWTripQuery(NamedTuple):
+    src_location: RWLocation
+    dest_location: RWLocation
+    date: datetime.date
+    adults: int
+    children: int = 0
+
+    def get_key(self) -> Tuple:
+        """Identity of the query as sent to the server"""
+        return (
+            self.src_location.id,
+            self.dest_location.id,
+            self.date.strftime("%Y-%m-%d"),
+            self.adults,
+            self.children,
+        )
+
+
+class RWTripQueryResult(NamedTuple):
+    query: RWTripQuery
+    trips: Optional[List[RWTrip]]
+    error: Optional[Exception]
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class RWBatchStats:
+    """Throughput and latency of a batch, updated while it runs"""
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.unique = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.latencies: List[float] = []
+
+    def __repr__(self) -> str:
+        return (
+            "<RWBatchStats: {}/{} done, {} failed, {:.1f} req/s, "
+            "p50 {:.3f}s, p95 {:.3f}s>".format(
+                self.completed,
+                self.unique,
+                self.failed,
+                self.throughput,
+                self.get_latency_percentile(50),
+                self.get_latency_percentile(95),
+            )
+        )
+
+    @property
+    def duplicates(self) -> int:
+        return self.submitted - self.unique
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        if not self.latencies:
+            return 0.0
+        return sum(self.latencies) / len(self.latencies)
+
+    @property
+    def max_latency(self) -> float:
+        return max(self.latencies, default=0.0)
+
+    def get_latency_percentile(self, percentile: float) -> float:
+        if not self.latencies:
+            return 0.0
+
+        latencies = sorted(self.latencies)
+        index = round(percentile / 100 * (len(latencies) - 1))
+        return latencies[index]
+
+
+class RWTripBatch:
+    """Bounded-concurrency search over many trip queries
+
+    Identical queries are sent once; results are streamed per
+    unique query in completion order while `stats` is kept up to date:
+
+        batch = client.search_trips_batch(queries, concurrency=16)
+        async for result in batch:
+            ...
+        print(batch.stats)
+    """
+
+    def __init__(
+        self,
+        client: "RWAsyncClient",
+        queries: Iterable[RWTripQuery],
+        concurrency: int = 16,
+    ) -> None:
+        self._client = client
+        self._queries = queries
+        self._concurrency = concurrency
+        self.stats = RWBatchStats()
+
+    def __aiter__(self) -> AsyncIterator[RWTripQueryResult]:
+        return self._run()
+
+    async def _search(self, query: RWTripQuery) -> Awaitable[RWTripQueryResult]:
+        started_at = time.monotonic()
+
+        try:
+            trips = await self._client.search_trips(*query)
+            error = None
+        except Exception as ex:
+            trips = None
+            error = ex
+
+        return RWTripQueryResult(
+            query=query,
+            trips=trips,
+            error=error,
+            latency=time.monotonic() - started_at,
+        )
+
+    async def _run(self) -> AsyncIterator[RWTripQueryResult]:
+        unique_queries: Dict[Tuple, RWTripQuery] = {}
+
+        for query in self._queries:
+            self.stats.submitted += 1
+            unique_queries.setdefault(query.get_key(), query)
+
+        self.stats.unique = len(unique_queries)
+        self.stats.started_at = time.monotonic()
+        searches = (self._search(query) for query in unique_queries.values())
+
+        try:
+            async for result in bounded_as_completed(searches, self._concurrency):
+                self.stats.completed += 1
+                self.stats.latencies.append(result.latency)
+                if not result.ok:
+                    self.stats.failed += 1
+
+                yield result
+        finally:
+            self.stats.finished_at = time.monotonic()
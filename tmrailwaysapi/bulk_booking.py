@@ -0,0 +1,265 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .batch import RWBatchStats, bounded_as_completed
+from .models import (
+    RWBooking,
+    RWContact,
+    RWJourneySeats,
+    RWPassenger,
+    RWSeat,
+    RWSeats,
+    RWWagonSeats,
+)
+from .seat_selection import RWJourneySelection, RWSeatChoice
+
+if TYPE_CHECKING:
+    from .async_client import RWAsyncClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class RWBookingRequest(NamedTuple):
+    """Arguments of one `book_tickets` call, passed by keyword"""
+
+    contact: RWContact
+    passengers: List[RWPassenger]
+    outbound_journey: Optional[RWJourneySeats] = None
+    outbound_wagon: Optional[RWWagonSeats] = None
+    outbound_seat: Optional[RWSeat] = None
+    has_media_wifi: bool = False
+    has_lunchbox: bool = False
+    bedding_type: str = "default"
+    inbound_journey: Optional[RWJourneySeats] = None
+    inbound_wagon: Optional[RWWagonSeats] = None
+    inbound_seat: Optional[RWSeat] = None
+    outbound_seats: Optional[List[RWSeatChoice]] = None
+    inbound_seats: Optional[List[RWSeatChoice]] = None
+    outbound_selections: Optional[List[RWJourneySelection]] = None
+    inbound_selections: Optional[List[RWJourneySelection]] = None
+    seats: Optional[RWSeats] = None
+
+
+class RWBookingResult(NamedTuple):
+    request: RWBookingRequest
+    booking: Optional[RWBooking]
+    error: Optional[Exception]
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class RWHoldEvent(NamedTuple):
+    booking: RWBooking
+    expires_in: float
+
+
+HoldCallback = Callable[[RWHoldEvent], Union[None, Awaitable[None]]]
+
+
+class RWHoldTracker:
+    """Notify shortly before booking holds expire
+
+    Holds sit in a min-heap keyed by the time they should be announced
+    (`expire_time` minus `lead_time`), so adding one is O(log n) and
+    the next due one is always at the top, whatever the number of open
+    holds. `run` sleeps until then and calls every callback (plain
+    functions or coroutine functions) with a `RWHoldEvent`. Holds that
+    are paid or cancelled should be `remove`d.
+
+    async with RWHoldTracker(lead_time=120) as tracker:
+        tracker.add_callback(on_expiring)
+        async for result in client.book_tickets_batch(requests, hold_tracker=tracker):
+            ...
+    """
+
+    def __init__(
+        self, lead_time: float = 60.0, clock: Callable[[], float] = time.time
+    ) -> None:
+        self._lead_time = lead_time
+        self._clock = clock
+        self._heap: List[Tuple[float, int, RWBooking]] = []
+        self._sequence = 0
+        self._holds: Dict[str, RWBooking] = {}
+        self._callbacks: List[HoldCallback] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._holds)
+
+    async def __aenter__(self) -> "RWHoldTracker":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __contains__(self, booking_number: str) -> bool:
+        return booking_number in self._holds
+
+    def add_callback(self, callback: HoldCallback) -> None:
+        self._callbacks.append(callback)
+
+    def add(self, booking: RWBooking) -> None:
+        self._sequence += 1
+        due = booking.expire_time.timestamp() - self._lead_time
+        heapq.heappush(self._heap, (due, self._sequence, booking))
+        self._holds[booking.booking_number] = booking
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def remove(self, booking_number: str) -> None:
+        # its heap entry is skipped when popped
+        self._holds.pop(booking_number, None)
+
+    def get_next_due(self) -> Optional[float]:
+        """When the next hold is to be announced, None if there are none"""
+        while (
+            self._heap
+            and self._holds.get(self._heap[0][2].booking_number) is not self._heap[0][2]
+        ):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self) -> List[RWHoldEvent]:
+        """Events of holds due by now, they stop being tracked"""
+        now = self._clock()
+        events = []
+
+        while True:
+            due = self.get_next_due()
+            if due is None or due > now:
+                break
+
+            _, _, booking = heapq.heappop(self._heap)
+            del self._holds[booking.booking_number]
+            events.append(RWHoldEvent(booking, booking.expire_time.timestamp() - now))
+
+        return events
+
+    async def _notify(self, event: RWHoldEvent) -> None:
+        for callback in self._callbacks:
+            try:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                logger.warning(
+                    "Hold callback failed for %s",
+                    event.booking.booking_number,
+                    exc_info=True,
+                )
+
+    async def run(self) -> None:
+        """Announce holds as they come due, until cancelled"""
+        self._wakeup = asyncio.Event()
+
+        while True:
+            for event in self.pop_due():
+                await self._notify(event)
+
+            self._wakeup.clear()
+            due = self.get_next_due()
+            timeout = max(0.0, due - self._clock()) if due is not None else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def close(self) -> None:
+        """Stop announcing holds, they stay tracked"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class RWBookingBatch:
+    """Bounded-concurrency bookings, one result per request
+
+    Unlike `RWTripBatch` requests are never deduplicated, every one of
+    them is a separate booking. Results are streamed in completion
+    order and successful bookings are added to `hold_tracker`:
+
+        batch = client.book_tickets_batch(requests, hold_tracker=tracker)
+        async for result in batch:
+            ...
+    """
+
+    def __init__(
+        self,
+        client: "RWAsyncClient",
+        requests: Iterable[RWBookingRequest],
+        concurrency: int = 4,
+        hold_tracker: Optional[RWHoldTracker] = None,
+    ) -> None:
+        self._client = client
+        self._requests = requests
+        self._concurrency = concurrency
+        self._hold_tracker = hold_tracker
+        self.stats = RWBatchStats()
+
+    def __aiter__(self) -> AsyncIterator[RWBookingResult]:
+        return self._run()
+
+    async def _book(self, request: RWBookingRequest) -> Awaitable[RWBookingResult]:
+        started_at = time.monotonic()
+
+        try:
+            booking = await self._client.book_tickets(**request._asdict())
+            error = None
+        except Exception as ex:
+            booking = None
+            error = ex
+
+        if booking is not None and self._hold_tracker is not None:
+            self._hold_tracker.add(booking)
+
+        return RWBookingResult(
+            request=request,
+            booking=booking,
+            error=error,
+            latency=time.monotonic() - started_at,
+        )
+
+    async def _run(self) -> AsyncIterator[RWBookingResult]:
+        requests = list(self._requests)
+        self.stats.submitted = self.stats.unique = len(requests)
+        self.stats.started_at = time.monotonic()
+        bookings = (self._book(request) for request in requests)
+
+        try:
+            async for result in bounded_as_completed(bookings, self._concurrency):
+                self.stats.completed += 1
+                self.stats.latencies.append(result.latency)
+                if not result.ok:
+                    self.stats.failed += 1
+
+                yield result
+        finally:
+            self.stats.finished_at = time.monotonic()
@@ -1,7 +1,9 @@
 import datetime
-from typing import Optional, List
+import logging
+import threading
+from typing import Any, Dict, Optional, List
 
-from . import model_mappers
+from . import model_mappers, protocol
 from .session import RWSession
 from .constants import RWConstants
 from .models import (
@@ -12,32 +14,145 @@ from .models import (
     RWPassenger,
     RWPriceSummary,
     RWSeat,
+    RWSeats,
     RWTrip,
     RWTripSeats,
     RWWagon,
     RWWagonSeats,
 )
-from .exceptions import APIStatusError
+from .location_index import RWLocationIndex
+from .pool import RWPoolConfig, RWPoolStats
+from .protocol import RWTransport
+from .rate_limit import RWRateLimiter
+from .resilience import RWCircuitBreaker, RWRetryPolicy, RWTimeout
+from .response_cache import RWResponseCache
+from .seat_selection import (
+    RWJourneySelection,
+    RWSeatChoice,
+    get_selected_journeys,
+)
+from .station_cache import RWStationCache, RWStationCacheEntry
+
+
+logger = logging.getLogger(__name__)
 
 
 class RWClient:
     """Main client to interract with Turkmenistan Railways"""
 
-    def __init__(self, hostname: Optional[str] = None) -> None:
-        hostname = hostname or RWConstants.HOSTNAME
-        self._session = RWSession(hostname=hostname)
+    def __init__(
+        self,
+        hostname: Optional[str] = None,
+        station_cache: Optional[RWStationCache] = None,
+        response_cache: Optional[RWResponseCache] = None,
+        pool_config: Optional[RWPoolConfig] = None,
+        timeout: Optional[RWTimeout] = None,
+        retry_policy: Optional[RWRetryPolicy] = None,
+        booking_retry_policy: Optional[RWRetryPolicy] = None,
+        circuit_breaker: Optional[RWCircuitBreaker] = None,
+        rate_limiter: Optional[RWRateLimiter] = None,
+        lazy: bool = False,
+        transport: Optional[RWTransport] = None,
+    ) -> None:
+        # anything with `send(RWRequest) -> RWResponse`, `RWSession`
+        # by default, the arguments above only configure the latter
+        if transport is None:
+            transport = RWSession(
+                hostname=hostname or RWConstants.HOSTNAME,
+                pool_config=pool_config,
+                timeout=timeout,
+                retry_policy=retry_policy,
+                booking_retry_policy=booking_retry_policy,
+                circuit_breaker=circuit_breaker,
+                rate_limiter=rate_limiter,
+            )
+        self._session = transport
+        self._station_cache = station_cache
+        self._response_cache = response_cache
+        # parse nested models and timestamps on first access
+        self._lazy = lazy
 
         self._locations = []
+        self._location_index = RWLocationIndex(())
+
+    @property
+    def pool_stats(self) -> RWPoolStats:
+        """Connection pool saturation, see `RWPoolStats`"""
+        return self._session.pool_stats
+
+    @property
+    def response_cache(self) -> Optional[RWResponseCache]:
+        return self._response_cache
+
+    def _get_cached(self, key: tuple) -> Optional[Any]:
+        if self._response_cache is None:
+            return None
+        return self._response_cache.get(key)
+
+    def _set_cached(self, key: tuple, value: Any) -> None:
+        if self._response_cache is not None:
+            self._response_cache.set(key, value)
+
+    def _set_locations(self, stations: List[Dict[str, Any]]) -> None:
+        locations = [
+            model_mappers.location_from_json(station) for station in stations
+        ]
+        self._location_index = RWLocationIndex(locations)
+        self._locations = locations
+
+    def _download_stations(
+        self, cache_entry: Optional[RWStationCacheEntry] = None
+    ) -> List[Dict[str, Any]]:
+        """Download stations, revalidating `cache_entry` if it is given"""
+        headers = None
+        if cache_entry is not None:
+            headers = RWStationCache.get_conditional_headers(cache_entry)
+
+        response = self._session.send(protocol.build_stations_request(headers))
+        protocol.check_status(response, allow_not_modified=cache_entry is not None)
+
+        if response.status == 304:
+            return self._station_cache.touch(
+                self._session.get_hostname(), cache_entry
+            ).stations
+
+        stations = protocol.parse_stations(response.body)
+
+        if self._station_cache is not None:
+            self._station_cache.store(
+                self._session.get_hostname(),
+                stations,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return stations
+
+    def _refresh_locations(self) -> None:
+        """Background station catalog refresh"""
+        try:
+            self._set_locations(self._download_stations())
+        except Exception:
+            logger.warning("Failed to refresh station catalog", exc_info=True)
 
     def _fetch_locations(self) -> None:
         """Fetch stations/locations"""
-        response = self._session.get_stations()
-        json_data = response.json()
-        APIStatusError.raise_for_status(json_data)
+        if self._station_cache is None:
+            self._set_locations(self._download_stations())
+            return
 
-        for station in json_data["data"]["stations"]:
-            location = model_mappers.location_from_json(station)
-            self._locations.append(location)
+        cache_entry = self._station_cache.load(self._session.get_hostname())
+
+        if cache_entry is None:
+            self._set_locations(self._download_stations())
+        elif self._station_cache.is_fresh(cache_entry):
+            self._set_locations(cache_entry.stations)
+        elif RWStationCache.can_revalidate(cache_entry):
+            self._set_locations(self._download_stations(cache_entry))
+        else:
+            # serve stale catalog, fresh one will replace it when ready
+            self._set_locations(cache_entry.stations)
+            threading.Thread(target=self._refresh_locations, daemon=True).start()
 
     @property
     def locations(self) -> List[RWLocation]:
@@ -45,21 +160,23 @@ class RWClient:
             self._fetch_locations()
         return self._locations
 
+    @property
+    def location_index(self) -> RWLocationIndex:
+        if not self._locations:
+            self._fetch_locations()
+        return self._location_index
+
     def get_location_by_id(self, location_id: int) -> Optional[RWLocation]:
         """Gets location by id"""
-        for location in self.locations:
-            if location.id == location_id:
-                return location
-
-        return None
+        return self.location_index.get_by_id(location_id)
 
     def get_location_by_name(self, location_name: str) -> Optional[RWLocation]:
-        """Gets location by name"""
-        for location in self.locations:
-            if location.name == location_name:
-                return location
+        """Gets location by name, ignoring case and diacritics if no exact match"""
+        return self.location_index.get_by_name(location_name)
 
-        return None
+    def search_locations(self, query: str, limit: int = 10) -> List[RWLocation]:
+        """Autocomplete locations by (partial or misspelled) name"""
+        return self.location_index.search(query, limit)
 
     def search_trips(
         self,
@@ -71,22 +188,27 @@ class RWClient:
     ) -> List[RWTrip]:
         """Search trips by given critteria"""
         date_str = date.strftime("%Y-%m-%d")
-
-        response = self._session.search_trips(
-            src_location.id,
-            dest_location.id,
+        cache_key = RWResponseCache.make_key(
+            "search_trips",
+            str(src_location.id),
+            str(dest_location.id),
             date_str,
             adults,
             children,
         )
-        response_json = response.json()
-        APIStatusError.raise_for_status(response_json)
-        trips = []
+        trips = self._get_cached(cache_key)
+        if trips is not None:
+            return trips
 
-        for trip_data in response_json["data"]["trips"]:
-            trip = model_mappers.trip_from_json(trip_data)
-            trips.append(trip)
+        response = self._session.send(
+            protocol.build_search_trips_request(
+                src_location.id, dest_location.id, date_str, adults, children
+            )
+        )
+        protocol.check_status(response)
+        trips = protocol.parse_trips(response.body, lazy=self._lazy)
 
+        self._set_cached(cache_key, trips)
         return trips
 
     def get_price_summary(
@@ -97,14 +219,23 @@ class RWClient:
         Actually this does not really give you price summary.
         All calculations has to be done manually on the client side.
         This only returns prices for services like how much for an adult or child.
+        `RWFareEngine` computes totals from it.
         """
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        cache_key = RWResponseCache.make_key(
+            "price_summary", outbound_trip.id, inbound_trip_id
+        )
+        price_summary = self._get_cached(cache_key)
+        if price_summary is not None:
+            return price_summary
 
-        response = self._session.get_price_summary(
-            outbound_trip.id, inbound_trip.id if inbound_trip is not None else -1
+        response = self._session.send(
+            protocol.build_price_summary_request(outbound_trip.id, inbound_trip_id)
         )
-        response_json = response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.price_summary_from_json(response_json["data"])
+        protocol.check_status(response)
+        price_summary = protocol.parse_price_summary(response.body)
+        self._set_cached(cache_key, price_summary)
+        return price_summary
 
     def get_seats(
         self,
@@ -116,34 +247,64 @@ class RWClient:
         inbound_wagon: Optional[RWWagon] = None,
     ) -> RWTripSeats:
         """Get available seats for given wagons/trains"""
-        response = self._session.get_seats(
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        inbound_wagon_id = inbound_wagon.id if inbound_wagon is not None else -1
+        cache_key = RWResponseCache.make_key(
+            "seats",
             outbound_trip.id,
             outbound_wagon.id,
             adults,
             children,
-            inbound_trip.id if inbound_trip is not None else -1,
-            inbound_wagon.id if inbound_wagon is not None else -1,
+            inbound_trip_id,
+            inbound_wagon_id,
+        )
+        seats = self._get_cached(cache_key)
+        if seats is not None:
+            return seats
+
+        response = self._session.send(
+            protocol.build_seats_request(
+                outbound_trip.id,
+                outbound_wagon.id,
+                adults,
+                children,
+                inbound_trip_id,
+                inbound_wagon_id,
+            )
         )
-        response_json = response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.seats_from_json(response_json["data"])
+        protocol.check_status(response)
+        seats = protocol.parse_seats(response.body, lazy=self._lazy)
+        self._set_cached(cache_key, seats)
+        return seats
 
     def book_tickets(
         self,
         contact: RWContact,
         passengers: List[RWPassenger],
-        outbound_journey: RWJourneySeats,
-        outbound_wagon: RWWagonSeats,
-        outbound_seat: RWSeat,
+        outbound_journey: Optional[RWJourneySeats] = None,
+        outbound_wagon: Optional[RWWagonSeats] = None,
+        outbound_seat: Optional[RWSeat] = None,
         has_media_wifi: bool = False,
         has_lunchbox: bool = False,
         bedding_type: str = "default",
         inbound_journey: Optional[RWJourneySeats] = None,
         inbound_wagon: Optional[RWWagonSeats] = None,
         inbound_seat: Optional[RWSeat] = None,
+        outbound_seats: Optional[List[RWSeatChoice]] = None,
+        inbound_seats: Optional[List[RWSeatChoice]] = None,
+        outbound_selections: Optional[List[RWJourneySelection]] = None,
+        inbound_selections: Optional[List[RWJourneySelection]] = None,
+        seats: Optional[RWSeats] = None,
     ) -> RWBooking:
         """Proceed to booking tickets
 
+        Seats of a direction are either one `*_wagon`/`*_seat` or a list
+        of (wagon, seat) pairs in `*_seats`, possibly in several wagons.
+        For trips with transfers `*_selections` pick seats on every
+        journey instead of `*_journey`. With `seats` (from `get_seats`)
+        selections are checked against it before anything is sent.
+        Everything is booked in one request, under one hold.
+
         Example request/response (just a reference):
 
         Request json:
@@ -194,44 +355,41 @@ class RWClient:
         }
         """
 
-        if inbound_journey and inbound_wagon and inbound_seat:
-            inbound_journey_id = inbound_journey.id
-            inbound_wagon_id = inbound_wagon.id
-            inbound_seat_id = inbound_seat.id
-        elif inbound_journey or inbound_wagon or inbound_seat:
-            raise ValueError(
-                "You are trying to book tickets, but not all `inbound_*` arguments are set"
-            )
-        else:
-            inbound_journey_id = inbound_wagon_id = inbound_seat_id = -1
+        outbound_journeys = get_selected_journeys(
+            "outbound",
+            outbound_journey,
+            outbound_wagon,
+            outbound_seat,
+            outbound_seats,
+            outbound_selections,
+            seats.outbound if seats is not None else None,
+        )
+        if outbound_journeys is None:
+            raise ValueError("No outbound seat to book")
 
-        response = self._session.book_tickets(
-            contact_mobile=contact.mobile,
-            contact_email=contact.email,
-            contact_main_contact=contact.main_contact,
-            passengers=[
-                {
-                    "name": passenger.name,
-                    "surname": passenger.surname,
-                    "dob": passenger.dob.strftime("%d-%m-%Y"),
-                    "tariff": passenger.tariff,
-                    "gender": passenger.gender,
-                    "identity_type": passenger.identity_type,
-                    "identity_number": passenger.identity_number,
-                }
-                for passenger in passengers
-            ],
-            outbound_journey_id=outbound_journey.id,
-            outbound_wagon_id=outbound_wagon.id,
-            outbound_seat_id=outbound_seat.id,
-            api_client="web",
-            has_media_wifi=has_media_wifi,
-            has_lunchbox=has_lunchbox,
-            bedding_type=bedding_type,
-            inbound_journey_id=inbound_journey_id,
-            inbound_wagon_id=inbound_wagon_id,
-            inbound_seat_id=inbound_seat_id,
+        inbound_journeys = get_selected_journeys(
+            "inbound",
+            inbound_journey,
+            inbound_wagon,
+            inbound_seat,
+            inbound_seats,
+            inbound_selections,
+            seats.inbound if seats is not None else None,
+        )
+
+        response = self._session.send(
+            protocol.build_booking_request(
+                contact_mobile=contact.mobile,
+                contact_email=contact.email,
+                contact_main_contact=contact.main_contact,
+                passengers=passengers,
+                api_client="web",
+                has_media_wifi=has_media_wifi,
+                has_lunchbox=has_lunchbox,
+                bedding_type=bedding_type,
+                outbound_journeys=outbound_journeys,
+                inbound_journeys=inbound_journeys,
+            )
         )
-        response_json = response.json()
-        APIStatusError.raise_for_status(response_json)
-        return model_mappers.booking_from_json(response_json["data"]["booking"])
+        protocol.check_status(response)
+        return protocol.parse_booking(response.body)
@@ -19,8 +19,41 @@ class APIStatusError(Exception):
     @staticmethod
     def raise_for_status(json_data: Dict[str, Any]) -> None:
         if not json_data["success"]:
-            if "error" in json_data:
+            if json_data.get("error"):
                 error = json_data["error"]
-            elif "errors" in json_data:
+            elif json_data.get("errors"):
                 error = json_data["errors"][0]
-            raise APIStatusError(error["id"], error["message"])
+            else:
+                error = {}
+            raise APIStatusError(
+                error.get("id", "unknown"), error.get("message", "Request failed")
+            )
+
+
+class HTTPStatusError(Exception):
+    """Response with an HTTP status other than success"""
+
+    def __init__(self, status: int, body: bytes) -> None:
+        super().__init__("Unexpected HTTP status {}".format(status))
+        self._status = status
+        self._body = body
+
+    @property
+    def status(self) -> int:
+        return self._status
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(
+            "Upstream is failing, requests are blocked for {:.1f}s".format(retry_in)
+        )
+        self._retry_in = retry_in
+
+    @property
+    def retry_in(self) -> float:
+        return self._retry_in
@@ -0,0 +1,71 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from . import json_codec
+from .protocol import RWRequest, RWResponse
+from .stats import RWWaitStats
+
+Handler = Callable[[RWRequest], RWResponse]
+
+
+class RWFakeTransport:
+    """In-memory transport for `RWClient`, nothing leaves the process
+
+    Responses are registered per (method, path) and every request sent
+    is kept in `requests`, for tests and for benchmarking the client
+    without a network:
+
+        transport = RWFakeTransport()
+        transport.add_response("POST", "/railway-api/trips", trips_json)
+        client = RWClient(transport=transport)
+    """
+
+    def __init__(self, hostname: str = "example.com") -> None:
+        self._hostname = hostname
+        self._handlers: Dict[Tuple[str, str], Handler] = {}
+        self.requests: List[RWRequest] = []
+        # nothing is pooled, kept empty for `RWClient.pool_stats`
+        self.pool_stats = RWWaitStats()
+
+    def get_hostname(self) -> str:
+        return self._hostname
+
+    def add_response(
+        self,
+        method: str,
+        path: str,
+        body: Union[bytes, Dict[str, Any]],
+        status: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Answer every `method` `path` request with `body` (json if a dict)"""
+        if not isinstance(body, bytes):
+            body = json_codec.dumps(body)
+        response = RWResponse(status, headers or {}, body)
+        self._handlers[(method, path)] = lambda request: response
+
+    def add_handler(self, method: str, path: str, handler: Handler) -> None:
+        """Answer `method` `path` requests with `handler(request)`"""
+        self._handlers[(method, path)] = handler
+
+    def _handle(self, request: RWRequest) -> RWResponse:
+        self.requests.append(request)
+        handler = self._handlers.get((request.method, request.path))
+
+        if handler is None:
+            raise LookupError(
+                "No fake response for {} {}".format(request.method, request.path)
+            )
+        return handler(request)
+
+    def send(self, request: RWRequest) -> RWResponse:
+        return self._handle(request)
+
+
+class RWAsyncFakeTransport(RWFakeTransport):
+    """In-memory transport for `RWAsyncClient`, see `RWFakeTransport`"""
+
+    async def send(self, request: RWRequest) -> RWResponse:
+        return self._handle(request)
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,148 @@
+import datetime
+import time
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .batch import RWTripQuery, date_range
+from .models import RWLocation, RWTrip
+
+if TYPE_CHECKING:
+    from .async_client import RWAsyncClient
+
+
+class RWFareDay(NamedTuple):
+    date: datetime.date
+    min_price: Optional[float]
+    min_prices: Dict[int, float]
+    trips: int
+    updated_at: float
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def get_min_prices(
+    trips: List[RWTrip], available_only: bool = True
+) -> Dict[int, float]:
+    """Lowest `RWWagon.price` per wagon type over `trips`"""
+    min_prices: Dict[int, float] = {}
+
+    for trip in trips:
+        for wagon in trip.wagon_types:
+            if available_only and not wagon.has_seats:
+                continue
+            if wagon.price < min_prices.get(wagon.id, float("inf")):
+                min_prices[wagon.id] = wagon.price
+
+    return min_prices
+
+
+class RWFareCalendar:
+    """Lowest fare per day and wagon type over a date range
+
+    Days are computed from one `search_trips` per day, using the
+    per wagon type prices the search already returns (the adult price
+    of the trip, see `RWFareEngine` for passenger totals), and only
+    the small per-day summary is kept. A day is searched again once
+    it is older than `ttl` seconds, so repeated views of the same
+    month only search the days that went stale. Searches run through
+    `RWAsyncClient.search_trips_batch`, at most `concurrency` at once.
+
+    A day that fails keeps its previous prices with `error` set,
+    or has no prices if it was never computed.
+    """
+
+    def __init__(
+        self,
+        client: "RWAsyncClient",
+        ttl: float = 900.0,
+        concurrency: int = 4,
+        available_only: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl
+        self._concurrency = concurrency
+        self._available_only = available_only
+        self._clock = clock
+        self._days: Dict[Tuple, RWFareDay] = {}
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def is_fresh(self, day: RWFareDay) -> bool:
+        return day.ok and self._clock() - day.updated_at < self._ttl
+
+    def _store(
+        self,
+        query: RWTripQuery,
+        trips: Optional[List[RWTrip]],
+        error: Optional[Exception],
+    ) -> None:
+        key = query.get_key()
+
+        if error is not None:
+            previous = self._days.get(key)
+            if previous is not None:
+                self._days[key] = previous._replace(error=error)
+            else:
+                self._days[key] = RWFareDay(
+                    query.date, None, {}, 0, self._clock(), error
+                )
+            return
+
+        min_prices = get_min_prices(trips, self._available_only)
+        self._days[key] = RWFareDay(
+            date=query.date,
+            min_price=min(min_prices.values()) if min_prices else None,
+            min_prices=min_prices,
+            trips=len(trips),
+            updated_at=self._clock(),
+        )
+
+    async def get(
+        self,
+        src_location: RWLocation,
+        dest_location: RWLocation,
+        start: datetime.date,
+        end: datetime.date,
+        adults: int = 1,
+        children: int = 0,
+    ) -> Awaitable[List[RWFareDay]]:
+        """Fare days from `start` to `end` (inclusive), in date order"""
+        queries = [
+            RWTripQuery(src_location, dest_location, date, adults, children)
+            for date in date_range(start, end)
+        ]
+        stale = []
+        for query in queries:
+            day = self._days.get(query.get_key())
+            if day is None or not self.is_fresh(day):
+                stale.append(query)
+
+        if stale:
+            async for result in self._client.search_trips_batch(
+                stale, self._concurrency
+            ):
+                self._store(result.query, result.trips, result.error)
+
+        return [self._days[query.get_key()] for query in queries]
+
+    def invalidate(self, date: Optional[datetime.date] = None) -> None:
+        """Drop cached days, all of them or those of `date`"""
+        if date is None:
+            self._days.clear()
+            return
+
+        for key in [key for key, day in self._days.items() if day.date == date]:
+            del self._days[key]
@@ -0,0 +1,259 @@
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .models import RWPriceSummary, RWTrip, RWTripPrice
+from .response_cache import RWResponseCache
+
+if TYPE_CHECKING:
+    from .async_client import RWAsyncClient
+    from .client import RWClient
+
+
+class RWFare(NamedTuple):
+    outbound_trip_id: int
+    inbound_trip_id: int
+    wagon_type_id: int
+    inbound_wagon_type_id: int
+    adults: int
+    children: int
+    outbound: float
+    inbound: float
+    extras: float
+    total: float
+
+
+def get_trip_prices(trip_price: RWTripPrice) -> Dict[int, Tuple[float, float]]:
+    """Adult and child price of the whole trip per wagon type
+
+    Prices of every journey of the trip are summed, wagon types
+    missing from any of the journeys are left out.
+    """
+    prices: Optional[Dict[int, Tuple[float, float]]] = None
+
+    for journey in trip_price.journeys:
+        journey_prices = {
+            price.id: (price.adult, price.child) for price in journey.prices
+        }
+
+        if prices is None:
+            prices = journey_prices
+        else:
+            prices = {
+                wagon_type_id: (
+                    adult + journey_prices[wagon_type_id][0],
+                    child + journey_prices[wagon_type_id][1],
+                )
+                for wagon_type_id, (adult, child) in prices.items()
+                if wagon_type_id in journey_prices
+            }
+
+    return prices or {}
+
+
+class _FareTable:
+    """Per passenger prices of one price summary, reused for every mix"""
+
+    def __init__(self, summary: RWPriceSummary) -> None:
+        self.outbound_trip_id = summary.outbound.id
+        self.inbound_trip_id = summary.inbound.id if summary.inbound is not None else -1
+        self.outbound = get_trip_prices(summary.outbound)
+        self.inbound = (
+            get_trip_prices(summary.inbound) if summary.inbound is not None else None
+        )
+        self.extras = {price.id: price.amount for price in summary.price_formation}
+
+    def compute(
+        self,
+        adults: int,
+        children: int,
+        wagon_type_id: int,
+        inbound_wagon_type_id: Optional[int],
+        extras: Sequence[int],
+    ) -> RWFare:
+        if wagon_type_id not in self.outbound:
+            raise ValueError(
+                "Trip {} has no wagon type {} on every journey".format(
+                    self.outbound_trip_id, wagon_type_id
+                )
+            )
+        adult, child = self.outbound[wagon_type_id]
+        outbound = adult * adults + child * children
+        directions = 1
+
+        inbound = 0.0
+        if self.inbound is None:
+            inbound_wagon_type_id = -1
+        else:
+            if inbound_wagon_type_id is None:
+                inbound_wagon_type_id = wagon_type_id
+            if inbound_wagon_type_id not in self.inbound:
+                raise ValueError(
+                    "Trip {} has no wagon type {} on every journey".format(
+                        self.inbound_trip_id, inbound_wagon_type_id
+                    )
+                )
+            adult, child = self.inbound[inbound_wagon_type_id]
+            inbound = adult * adults + child * children
+            directions = 2
+
+        try:
+            extras_amount = sum(self.extras[extra] for extra in extras)
+        except KeyError as error:
+            raise ValueError(
+                "Unknown extra {}, expected one of {}".format(
+                    error.args[0], sorted(self.extras)
+                )
+            ) from None
+        extras_amount *= (adults + children) * directions
+
+        return RWFare(
+            outbound_trip_id=self.outbound_trip_id,
+            inbound_trip_id=self.inbound_trip_id,
+            wagon_type_id=wagon_type_id,
+            inbound_wagon_type_id=inbound_wagon_type_id,
+            adults=adults,
+            children=children,
+            outbound=round(outbound, 2),
+            inbound=round(inbound, 2),
+            extras=round(extras_amount, 2),
+            total=round(outbound + inbound + extras_amount, 2),
+        )
+
+
+class RWFareEngine:
+    """Client side fare totals from price summaries
+
+    The API only returns per passenger prices (`RWWagonPrice.adult`
+    and `.child` per journey) and the `price_formation` extras. The
+    total for a passenger mix is the sum over the journeys of each
+    direction of `adult * adults + child * children` for the chosen
+    wagon type, plus each selected extra (by `RWPrice.id`) once per
+    passenger and direction.
+
+    Price summaries are kept in `cache` under the key `RWClient` uses,
+    pass the client's response cache to share them.
+    """
+
+    def __init__(self, cache: Optional[RWResponseCache] = None) -> None:
+        self._cache = cache if cache is not None else RWResponseCache()
+
+    @staticmethod
+    def _make_key(outbound_trip_id: int, inbound_trip_id: int) -> Tuple:
+        return RWResponseCache.make_key(
+            "price_summary", outbound_trip_id, inbound_trip_id
+        )
+
+    def add(self, summary: RWPriceSummary) -> None:
+        inbound_trip_id = summary.inbound.id if summary.inbound is not None else -1
+        self._cache.set(self._make_key(summary.outbound.id, inbound_trip_id), summary)
+
+    def get(
+        self, outbound_trip_id: int, inbound_trip_id: int = -1
+    ) -> Optional[RWPriceSummary]:
+        return self._cache.get(self._make_key(outbound_trip_id, inbound_trip_id))
+
+    def fetch(
+        self,
+        client: "RWClient",
+        outbound_trip: RWTrip,
+        inbound_trip: Optional[RWTrip] = None,
+    ) -> RWPriceSummary:
+        """Cached price summary, requested from `client` on a miss"""
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        summary = self.get(outbound_trip.id, inbound_trip_id)
+
+        if summary is None:
+            summary = client.get_price_summary(outbound_trip, inbound_trip)
+            self.add(summary)
+        return summary
+
+    async def fetch_async(
+        self,
+        client: "RWAsyncClient",
+        outbound_trip: RWTrip,
+        inbound_trip: Optional[RWTrip] = None,
+    ) -> Awaitable[RWPriceSummary]:
+        inbound_trip_id = inbound_trip.id if inbound_trip is not None else -1
+        summary = self.get(outbound_trip.id, inbound_trip_id)
+
+        if summary is None:
+            summary = await client.get_price_summary(outbound_trip, inbound_trip)
+            self.add(summary)
+        return summary
+
+    def compute(
+        self,
+        summary: RWPriceSummary,
+        adults: int,
+        children: int = 0,
+        wagon_type_id: Optional[int] = None,
+        inbound_wagon_type_id: Optional[int] = None,
+        extras: Sequence[int] = (),
+    ) -> RWFare:
+        """Total for one passenger mix
+
+        `wagon_type_id` defaults to the cheapest wagon type for adults,
+        `inbound_wagon_type_id` (round trips only) to `wagon_type_id`.
+        Raises `ValueError` if a wagon type or extra is not available.
+        """
+        table = _FareTable(summary)
+
+        if wagon_type_id is None:
+            if not table.outbound:
+                raise ValueError(
+                    "Trip {} has no wagon type on every journey".format(
+                        table.outbound_trip_id
+                    )
+                )
+            wagon_type_id = min(table.outbound, key=lambda id: table.outbound[id])
+
+        return table.compute(
+            adults, children, wagon_type_id, inbound_wagon_type_id, extras
+        )
+
+    def compute_many(
+        self,
+        summaries: Iterable[RWPriceSummary],
+        mixes: Iterable[Tuple[int, int]],
+        wagon_type_ids: Optional[Iterable[int]] = None,
+        extras: Sequence[int] = (),
+    ) -> List[RWFare]:
+        """Totals for every summary x (adults, children) x wagon type
+
+        Each summary is walked once, whatever the number of mixes.
+        Without `wagon_type_ids` every wagon type of each trip is used,
+        combinations a trip does not offer are skipped. Round trips use
+        the same wagon type both ways. Summaries are added to the cache.
+        """
+        mixes = list(mixes)
+        if wagon_type_ids is not None:
+            wagon_type_ids = list(wagon_type_ids)
+        fares = []
+
+        for summary in summaries:
+            self.add(summary)
+            table = _FareTable(summary)
+
+            for wagon_type_id in (
+                table.outbound if wagon_type_ids is None else wagon_type_ids
+            ):
+                if wagon_type_id not in table.outbound or (
+                    table.inbound is not None and wagon_type_id not in table.inbound
+                ):
+                    continue
+
+                for adults, children in mixes:
+                    fares.append(
+                        table.compute(adults, children, wagon_type_id, None, extras)
+                    )
+
+        return fares
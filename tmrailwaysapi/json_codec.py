@@ -0,0 +1,65 @@
+import json
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# every backend's `dumps` returns compact utf-8 bytes ready to be sent
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+Loads = Callable[[Union[bytes, str]], Any]
+Dumps = Callable[[Any], bytes]
+
+_BACKENDS: Dict[str, Tuple[Loads, Dumps]] = {
+    "json": (json.loads, _json_dumps),
+}
+
+if msgspec is not None:
+    _BACKENDS["msgspec"] = (msgspec.json.decode, msgspec.json.encode)
+
+if orjson is not None:
+    _BACKENDS["orjson"] = (orjson.loads, orjson.dumps)
+
+
+def get_available_backends() -> Tuple[str, ...]:
+    return tuple(_BACKENDS)
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """Switch backend ("orjson", "msgspec" or "json") for the whole process"""
+    global _backend, loads, dumps
+
+    if name not in _BACKENDS:
+        raise ValueError(
+            "JSON backend {!r} is not available, choose from {}".format(
+                name, ", ".join(_BACKENDS)
+            )
+        )
+
+    _backend = name
+    loads, dumps = _BACKENDS[name]
+
+
+_backend = ""
+loads: Loads
+dumps: Dumps
+
+# use the fastest installed backend, stdlib json is always available
+for _name in ("orjson", "msgspec", "json"):
+    if _name in _BACKENDS:
+        set_backend(_name)
+        break
@@ -0,0 +1,172 @@
+import datetime
+from collections import UserList
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from . import model_mappers
+from .model_mappers import intern
+from .models import RWJourney, RWSeats, RWTrip, RWTripSeats, RWWagon, RWWagonSeats
+
+
+class _LazyField:
+    """Attribute parsed from the retained raw json on first access"""
+
+    def __init__(self, parse: Callable[[Dict[str, Any]], Any]) -> None:
+        self._parse = parse
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attribute = "_" + name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self._attribute)
+        except AttributeError:
+            value = self._parse(instance._json_data)
+            setattr(instance, self._attribute, value)
+            return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self._attribute, value)
+
+
+def _parse_departure_time(json_data: Dict[str, Any]) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(json_data["departure_time"])
+
+
+def _parse_arrival_time(json_data: Dict[str, Any]) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(json_data["arrival_time"])
+
+
+def _parse_wagon_types(json_data: Dict[str, Any]) -> List[RWWagon]:
+    return [model_mappers.wagon_from_json(wagon) for wagon in json_data["wagon_types"]]
+
+
+def _parse_journeys(json_data: Dict[str, Any]) -> List[RWJourney]:
+    return [
+        model_mappers.journey_from_json(journey) for journey in json_data["journeys"]
+    ]
+
+
+class RWLazyTrip(RWTrip):
+    """RWTrip that keeps the raw json and parses lazily
+
+    `id`, `source`, `destination`, `travel_time` and `distance` are
+    read up front; `departure_time`, `arrival_time`, `wagon_types`
+    and `journeys` are parsed on first access and then cached.
+    """
+
+    __slots__ = [
+        "_json_data",
+        "_departure_time",
+        "_arrival_time",
+        "_wagon_types",
+        "_journeys",
+    ]
+
+    departure_time = _LazyField(_parse_departure_time)
+    arrival_time = _LazyField(_parse_arrival_time)
+    wagon_types = _LazyField(_parse_wagon_types)
+    journeys = _LazyField(_parse_journeys)
+
+    def __init__(self, json_data: Dict[str, Any]) -> None:
+        self._json_data = json_data
+        self.id = json_data["id"]
+        self.source = intern(json_data["source"])
+        self.destination = intern(json_data["destination"])
+        self.travel_time = json_data["travel_time"]
+        self.distance = json_data["distance"]
+
+
+class RWLazyList(UserList):
+    """List whose items are mapped from raw json on first access
+
+    Behaves like the list the eager mapper would have built (indexing,
+    iteration, `len`, comparison with lists), it just defers the work.
+    It is not a `list` subclass on purpose: C code such as `json.dumps`
+    reads a list's storage directly and would see it empty before it is
+    materialized. So `isinstance(x, list)` is False and encoders reject
+    it, pass `list(x)` where a real list is needed.
+
+    Items are only mapped when the list is first used, a malformed item
+    raises then (KeyError, ValueError, ...) rather than when the
+    response is decoded.
+    """
+
+    def __init__(
+        self,
+        initlist: Optional[Iterable[Any]] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        if parse is None:
+            # UserList methods create new instances from plain lists
+            self._raw = None
+            self._data = list(initlist) if initlist is not None else []
+        else:
+            self._raw = initlist
+            self._data = None
+        self._parse = parse
+
+    @property
+    def data(self) -> List[Any]:
+        if self._data is None:
+            self._data = [self._parse(item) for item in self._raw]
+            self._raw = None
+        return self._data
+
+    @data.setter
+    def data(self, value: List[Any]) -> None:
+        self._data = value
+        self._raw = None
+
+    def __copy__(self) -> "RWLazyList":
+        return self.__class__(self.data)
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._data is not None
+
+
+def lazy_trip_from_json(json_data: Dict[str, Any]) -> RWLazyTrip:
+    return RWLazyTrip(json_data)
+
+
+def lazy_wagon_seats_from_json(json_data: Dict[str, Any]) -> RWWagonSeats:
+    return RWWagonSeats(
+        id=json_data["id"],
+        layout_map=json_data["layout_map"],
+        number=json_data["number"],
+        seats=RWLazyList(json_data["seats"], model_mappers.seat_from_json),
+        wagon_type_id=json_data["wagon_type_id"],
+        wagon_type_title=intern(json_data["wagon_type_title"]),
+    )
+
+
+def lazy_trip_seats_from_json(json_data: Dict[str, Any]) -> RWTripSeats:
+    journeys = []
+
+    for journey_data in json_data["journeys"]:
+        journey = model_mappers.journey_seats_from_json(
+            dict(journey_data, train_wagons=[])
+        )
+        journeys.append(
+            journey._replace(
+                train_wagons=RWLazyList(
+                    journey_data["train_wagons"], lazy_wagon_seats_from_json
+                )
+            )
+        )
+
+    return RWTripSeats(id=json_data["trip_id"], journeys=journeys)
+
+
+def lazy_seats_from_json(json_data: Dict[str, Any]) -> RWSeats:
+    outbound = lazy_trip_seats_from_json(json_data["outbound"])
+    inbound = (
+        lazy_trip_seats_from_json(json_data["inbound"])
+        if "inbound" in json_data
+        else None
+    )
+
+    return RWSeats(outbound=outbound, inbound=inbound)
@@ -0,0 +1,110 @@
+import bisect
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import RWLocation
+
+
+def normalize_name(name: str) -> str:
+    """Case- and diacritic-insensitive form of a location name
+
+    "Aşgabat", "ASGABAT" and "asgabat" all normalize to "asgabat".
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).strip()
+
+
+def _trigrams(normalized_name: str) -> Set[str]:
+    padded = "  " + normalized_name + " "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class RWLocationIndex:
+    """Id, name and normalized name lookups over the station catalog
+
+    Built once when the catalog is loaded, every lookup afterwards
+    is a dict access. `search` serves autocomplete using a sorted
+    prefix index with a trigram index as fuzzy fallback.
+    """
+
+    def __init__(self, locations: Iterable[RWLocation]) -> None:
+        self._by_id: Dict[int, RWLocation] = {}
+        self._by_name: Dict[str, RWLocation] = {}
+        self._by_normalized_name: Dict[str, RWLocation] = {}
+        self._by_trigram: Dict[str, List[RWLocation]] = {}
+        prefixes: List[Tuple[str, int]] = []
+
+        for position, location in enumerate(locations):
+            normalized_name = normalize_name(location.name)
+
+            # first occurrence wins, same as the old linear scans
+            self._by_id.setdefault(location.id, location)
+            self._by_name.setdefault(location.name, location)
+            if normalized_name in self._by_normalized_name:
+                continue
+
+            self._by_normalized_name[normalized_name] = location
+            prefixes.append((normalized_name, position))
+
+            for trigram in _trigrams(normalized_name):
+                self._by_trigram.setdefault(trigram, []).append(location)
+
+        prefixes.sort()
+        self._prefix_keys = [name for name, _ in prefixes]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get_by_id(self, location_id: int) -> Optional[RWLocation]:
+        return self._by_id.get(location_id)
+
+    def get_by_name(self, location_name: str) -> Optional[RWLocation]:
+        """Exact name match, falls back to normalized name"""
+        location = self._by_name.get(location_name)
+        if location is None and isinstance(location_name, str):
+            location = self._by_normalized_name.get(normalize_name(location_name))
+        return location
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[RWLocation]:
+        """Locations whose normalized name starts with `prefix`"""
+        prefix = normalize_name(prefix)
+        start = bisect.bisect_left(self._prefix_keys, prefix)
+        result = []
+
+        for name in self._prefix_keys[start : start + limit]:
+            if not name.startswith(prefix):
+                break
+            result.append(self._by_normalized_name[name])
+
+        return result
+
+    def search(self, query: str, limit: int = 10) -> List[RWLocation]:
+        """Autocomplete: prefix matches first, then trigram similarity"""
+        result = self.search_prefix(query, limit)
+        if len(result) >= limit:
+            return result
+
+        query_trigrams = _trigrams(normalize_name(query))
+        scores: Dict[RWLocation, int] = {}
+
+        for trigram in query_trigrams:
+            for location in self._by_trigram.get(trigram, ()):
+                scores[location] = scores.get(location, 0) + 1
+
+        seen = set(result)
+        # at least a third of the query trigrams must match
+        min_score = max(1, len(query_trigrams) // 3)
+        ranked = sorted(
+            (location for location, score in scores.items() if score >= min_score),
+            key=lambda location: (-scores[location], location.name),
+        )
+
+        for location in ranked:
+            if len(result) >= limit:
+                break
+            if location not in seen:
+                result.append(location)
+
+        return result
@@ -0,0 +1,327 @@
+import datetime
+from typing import Any, List, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from . import json_codec, lazy_models, model_mappers
+from .exceptions import APIStatusError
+from .model_mappers import intern
+from .models import (
+    RWJourney,
+    RWJourneyPrice,
+    RWJourneySeats,
+    RWPrice,
+    RWPriceSummary,
+    RWSeat,
+    RWSeats,
+    RWTrip,
+    RWTripPrice,
+    RWTripSeats,
+    RWWagon,
+    RWWagonPrice,
+    RWWagonSeats,
+)
+
+# Decode response bodies straight into models.
+#
+# With msgspec installed the json is parsed by typed struct schemas
+# (no dict tree, datetimes parsed in C) whose field order matches the
+# models' constructors, so each model is built from one `astuple` call.
+# Schemas are strict: they only accept payloads the mappers would turn
+# into exactly the same models, anything else (numeric strings, 0/1
+# flags, nulls, missing keys) goes through `json_codec.loads` and
+# `model_mappers` as before, as it does without msgspec.
+# Both paths produce the same objects, with repeated strings interned.
+
+
+if msgspec is not None:
+    from msgspec.structs import astuple
+
+    Number = Union[int, float]
+
+    class _Struct(msgspec.Struct, gc=False):
+        pass
+
+    class _Wagon(_Struct):
+        wagon_type_id: int
+        wagon_type_title: str
+        price: Number
+        has_seats: bool
+
+    class _Journey(_Struct):
+        id: int
+        source: str
+        destination: str
+        departure_time: datetime.datetime
+        arrival_time: datetime.datetime
+        travel_time: Any
+        train_run_number: Any
+        service_type_id: int
+        service_type_title: str
+        distance: Any
+
+    class _Trip(_Struct):
+        id: int
+        source: str
+        destination: str
+        departure_time: datetime.datetime
+        arrival_time: datetime.datetime
+        travel_time: Any
+        distance: Any
+        wagon_types: List[_Wagon]
+        journeys: List[_Journey]
+
+    class _WagonPrice(_Struct):
+        wagon_type_id: int
+        wagon_type_title: str
+        adult: Number
+        child: Number = 0
+
+    class _JourneyPrice(_Struct):
+        id: int
+        arrival_time: datetime.datetime
+        departure_time: datetime.datetime
+        source: str
+        destination: str
+        distance: Any
+        prices: List[_WagonPrice]
+        service_type_id: int
+        service_type_title: str
+        train_run_number: Any
+        travel_time: Any
+
+    class _TripPrice(_Struct):
+        id: int
+        arrival_time: datetime.datetime
+        departure_time: datetime.datetime
+        source: str
+        destination: str
+        distance: Any
+        journeys: List[_JourneyPrice]
+        travel_time: Any
+
+    class _Price(_Struct):
+        id: int
+        title: str
+        amount: Number
+
+    # an explicit `null` inbound is left to the mappers to reject
+    class _PriceSummary(_Struct):
+        outbound: _TripPrice
+        price_formation: List[_Price]
+        inbound: Union[_TripPrice, msgspec.UnsetType] = msgspec.UNSET
+
+    class _Seat(_Struct):
+        id: int
+        available: bool
+        label: str
+        # sent as a string, `int`ed like the mappers do
+        level: Union[int, str]
+
+    class _WagonSeats(_Struct):
+        id: int
+        layout_map: Any
+        number: Any
+        seats: List[_Seat]
+        wagon_type_id: int
+        wagon_type_title: str
+
+    class _JourneySeats(_Struct):
+        id: int
+        arrival_time: datetime.datetime
+        departure_time: datetime.datetime
+        source: str
+        destination: str
+        distance: Any
+        service_type_id: int
+        service_type_title: str
+        train_run_number: Any
+        travel_time: Any
+        train_wagons: List[_WagonSeats]
+
+    class _TripSeats(_Struct):
+        trip_id: int
+        journeys: List[_JourneySeats]
+
+    class _Seats(_Struct):
+        outbound: _TripSeats
+        inbound: Union[_TripSeats, msgspec.UnsetType] = msgspec.UNSET
+
+    class _TripsData(_Struct):
+        trips: List[_Trip]
+
+    def _envelope(data_type: type) -> type:
+        class Envelope(_Struct):
+            success: bool
+            # error responses have none, they fail here and are raised
+            # by the mappers
+            data: data_type
+
+        return Envelope
+
+    _trips_decoder = msgspec.json.Decoder(_envelope(_TripsData))
+    _price_summary_decoder = msgspec.json.Decoder(_envelope(_PriceSummary))
+    _seats_decoder = msgspec.json.Decoder(_envelope(_Seats))
+
+    def _decode(decoder: "msgspec.json.Decoder", body: bytes) -> Any:
+        envelope = decoder.decode(body)
+
+        if not envelope.success:
+            # rare path, let the mapper raise exactly the same error as before
+            APIStatusError.raise_for_status(json_codec.loads(body))
+
+        return envelope.data
+
+    def _intern(fields: List[Any], *indices: int) -> List[Any]:
+        for index in indices:
+            fields[index] = intern(fields[index])
+        return fields
+
+    def _wagon(wagon: "_Wagon") -> RWWagon:
+        return RWWagon._make(_intern(list(astuple(wagon)), 1))
+
+    def _journey(journey: "_Journey") -> RWJourney:
+        return RWJourney(*_intern(list(astuple(journey)), 1, 2, 8))
+
+    def _trip(trip: "_Trip") -> RWTrip:
+        fields = _intern(list(astuple(trip)), 1, 2)
+        fields[7] = [_wagon(wagon) for wagon in trip.wagon_types]
+        fields[8] = [_journey(journey) for journey in trip.journeys]
+        return RWTrip(*fields)
+
+    def _wagon_price(price: "_WagonPrice") -> RWWagonPrice:
+        return RWWagonPrice._make(_intern(list(astuple(price)), 1))
+
+    def _journey_price(journey: "_JourneyPrice") -> RWJourneyPrice:
+        fields = _intern(list(astuple(journey)), 3, 4, 8)
+        fields[6] = [_wagon_price(price) for price in journey.prices]
+        return RWJourneyPrice._make(fields)
+
+    def _trip_price(trip_price: "_TripPrice") -> RWTripPrice:
+        fields = _intern(list(astuple(trip_price)), 3, 4)
+        fields[6] = [_journey_price(journey) for journey in trip_price.journeys]
+        return RWTripPrice._make(fields)
+
+    def _wagon_seats(wagon: "_WagonSeats") -> RWWagonSeats:
+        fields = _intern(list(astuple(wagon)), 5)
+        fields[3] = [
+            RWSeat(seat.id, seat.available, intern(seat.label), int(seat.level))
+            for seat in wagon.seats
+        ]
+        return RWWagonSeats._make(fields)
+
+    def _journey_seats(journey: "_JourneySeats") -> RWJourneySeats:
+        fields = _intern(list(astuple(journey)), 3, 4, 7)
+        fields[10] = [_wagon_seats(wagon) for wagon in journey.train_wagons]
+        return RWJourneySeats._make(fields)
+
+    def _trip_seats(trip_seats: "_TripSeats") -> RWTripSeats:
+        return RWTripSeats(
+            id=trip_seats.trip_id,
+            journeys=[_journey_seats(journey) for journey in trip_seats.journeys],
+        )
+
+    def _compiled_trips(body: bytes) -> List[RWTrip]:
+        return [_trip(trip) for trip in _decode(_trips_decoder, body).trips]
+
+    def _compiled_price_summary(body: bytes) -> RWPriceSummary:
+        data = _decode(_price_summary_decoder, body)
+
+        return RWPriceSummary(
+            outbound=_trip_price(data.outbound),
+            inbound=(
+                _trip_price(data.inbound) if data.inbound is not msgspec.UNSET else None
+            ),
+            price_formation=[
+                RWPrice._make(astuple(price)) for price in data.price_formation
+            ],
+        )
+
+    def _compiled_seats(body: bytes) -> RWSeats:
+        data = _decode(_seats_decoder, body)
+
+        return RWSeats(
+            outbound=_trip_seats(data.outbound),
+            inbound=(
+                _trip_seats(data.inbound) if data.inbound is not msgspec.UNSET else None
+            ),
+        )
+
+    _SchemaError = (msgspec.ValidationError, msgspec.DecodeError)
+else:
+    _compiled_trips = _compiled_price_summary = _compiled_seats = None
+    _SchemaError = ()
+
+
+def _mapped_trips(body: bytes) -> List[RWTrip]:
+    json_data = json_codec.loads(body)
+    APIStatusError.raise_for_status(json_data)
+    return [model_mappers.trip_from_json(trip) for trip in json_data["data"]["trips"]]
+
+
+def _mapped_price_summary(body: bytes) -> RWPriceSummary:
+    json_data = json_codec.loads(body)
+    APIStatusError.raise_for_status(json_data)
+    return model_mappers.price_summary_from_json(json_data["data"])
+
+
+def _mapped_seats(body: bytes) -> RWSeats:
+    json_data = json_codec.loads(body)
+    APIStatusError.raise_for_status(json_data)
+    return model_mappers.seats_from_json(json_data["data"])
+
+
+def is_compiled() -> bool:
+    """Whether the msgspec schema path is available"""
+    return msgspec is not None
+
+
+def trips_from_bytes(body: bytes, lazy: bool = False) -> List[RWTrip]:
+    """Decode `POST /railway-api/trips` response body
+
+    With `lazy=True` trips are `RWLazyTrip`s parsed on first access.
+    """
+    if lazy:
+        json_data = json_codec.loads(body)
+        APIStatusError.raise_for_status(json_data)
+        return [
+            lazy_models.lazy_trip_from_json(trip) for trip in json_data["data"]["trips"]
+        ]
+
+    if _compiled_trips is not None:
+        try:
+            return _compiled_trips(body)
+        except _SchemaError:
+            pass
+    return _mapped_trips(body)
+
+
+def price_summary_from_bytes(body: bytes) -> RWPriceSummary:
+    """Decode price summary response body"""
+    if _compiled_price_summary is not None:
+        try:
+            return _compiled_price_summary(body)
+        except _SchemaError:
+            pass
+    return _mapped_price_summary(body)
+
+
+def seats_from_bytes(body: bytes, lazy: bool = False) -> RWSeats:
+    """Decode seats response body
+
+    With `lazy=True` wagon and seat lists are parsed on first access.
+    """
+    if lazy:
+        json_data = json_codec.loads(body)
+        APIStatusError.raise_for_status(json_data)
+        return lazy_models.lazy_seats_from_json(json_data["data"])
+
+    if _compiled_seats is not None:
+        try:
+            return _compiled_seats(body)
+        except _SchemaError:
+            pass
+    return _mapped_seats(body)
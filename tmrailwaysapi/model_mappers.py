@@ -1,4 +1,5 @@
 import datetime
+import sys
 from typing import Dict, Any
 
 from .models import (
@@ -19,6 +20,16 @@ from .models import (
     RWWagonSeats,
 )
 
+# Station names, titles and seat labels repeat across thousands of
+# models in a search result, they are interned so each is stored once.
+
+
+def intern(value: Any) -> Any:
+    """`sys.intern` for strings, anything else (e.g. None) is kept as is"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
 
 def location_from_json(json_data: Dict[str, Any]) -> RWLocation:
     location = RWLocation(id=json_data["id"], name=json_data["title_tm"])
@@ -28,7 +39,7 @@ def location_from_json(json_data: Dict[str, Any]) -> RWLocation:
 def wagon_from_json(json_data: Dict[str, Any]) -> RWWagon:
     return RWWagon(
         id=json_data["wagon_type_id"],
-        title=json_data["wagon_type_title"],
+        title=intern(json_data["wagon_type_title"]),
         price=json_data["price"],
         has_seats=json_data["has_seats"],
     )
@@ -37,14 +48,14 @@ def wagon_from_json(json_data: Dict[str, Any]) -> RWWagon:
 def journey_from_json(json_data: Dict[str, Any]) -> RWJourney:
     return RWJourney(
         id=json_data["id"],
-        source=json_data["source"],
-        destination=json_data["destination"],
+        source=intern(json_data["source"]),
+        destination=intern(json_data["destination"]),
         departure_time=datetime.datetime.fromisoformat(json_data["departure_time"]),
         arrival_time=datetime.datetime.fromisoformat(json_data["arrival_time"]),
         travel_time=json_data["travel_time"],
         train_run_number=json_data["train_run_number"],
         service_type_id=json_data["service_type_id"],
-        service_type_title=json_data["service_type_title"],
+        service_type_title=intern(json_data["service_type_title"]),
         distance=json_data["distance"],
     )
 
@@ -63,8 +74,8 @@ def trip_from_json(json_data: Dict[str, Any]) -> RWTrip:
 
     return RWTrip(
         id=json_data["id"],
-        source=json_data["source"],
-        destination=json_data["destination"],
+        source=intern(json_data["source"]),
+        destination=intern(json_data["destination"]),
         departure_time=datetime.datetime.fromisoformat(json_data["departure_time"]),
         arrival_time=datetime.datetime.fromisoformat(json_data["arrival_time"]),
         travel_time=json_data["travel_time"],
@@ -77,7 +88,7 @@ def trip_from_json(json_data: Dict[str, Any]) -> RWTrip:
 def wagon_price_from_json(json_data: Dict[str, Any]) -> RWWagonPrice:
     return RWWagonPrice(
         id=json_data["wagon_type_id"],
-        title=json_data["wagon_type_title"],
+        title=intern(json_data["wagon_type_title"]),
         adult=json_data["adult"],
         child=json_data.get("child", 0),
     )
@@ -92,14 +103,14 @@ def journey_price_from_json(json_data: Dict[str, Any]) -> RWJourneyPrice:
 
     return RWJourneyPrice(
         id=json_data["id"],
-        source=json_data["source"],
-        destination=json_data["destination"],
+        source=intern(json_data["source"]),
+        destination=intern(json_data["destination"]),
         departure_time=datetime.datetime.fromisoformat(json_data["departure_time"]),
         arrival_time=datetime.datetime.fromisoformat(json_data["arrival_time"]),
         travel_time=json_data["travel_time"],
         train_run_number=json_data["train_run_number"],
         service_type_id=json_data["service_type_id"],
-        service_type_title=json_data["service_type_title"],
+        service_type_title=intern(json_data["service_type_title"]),
         distance=json_data["distance"],
         prices=wagon_prices,
     )
@@ -114,8 +125,8 @@ def trip_price_from_json(json_data: Dict[str, Any]) -> RWTripPrice:
 
     return RWTripPrice(
         id=json_data["id"],
-        source=json_data["source"],
-        destination=json_data["destination"],
+        source=intern(json_data["source"]),
+        destination=intern(json_data["destination"]),
         departure_time=datetime.datetime.fromisoformat(json_data["departure_time"]),
         arrival_time=datetime.datetime.fromisoformat(json_data["arrival_time"]),
         travel_time=json_data["travel_time"],
@@ -152,7 +163,7 @@ def seat_from_json(json_data: Dict[str, Any]) -> RWSeat:
     return RWSeat(
         id=json_data["id"],
         available=json_data["available"],
-        label=json_data["label"],
+        label=intern(json_data["label"]),
         level=int(json_data["level"]),
     )
 
@@ -170,7 +181,7 @@ def wagon_seats_from_json(json_data: Dict[str, Any]) -> RWWagonSeats:
         number=json_data["number"],
         seats=seats,
         wagon_type_id=json_data["wagon_type_id"],
-        wagon_type_title=json_data["wagon_type_title"],
+        wagon_type_title=intern(json_data["wagon_type_title"]),
     )
 
 
@@ -183,14 +194,14 @@ def journey_seats_from_json(json_data: Dict[str, Any]) -> RWJourneySeats:
 
     return RWJourneySeats(
         id=json_data["id"],
-        source=json_data["source"],
-        destination=json_data["destination"],
+        source=intern(json_data["source"]),
+        destination=intern(json_data["destination"]),
         departure_time=datetime.datetime.fromisoformat(json_data["departure_time"]),
         arrival_time=datetime.datetime.fromisoformat(json_data["arrival_time"]),
         travel_time=json_data["travel_time"],
         train_run_number=json_data["train_run_number"],
         service_type_id=json_data["service_type_id"],
-        service_type_title=json_data["service_type_title"],
+        service_type_title=intern(json_data["service_type_title"]),
         distance=json_data["distance"],
         train_wagons=train_wagons,
     )
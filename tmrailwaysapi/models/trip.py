@@ -6,6 +6,18 @@ from .journey import RWJourney
 
 
 class RWTrip:
+    __slots__ = [
+        "id",
+        "source",
+        "destination",
+        "departure_time",
+        "arrival_time",
+        "travel_time",
+        "distance",
+        "wagon_types",
+        "journeys",
+    ]
+
     def __init__(
         self,
         id: int,
@@ -0,0 +1,126 @@
+import time
+from dataclasses import dataclass
+from typing import Optional, Type
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+from .stats import RWWaitStats
+
+
+@dataclass(frozen=True)
+class RWPoolConfig:
+    """Connection pool settings for RWSession and RWAsyncSession
+
+    Defaults are tuned for many concurrent requests against one host.
+    `keepalive_timeout` and the DNS cache settings only apply to the
+    async session, `requests` keeps idle connections open until the
+    server closes them and resolves hostnames on every new connection.
+    """
+
+    # connections kept per host (requests pool size / aiohttp limit_per_host)
+    pool_maxsize: int = 32
+    # number of per-host pools kept by requests
+    pool_connections: int = 4
+    # requests: wait for a free connection instead of opening a throwaway one
+    pool_block: bool = True
+    # requests: how long to wait for it before raising
+    # requests.ConnectionError, None waits forever
+    pool_timeout: Optional[float] = 30.0
+    # aiohttp: total connections over all hosts
+    limit: int = 100
+    keepalive_timeout: float = 30.0
+    use_dns_cache: bool = True
+    ttl_dns_cache: Optional[int] = 300
+
+
+class RWPoolStats(RWWaitStats):
+    """How long requests waited for a pooled connection"""
+
+
+def _timed_pool_class(
+    base: Type[HTTPConnectionPool],
+    stats: RWPoolStats,
+    pool_timeout: Optional[float],
+) -> Type[HTTPConnectionPool]:
+    class TimedConnectionPool(base):
+        def _get_conn(self, timeout: Optional[float] = None):
+            # requests never passes a pool timeout, a full blocking pool
+            # would wait forever
+            if timeout is None:
+                timeout = pool_timeout
+            started_at = time.perf_counter()
+            try:
+                return super()._get_conn(timeout)
+            finally:
+                stats.record(time.perf_counter() - started_at)
+
+    return TimedConnectionPool
+
+
+class RWHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that reports connection checkout waits to `RWPoolStats`"""
+
+    def __init__(self, config: RWPoolConfig, stats: RWPoolStats) -> None:
+        self._stats = stats
+        self._pool_timeout = config.pool_timeout
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _timed_pool_class(
+                HTTPConnectionPool, self._stats, self._pool_timeout
+            ),
+            "https": _timed_pool_class(
+                HTTPSConnectionPool, self._stats, self._pool_timeout
+            ),
+        }
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        # like requests does for ClosedPoolError, callers only handle
+        # RequestExceptions
+        try:
+            return super().send(request, **kwargs)
+        except EmptyPoolError as ex:
+            raise requests.ConnectionError(ex, request=request) from ex
+
+    def __setstate__(self, state) -> None:
+        self._stats = RWPoolStats()
+        self._pool_timeout = RWPoolConfig.pool_timeout
+        super().__setstate__(state)
+
+
+def create_connector(config: RWPoolConfig) -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.pool_maxsize,
+        keepalive_timeout=config.keepalive_timeout,
+        use_dns_cache=config.use_dns_cache,
+        ttl_dns_cache=config.ttl_dns_cache,
+    )
+
+
+def create_trace_config(stats: RWPoolStats) -> aiohttp.TraceConfig:
+    """aiohttp trace hooks that report connector queue waits to `stats`"""
+
+    async def on_queued_start(session, context, params) -> None:
+        context.queued_at = time.perf_counter()
+
+    async def on_acquired(session, context, params) -> None:
+        queued_at = getattr(context, "queued_at", None)
+        stats.record(time.perf_counter() - queued_at if queued_at else 0.0)
+        context.queued_at = None
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_create_start.append(on_acquired)
+    trace_config.on_connection_reuseconn.append(on_acquired)
+    return trace_config
@@ -0,0 +1,219 @@
+"""Sans-IO core of the API: requests to send and how to read responses
+
+Nothing here does any I/O. `build_*` return a `RWRequest` for an
+endpoint, `check_status` rejects responses that are not a success
+(`HTTPStatusError`) and `parse_*` turn the body of the others into
+models (raising `APIStatusError` on API errors). Transports (`RWSession`,
+`RWAsyncSession`, `RWFakeTransport`) only send a `RWRequest` and
+return a `RWResponse`, so endpoint logic exists once whatever the
+transport, and its CPU cost can be measured without a network.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Union,
+)
+
+from . import json_codec, model_decoders, model_mappers, request_encoders
+from .exceptions import APIStatusError, HTTPStatusError
+from .models import RWBooking, RWPassenger, RWPriceSummary, RWSeats, RWTrip
+from .request_encoders import JSON_HEADERS, JourneySeatIds, SeatIds
+from .stats import RWWaitStats
+
+
+class RWRequest(NamedTuple):
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    headers: Optional[Dict[str, str]] = None
+    # bookings are not retried blindly, see `booking_retry_policy`
+    idempotent: bool = True
+
+
+class RWResponse(NamedTuple):
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+
+class RWTransport(Protocol):
+    """What `RWClient` needs from a transport, see `RWSession`"""
+
+    pool_stats: RWWaitStats
+
+    def get_hostname(self) -> str: ...
+
+    def send(self, request: RWRequest) -> RWResponse: ...
+
+
+class RWAsyncTransport(Protocol):
+    """What `RWAsyncClient` needs from a transport, see `RWAsyncSession`"""
+
+    pool_stats: RWWaitStats
+
+    def get_hostname(self) -> str: ...
+
+    async def send(self, request: RWRequest) -> RWResponse: ...
+
+    async def close(self) -> None: ...
+
+
+def build_main_page_request() -> RWRequest:
+    return RWRequest("GET", "")
+
+
+def build_stations_request(headers: Optional[Dict[str, str]] = None) -> RWRequest:
+    return RWRequest("GET", "/railway-api/stations", headers=headers)
+
+
+def build_search_trips_request(
+    src_location_id: int,
+    dest_location_id: int,
+    date: str,
+    adults: int,
+    children: int = 0,
+) -> RWRequest:
+    return RWRequest(
+        "POST",
+        "/railway-api/trips",
+        request_encoders.encode_search_trips(
+            src_location_id, dest_location_id, date, adults, children
+        ),
+        JSON_HEADERS,
+    )
+
+
+def build_price_summary_request(
+    outbound_trip_id: int, inbound_trip_id: int = -1
+) -> RWRequest:
+    if inbound_trip_id == -1:
+        return RWRequest("GET", f"/railway-api/trips/{outbound_trip_id}/price_summary?")
+
+    return RWRequest(
+        "GET",
+        "/railway-api/roundtrips"
+        f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}/price_summary?",
+    )
+
+
+def build_seats_request(
+    outbound_trip_id: int,
+    outbound_wagon_id: int,
+    adults: int,
+    children: int,
+    inbound_trip_id: int = -1,
+    inbound_wagon_id: int = -1,
+) -> RWRequest:
+    if inbound_trip_id == -1:
+        return RWRequest(
+            "POST",
+            f"/railway-api/trips/{outbound_trip_id}",
+            request_encoders.encode_seats(outbound_wagon_id, adults, children),
+            JSON_HEADERS,
+        )
+
+    return RWRequest(
+        "POST",
+        "/railway-api/roundtrips"
+        f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}",
+        request_encoders.encode_seats(
+            outbound_wagon_id, adults, children, inbound_wagon_id
+        ),
+        JSON_HEADERS,
+    )
+
+
+def build_booking_request(
+    contact_mobile: str,
+    contact_email: str,
+    contact_main_contact: str,
+    passengers: List[Union[RWPassenger, Dict[str, str]]],
+    outbound_journey_id: int = -1,
+    outbound_wagon_id: int = -1,
+    outbound_seat_id: int = -1,
+    api_client: str = "web",
+    has_media_wifi: bool = False,
+    has_lunchbox: bool = False,
+    bedding_type: str = "default",
+    inbound_journey_id: int = -1,
+    inbound_wagon_id: int = -1,
+    inbound_seat_id: int = -1,
+    outbound_seats: Optional[SeatIds] = None,
+    inbound_seats: Optional[SeatIds] = None,
+    outbound_journeys: Optional[JourneySeatIds] = None,
+    inbound_journeys: Optional[JourneySeatIds] = None,
+) -> RWRequest:
+    """Book seats, see `RWSession.book_tickets` for the arguments"""
+    body = request_encoders.encode_booking(
+        contact_mobile,
+        contact_email,
+        contact_main_contact,
+        passengers,
+        outbound_journeys=request_encoders.get_journey_seat_ids(
+            outbound_journey_id,
+            outbound_wagon_id,
+            outbound_seat_id,
+            outbound_seats,
+            outbound_journeys,
+            required=True,
+        ),
+        inbound_journeys=request_encoders.get_journey_seat_ids(
+            inbound_journey_id,
+            inbound_wagon_id,
+            inbound_seat_id,
+            inbound_seats,
+            inbound_journeys,
+        ),
+        api_client=api_client,
+        has_media_wifi=has_media_wifi,
+        has_lunchbox=has_lunchbox,
+        bedding_type=bedding_type,
+    )
+
+    return RWRequest(
+        "POST", "/railway-api/bookings", body, JSON_HEADERS, idempotent=False
+    )
+
+
+def check_status(response: RWResponse, allow_not_modified: bool = False) -> None:
+    """Raise `HTTPStatusError` unless `response` is a 2xx
+
+    304 Not Modified is only allowed with `allow_not_modified`, for
+    revalidated stations.
+    """
+    if 200 <= response.status < 300:
+        return
+    if allow_not_modified and response.status == 304:
+        return
+    raise HTTPStatusError(response.status, response.body)
+
+
+def parse_stations(body: bytes) -> List[Dict[str, Any]]:
+    """Raw station json, as kept by `RWStationCache`"""
+    json_data = json_codec.loads(body)
+    APIStatusError.raise_for_status(json_data)
+    return json_data["data"]["stations"]
+
+
+def parse_trips(body: bytes, lazy: bool = False) -> List[RWTrip]:
+    return model_decoders.trips_from_bytes(body, lazy=lazy)
+
+
+def parse_price_summary(body: bytes) -> RWPriceSummary:
+    return model_decoders.price_summary_from_bytes(body)
+
+
+def parse_seats(body: bytes, lazy: bool = False) -> RWSeats:
+    return model_decoders.seats_from_bytes(body, lazy=lazy)
+
+
+def parse_booking(body: bytes) -> RWBooking:
+    json_data = json_codec.loads(body)
+    APIStatusError.raise_for_status(json_data)
+    return model_mappers.booking_from_json(json_data["data"]["booking"])
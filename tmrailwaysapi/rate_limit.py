@@ -0,0 +1,190 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from .stats import RWWaitStats
+
+
+class RWRateLimiterStats(RWWaitStats):
+    """How much latency the rate limiter added to requests"""
+
+
+class RWRateLimiter:
+    """Token bucket rate limiter
+
+    Allows `rate` requests per second on average and bursts of up to
+    `burst` requests. Pass the same instance to several clients (sync
+    or async) to give them one shared budget within the process.
+
+    Tokens are reserved up front, so waiters are served in arrival order
+    and nobody spins: a caller that finds the bucket empty sleeps exactly
+    until its token is due.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self.stats = RWRateLimiterStats()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def _take(self, tokens: float, updated_at: float, now: float) -> tuple:
+        """Refill bucket, take one token, return (tokens, wait)"""
+        elapsed = max(0.0, now - updated_at)
+        tokens = min(float(self._burst), tokens + elapsed * self._rate)
+        tokens -= 1
+        wait = -tokens / self._rate if tokens < 0 else 0.0
+        return tokens, wait
+
+    def _reserve(self) -> float:
+        """Reserve a token, returns seconds to wait before using it"""
+        with self._lock:
+            now = self._clock()
+            self._tokens, wait = self._take(self._tokens, self._updated_at, now)
+            self._updated_at = now
+            return wait
+
+    def _refund(self) -> None:
+        """Give back a reserved token that was never used"""
+        with self._lock:
+            self._tokens = min(float(self._burst), self._tokens + 1)
+
+    async def _reserve_async(self) -> float:
+        return self._reserve()
+
+    def _refund_async(self) -> None:
+        self._refund()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent, returns time waited"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self.stats.record(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Async version of `acquire`
+
+        A waiter cancelled before its token is due gives it back, so
+        cancellations do not eat into the budget of later requests.
+        """
+        wait = await self._reserve_async()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund_async()
+                raise
+        self.stats.record(wait)
+        return wait
+
+
+class RWFileRateLimiter(RWRateLimiter):
+    """Token bucket shared between processes through a local file
+
+    Bucket state lives in `path` and is updated under an exclusive
+    `flock`, so every process using the same path draws from one budget.
+    Only available on platforms with `fcntl`.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: str, rate: float, burst: int = 1) -> None:
+        if fcntl is None:
+            raise RuntimeError("RWFileRateLimiter requires fcntl (Unix only)")
+
+        # wall clock, monotonic clocks are not comparable across processes
+        super().__init__(rate, burst, clock=time.time)
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _update(self, update: Callable[[float, float, float], tuple]) -> float:
+        """Apply `update(tokens, updated_at, now)` under the file lock
+
+        `update` returns (tokens, updated_at, result), the new state is
+        written back and `result` returned.
+        """
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = self._clock()
+            data = os.pread(fd, self._STATE.size, 0)
+
+            if len(data) == self._STATE.size:
+                tokens, updated_at = self._STATE.unpack(data)
+            else:
+                tokens, updated_at = float(self._burst), now
+
+            tokens, updated_at, result = update(tokens, updated_at, now)
+            os.pwrite(fd, self._STATE.pack(tokens, updated_at), 0)
+            return result
+        finally:
+            os.close(fd)  # also releases the lock
+
+    def _reserve(self) -> float:
+        def reserve(tokens: float, updated_at: float, now: float) -> tuple:
+            tokens, wait = self._take(tokens, updated_at, now)
+            return tokens, now, wait
+
+        return self._update(reserve)
+
+    def _refund(self) -> None:
+        self._update(
+            lambda tokens, updated_at, now: (
+                min(float(self._burst), tokens + 1),
+                updated_at,
+                0.0,
+            )
+        )
+
+    async def _reserve_async(self) -> float:
+        """`_reserve` in the default executor, `flock` would block the loop"""
+        loop = asyncio.get_running_loop()
+        reservation = loop.run_in_executor(None, self._reserve)
+
+        try:
+            return await asyncio.shield(reservation)
+        except asyncio.CancelledError:
+            # the token is taken anyway once the thread gets the lock
+            def refund(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    self._refund_async()
+
+            reservation.add_done_callback(refund)
+            raise
+
+    def _refund_async(self) -> None:
+        asyncio.get_running_loop().run_in_executor(None, self._refund)
@@ -0,0 +1,139 @@
+"""Request bodies shared by `RWSession` and `RWAsyncSession`
+
+Every encoder returns the body as compact utf-8 bytes from
+`json_codec.dumps`, ready to be sent with `JSON_HEADERS`.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from . import json_codec
+from .models import RWPassenger
+
+SeatIds = List[Tuple[int, int]]
+JourneySeatIds = List[Tuple[int, SeatIds]]
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def encode_search_trips(
+    src_location: int, dest_location: int, date: str, adults: int, children: int = 0
+) -> bytes:
+    return json_codec.dumps(
+        {
+            "source": str(src_location),
+            "destination": str(dest_location),
+            "date": date,
+            "adult": adults,
+            "child": children,
+        }
+    )
+
+
+def encode_seats(
+    outbound_wagon_id: int,
+    adults: int,
+    children: int,
+    inbound_wagon_id: Optional[int] = None,
+) -> bytes:
+    """Body of a seats request, `inbound_wagon_id` for round trips only"""
+    json_data = {
+        "adult": adults,
+        "child": children,
+        "outbound_wagon_type_id": outbound_wagon_id,
+    }
+    if inbound_wagon_id is not None:
+        json_data["inbound_wagon_type_id"] = inbound_wagon_id
+
+    return json_codec.dumps(json_data)
+
+
+def get_passenger_json(passenger: Union[RWPassenger, Dict[str, str]]) -> Dict[str, str]:
+    """Request json of a passenger, dicts are passed through as is"""
+    if not isinstance(passenger, RWPassenger):
+        return passenger
+
+    dob = passenger.dob
+    return {
+        "name": passenger.name,
+        "surname": passenger.surname,
+        # same as strftime("%d-%m-%Y"), without parsing the format
+        "dob": "%02d-%02d-%04d" % (dob.day, dob.month, dob.year),
+        "tariff": passenger.tariff,
+        "gender": passenger.gender,
+        "identity_type": passenger.identity_type,
+        "identity_number": passenger.identity_number,
+    }
+
+
+def get_journey_seat_ids(
+    journey_id: int,
+    wagon_id: int,
+    seat_id: int,
+    seats: Optional[SeatIds],
+    journeys: Optional[JourneySeatIds],
+    required: bool = False,
+) -> Optional[JourneySeatIds]:
+    """(journey id, seats) of a direction, None if nothing is booked
+
+    `journeys` wins over `seats`, which wins over a single
+    `wagon_id`/`seat_id`. A `required` direction (outbound) raises
+    ValueError instead of returning None.
+    """
+    if journeys is not None:
+        return journeys
+
+    if seats is None and wagon_id != -1 != seat_id:
+        seats = [(wagon_id, seat_id)]
+    if journey_id != -1 and seats:
+        return [(journey_id, seats)]
+    if required:
+        raise ValueError("No journey and seat to book")
+    return None
+
+
+def _get_direction_json(journeys: JourneySeatIds) -> Dict:
+    return {
+        "selected_journeys": [
+            {
+                "id": journey_id,
+                "seats": [
+                    {"id": seat_id, "train_wagon_id": wagon_id}
+                    for wagon_id, seat_id in seats
+                ],
+            }
+            for journey_id, seats in journeys
+        ],
+    }
+
+
+def encode_booking(
+    contact_mobile: str,
+    contact_email: str,
+    contact_main_contact: str,
+    passengers: Sequence[Union[RWPassenger, Dict[str, str]]],
+    outbound_journeys: JourneySeatIds,
+    inbound_journeys: Optional[JourneySeatIds] = None,
+    api_client: str = "web",
+    has_media_wifi: bool = False,
+    has_lunchbox: bool = False,
+    bedding_type: str = "default",
+) -> bytes:
+    """Body of a booking, see `RWClient.book_tickets` for an example"""
+    return json_codec.dumps(
+        {
+            "has_media_wifi": has_media_wifi,
+            "has_lunchbox": has_lunchbox,
+            "bedding_type": bedding_type,
+            "api_client": api_client,
+            "contact": {
+                "mobile": contact_mobile,
+                "email": contact_email,
+                "main_contact": contact_main_contact,
+            },
+            "passengers": [get_passenger_json(passenger) for passenger in passengers],
+            "outbound": _get_direction_json(outbound_journeys),
+            "inbound": (
+                _get_direction_json(inbound_journeys) if inbound_journeys else None
+            ),
+        }
+    )
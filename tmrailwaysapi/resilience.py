@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, FrozenSet
+
+from .exceptions import CircuitOpenError
+
+
+@dataclass(frozen=True)
+class RWTimeout:
+    """Per-request deadlines in seconds"""
+
+    connect: float = 5.0
+    read: float = 30.0
+
+
+@dataclass(frozen=True)
+class RWRetryPolicy:
+    """Retry with exponential backoff and full jitter
+
+    `attempts` counts the first try, so `attempts=1` never retries.
+    When `retry_after_send` is False only failures that happened
+    before the request reached the server (connect errors) are retried,
+    which is what non-idempotent requests like bookings need.
+    """
+
+    attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_after_send: bool = True
+
+    def get_delay(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (starting at 0)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def can_retry(
+        self, attempt: int, status: int = 0, connect_error: bool = False
+    ) -> bool:
+        """Whether failed try number `attempt` (starting at 0) may be retried
+
+        `status` is the http status of the failed response,
+        0 if there was none (connection error or timeout).
+        """
+        if attempt + 1 >= self.attempts:
+            return False
+        if connect_error:
+            return True
+        if not self.retry_after_send:
+            return False
+        return status == 0 or status in self.retry_statuses
+
+
+# idempotent endpoints: stations, trip search, price summary, seats
+DEFAULT_RETRY_POLICY = RWRetryPolicy()
+# bookings may create a hold on the server even if the response is lost,
+# only retry when the request never left the client
+DEFAULT_BOOKING_RETRY_POLICY = RWRetryPolicy(
+    attempts=2, retry_statuses=frozenset(), retry_after_send=False
+)
+
+
+class RWCircuitBreaker:
+    """Fail fast while the upstream is down
+
+    After `failure_threshold` consecutive failures the circuit opens
+    and requests raise `CircuitOpenError` without touching the network.
+    Once `reset_timeout` seconds have passed a single probe request
+    is let through: success closes the circuit, failure opens it again.
+
+    One breaker can be shared by several clients talking to the same host.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = RWCircuitBreaker.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def before_request(self) -> None:
+        """Raises `CircuitOpenError` if the request must not be sent"""
+        with self._lock:
+            if self._state == RWCircuitBreaker.CLOSED:
+                return
+
+            now = self._clock()
+            retry_in = self._opened_at + self._reset_timeout - now
+            if retry_in <= 0:
+                # let one probe through, another one only if it never reports back
+                self._state = RWCircuitBreaker.HALF_OPEN
+                self._opened_at = now
+                return
+
+            raise CircuitOpenError(retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = RWCircuitBreaker.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+            if (
+                self._state == RWCircuitBreaker.HALF_OPEN
+                or self._failures >= self._failure_threshold
+            ):
+                self._state = RWCircuitBreaker.OPEN
+                self._opened_at = self._clock()
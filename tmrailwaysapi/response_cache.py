@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class RWCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+class RWResponseCache:
+    """Size-bounded LRU cache with per-endpoint TTLs
+
+    Keys are tuples whose first item is the endpoint name, followed
+    by the normalized arguments sent by the session, e.g.
+    `("search_trips", "17", "21", "2025-08-20", 1, 0)`.
+    Values are parsed models and are shared between callers,
+    so they must not be modified in place.
+
+    Subclass and override `get`/`set`/`clear` to plug in another store.
+    """
+
+    DEFAULT_TTLS = {
+        "search_trips": 60.0,
+        "price_summary": 300.0,
+        "seats": 10.0,
+    }
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._maxsize = maxsize
+        self._ttls = dict(RWResponseCache.DEFAULT_TTLS)
+        self._ttls.update(ttls or {})
+        self._default_ttl = default_ttl
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, *args: Hashable) -> Tuple:
+        return (endpoint,) + args
+
+    def get_ttl(self, endpoint: str) -> float:
+        return self._ttls.get(endpoint, self._default_ttl)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Cached value or None on miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Tuple, value: Any) -> None:
+        ttl = self.get_ttl(key[0])
+        if ttl <= 0 or self._maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> RWCacheStats:
+        with self._lock:
+            return RWCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._entries),
+            )
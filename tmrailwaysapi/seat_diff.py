@@ -0,0 +1,124 @@
+from typing import Dict, Hashable, List, NamedTuple, Tuple
+
+from .models import RWSeat, RWTripSeats, RWWagonSeats
+from .seat_map import get_seat_positions
+
+
+class RWWagonSeatsDiff(NamedTuple):
+    journey_id: int
+    wagon: RWWagonSeats
+    became_free: List[RWSeat]
+    became_taken: List[RWSeat]
+    free_count: int
+    is_new: bool
+
+
+class RWTripSeatsDiff(NamedTuple):
+    trip_id: int
+    wagons: List[RWWagonSeatsDiff]
+    removed_wagon_ids: List[int]
+    became_free: int
+    became_taken: int
+    free_count: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.wagons or self.removed_wagon_ids)
+
+
+def _get_free_bits(wagon: RWWagonSeats) -> int:
+    bits = 0
+    for seat, position in zip(wagon.seats, get_seat_positions(wagon.seats)):
+        if seat.available:
+            bits |= 1 << position
+    return bits
+
+
+class RWSeatTracker:
+    """Availability changes between successive `get_seats` polls
+
+    Only a free-seat bitmap (one int) is kept per (trip, wagon), so
+    holding many polled trips costs a few bytes per wagon instead of
+    the previous `RWTripSeats` tree. `update` diffs a new poll against
+    it and reports only wagons whose availability changed; a wagon
+    seen for the first time reports all its free seats as
+    `became_free` with `is_new` set.
+    """
+
+    def __init__(self) -> None:
+        self._free: Dict[Tuple[Hashable, int], int] = {}
+        self._wagon_ids: Dict[Hashable, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def update(self, trip_seats: RWTripSeats) -> RWTripSeatsDiff:
+        trip_id = trip_seats.id
+        wagons = []
+        wagon_ids = []
+        became_free = became_taken = free_count = 0
+
+        for journey in trip_seats.journeys:
+            for wagon in journey.train_wagons:
+                key = (trip_id, wagon.id)
+                free = _get_free_bits(wagon)
+                previous = self._free.get(key)
+                self._free[key] = free
+                wagon_ids.append(wagon.id)
+
+                wagon_free_count = bin(free).count("1")
+                free_count += wagon_free_count
+
+                is_new = previous is None
+                if is_new:
+                    previous = 0
+                elif previous == free:
+                    continue
+
+                freed = free & ~previous
+                taken = previous & ~free
+                # only changed wagons pay for building seat lists
+                numbers = get_seat_positions(wagon.seats)
+                diff = RWWagonSeatsDiff(
+                    journey_id=journey.id,
+                    wagon=wagon,
+                    became_free=[
+                        seat
+                        for number, seat in zip(numbers, wagon.seats)
+                        if freed >> number & 1
+                    ],
+                    became_taken=[
+                        seat
+                        for number, seat in zip(numbers, wagon.seats)
+                        if taken >> number & 1
+                    ],
+                    free_count=wagon_free_count,
+                    is_new=is_new,
+                )
+                became_free += len(diff.became_free)
+                became_taken += len(diff.became_taken)
+                wagons.append(diff)
+
+        current_wagon_ids = set(wagon_ids)
+        removed_wagon_ids = [
+            wagon_id
+            for wagon_id in self._wagon_ids.get(trip_id, ())
+            if wagon_id not in current_wagon_ids
+        ]
+        for wagon_id in removed_wagon_ids:
+            del self._free[(trip_id, wagon_id)]
+        self._wagon_ids[trip_id] = wagon_ids
+
+        return RWTripSeatsDiff(
+            trip_id=trip_id,
+            wagons=wagons,
+            removed_wagon_ids=removed_wagon_ids,
+            became_free=became_free,
+            became_taken=became_taken,
+            free_count=free_count,
+        )
+
+    def forget(self, trip_id: Hashable) -> None:
+        """Drop the state of `trip_id`, its next update starts over"""
+        for wagon_id in self._wagon_ids.pop(trip_id, ()):
+            self._free.pop((trip_id, wagon_id), None)
@@ -0,0 +1,244 @@
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .models import RWJourneySeats, RWSeat, RWWagonSeats
+
+_LAYOUT_RE = re.compile(r"^([a-z]+)_(\d+)$")
+_NUMBER_RE = re.compile(r"^\d+")
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _positions(bits: int) -> Iterator[int]:
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def _range_mask(first: int, last: int) -> int:
+    """Bits of seat numbers `first`..`last` (bit 0 is seat 1)"""
+    return ((1 << (last - first + 1)) - 1) << (first - 1)
+
+
+def get_compartment_masks(layout_map: str) -> List[int]:
+    """Seat bitmaps of each compartment for a `layout_map` like "kupe_36"
+
+    The layout string is "<wagon kind>_<capacity>":
+
+    - "kupe", "sw", "lux": closed compartments of 4 (2 for sw/lux)
+      consecutive seats
+    - "platskart": open bays, bay k holds seats 4k-3..4k and the
+      side seats numbered from the end (53-54 for bay 1 of 54 seats)
+
+    Other layouts have no compartments, an empty list is returned
+    and seats are only "together" when their numbers are consecutive.
+    """
+    match = _LAYOUT_RE.match(layout_map or "")
+    if match is None:
+        return []
+
+    kind, capacity = match.group(1), int(match.group(2))
+
+    if kind in ("kupe", "sw", "lux"):
+        size = 4 if kind == "kupe" else 2
+        return [
+            _range_mask(first, min(first + size - 1, capacity))
+            for first in range(1, capacity + 1, size)
+        ]
+
+    if kind == "platskart":
+        bays = capacity // 6
+        return [
+            _range_mask(4 * bay - 3, 4 * bay)
+            | _range_mask(capacity + 1 - 2 * bay, capacity + 2 - 2 * bay)
+            for bay in range(1, bays + 1)
+        ]
+
+    return []
+
+
+def get_seat_number(seat: RWSeat) -> Optional[int]:
+    """Seat number from its label ("12", "12A"), None if it has none"""
+    match = _NUMBER_RE.match(seat.label or "")
+    if match is None:
+        return None
+
+    number = int(match.group(0))
+    return number if number > 0 else None
+
+
+def get_seat_positions(seats: Sequence[RWSeat]) -> List[int]:
+    """Bit position of each of a wagon's seats
+
+    A seat's position is its number minus one. Seats without a number,
+    or with one already taken ("12B" after "12A"), are given the
+    positions after the highest number, in wagon order, so every seat
+    has a bit of its own.
+    """
+    positions = []
+    taken = set()
+
+    for seat in seats:
+        number = get_seat_number(seat)
+        if number is None or number - 1 in taken:
+            positions.append(-1)
+        else:
+            positions.append(number - 1)
+            taken.add(number - 1)
+
+    spare = max(taken) + 1 if taken else 0
+    for index, position in enumerate(positions):
+        if position == -1:
+            positions[index] = spare
+            spare += 1
+
+    return positions
+
+
+class RWWagonSeatMap:
+    """Free seat bitmaps of one wagon
+
+    Bit `n - 1` stands for seat number `n` (see `get_seat_positions`
+    for seats without a usable number). There is one bitmap of all
+    free seats and one per level, and compartments (see
+    `get_compartment_masks`) are masks over the same bits, so the
+    queries below are a few integer operations instead of a scan.
+    """
+
+    def __init__(self, wagon: RWWagonSeats) -> None:
+        self.wagon = wagon
+        self._seats: Dict[int, RWSeat] = {}
+        self.free = 0
+        self.free_by_level: Dict[int, int] = {}
+        # seats with a number of their own, the only ones found together
+        self._numbered = 0
+
+        for seat, position in zip(wagon.seats, get_seat_positions(wagon.seats)):
+            self._seats[position] = seat
+            bit = 1 << position
+            if get_seat_number(seat) == position + 1:
+                self._numbered |= bit
+
+            if seat.available:
+                self.free |= bit
+                self.free_by_level[seat.level] = (
+                    self.free_by_level.get(seat.level, 0) | bit
+                )
+
+        self.compartments = get_compartment_masks(wagon.layout_map)
+        self.free_count = _popcount(self.free)
+        self._free_counts = {
+            level: _popcount(bits) for level, bits in self.free_by_level.items()
+        }
+
+    def __repr__(self) -> str:
+        return "<RWWagonSeatMap: wagon {} with {} free>".format(
+            self.wagon.number, self.free_count
+        )
+
+    def get_free_bits(self, level: Optional[int] = None) -> int:
+        if level is None:
+            return self.free
+        return self.free_by_level.get(level, 0)
+
+    def count_free(self, level: Optional[int] = None) -> int:
+        if level is None:
+            return self.free_count
+        return self._free_counts.get(level, 0)
+
+    def get_seats(self, bits: int) -> List[RWSeat]:
+        """Seats of the given bitmap, by seat number"""
+        return [self._seats[position] for position in _positions(bits)]
+
+    def get_free_seats(self, level: Optional[int] = None) -> List[RWSeat]:
+        return self.get_seats(self.get_free_bits(level))
+
+    def find_together(self, n: int, level: Optional[int] = None) -> Optional[int]:
+        """Bitmap of `n` free seats together, None if there are none
+
+        Together means in one compartment when the layout has them,
+        otherwise `n` consecutive seat numbers. The lowest numbered
+        match is returned.
+        """
+        free = self.get_free_bits(level) & self._numbered
+
+        if n <= 0:
+            return 0
+        if _popcount(free) < n:
+            return None
+
+        if self.compartments:
+            for compartment in self.compartments:
+                bits = free & compartment
+                if _popcount(bits) >= n:
+                    # lowest n seats of the compartment
+                    while _popcount(bits) > n:
+                        bits &= ~(1 << (bits.bit_length() - 1))
+                    return bits
+            return None
+
+        # bit i of `starts` is set when seats i+1..i+n are all free
+        starts = free
+        for shift in range(1, n):
+            starts &= free >> shift
+        if not starts:
+            return None
+
+        first = (starts & -starts).bit_length()
+        return _range_mask(first, first + n - 1)
+
+
+class RWJourneySeatMap:
+    """Seat maps of every wagon of a journey"""
+
+    def __init__(self, journey: RWJourneySeats) -> None:
+        self.journey = journey
+        self.wagons = [RWWagonSeatMap(wagon) for wagon in journey.train_wagons]
+
+    def __repr__(self) -> str:
+        return "<RWJourneySeatMap: journey {} with {} wagons>".format(
+            self.journey.id, len(self.wagons)
+        )
+
+    def _get_wagons(self, wagon_type_id: Optional[int]) -> List[RWWagonSeatMap]:
+        if wagon_type_id is None:
+            return self.wagons
+        return [
+            wagon for wagon in self.wagons if wagon.wagon.wagon_type_id == wagon_type_id
+        ]
+
+    def count_free(
+        self, level: Optional[int] = None, wagon_type_id: Optional[int] = None
+    ) -> int:
+        return sum(wagon.count_free(level) for wagon in self._get_wagons(wagon_type_id))
+
+    def get_first_wagon_with(
+        self,
+        k: int,
+        level: Optional[int] = None,
+        wagon_type_id: Optional[int] = None,
+    ) -> Optional[RWWagonSeatMap]:
+        """First wagon (in train order) with at least `k` free seats"""
+        for wagon in self._get_wagons(wagon_type_id):
+            if wagon.count_free(level) >= k:
+                return wagon
+        return None
+
+    def find_together(
+        self,
+        n: int,
+        level: Optional[int] = None,
+        wagon_type_id: Optional[int] = None,
+    ) -> Optional[Tuple[RWWagonSeatMap, List[RWSeat]]]:
+        """First wagon with `n` free seats together, and those seats"""
+        for wagon in self._get_wagons(wagon_type_id):
+            if wagon.count_free(level) < n:
+                continue
+
+            bits = wagon.find_together(n, level)
+            if bits is not None:
+                return wagon, wagon.get_seats(bits)
+        return None
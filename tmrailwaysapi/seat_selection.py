@@ -0,0 +1,154 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .models import RWJourneySeats, RWSeat, RWTripSeats, RWWagonSeats
+
+RWSeatChoice = Tuple[RWWagonSeats, RWSeat]
+
+
+def get_seat_ids(
+    direction: str,
+    wagon: Optional[RWWagonSeats],
+    seat: Optional[RWSeat],
+    seats: Optional[Sequence[RWSeatChoice]],
+) -> Optional[List[Tuple[int, int]]]:
+    """(wagon id, seat id) pairs of a booking direction
+
+    Seats are given either as a single `wagon`/`seat` or as a list of
+    (wagon, seat) pairs in `seats`, which may span several wagons.
+    Returns None if no seat was given for `direction`.
+    """
+    if seats is not None:
+        if wagon is not None or seat is not None:
+            raise ValueError(
+                "Set either `{0}_wagon`/`{0}_seat` or `{0}_seats`, not both".format(
+                    direction
+                )
+            )
+        if not seats:
+            raise ValueError("`{}_seats` is empty".format(direction))
+
+        seat_ids = [(wagon.id, seat.id) for wagon, seat in seats]
+        if len(set(seat_ids)) != len(seat_ids):
+            raise ValueError("`{}_seats` has the same seat twice".format(direction))
+        return seat_ids
+
+    if wagon is not None and seat is not None:
+        return [(wagon.id, seat.id)]
+    if wagon is not None or seat is not None:
+        raise ValueError(
+            "You are trying to book tickets, but not all `{}_*` arguments are set".format(
+                direction
+            )
+        )
+    return None
+
+
+class RWJourneySelection(NamedTuple):
+    """Seats picked on one journey (leg) of a trip"""
+
+    journey: RWJourneySeats
+    seats: List[RWSeatChoice]
+
+
+SelectedJourneys = List[Tuple[int, List[Tuple[int, int]]]]
+
+
+def validate_selections(
+    trip_seats: RWTripSeats, selections: Sequence[RWJourneySelection]
+) -> None:
+    """Check `selections` against seats fetched with `get_seats`
+
+    Every journey of the trip must be selected exactly once, with the
+    same number of seats on each, and every seat must belong to its
+    journey and wagon and still be available there.
+    """
+    journeys = {journey.id: journey for journey in trip_seats.journeys}
+    selected = [selection.journey.id for selection in selections]
+
+    if sorted(selected) != sorted(journeys):
+        raise ValueError(
+            "Trip {} needs one selection for each of its journeys {}, got {}".format(
+                trip_seats.id, list(journeys), selected
+            )
+        )
+
+    for selection in selections:
+        journey = journeys[selection.journey.id]
+        wagons = {wagon.id: wagon for wagon in journey.train_wagons}
+        seats: Dict[int, Dict[int, RWSeat]] = {}
+
+        for wagon, seat in selection.seats:
+            if wagon.id not in wagons:
+                raise ValueError(
+                    "Wagon {} is not part of journey {}".format(wagon.id, journey.id)
+                )
+            if wagon.id not in seats:
+                seats[wagon.id] = {seat.id: seat for seat in wagons[wagon.id].seats}
+
+            fetched_seat = seats[wagon.id].get(seat.id)
+            if fetched_seat is None:
+                raise ValueError(
+                    "Seat {} is not part of wagon {}".format(seat.id, wagon.id)
+                )
+            if not fetched_seat.available:
+                raise ValueError(
+                    "Seat {} of wagon {} is not available".format(
+                        fetched_seat.label, wagons[wagon.id].number
+                    )
+                )
+
+    if len({len(selection.seats) for selection in selections}) > 1:
+        raise ValueError("Every journey needs the same number of seats")
+
+
+def get_selected_journeys(
+    direction: str,
+    journey: Optional[RWJourneySeats],
+    wagon: Optional[RWWagonSeats],
+    seat: Optional[RWSeat],
+    seats: Optional[Sequence[RWSeatChoice]],
+    selections: Optional[Sequence[RWJourneySelection]],
+    trip_seats: Optional[RWTripSeats] = None,
+) -> Optional[SelectedJourneys]:
+    """(journey id, [(wagon id, seat id), ...]) of a booking direction
+
+    Either `selections` covering every journey of the trip, or one
+    `journey` with its seats (see `get_seat_ids`). If `trip_seats` is
+    given the selections are validated against it. Returns None if
+    nothing was selected for `direction`.
+    """
+    if selections is not None:
+        if any(value is not None for value in (journey, wagon, seat, seats)):
+            raise ValueError(
+                "Set either `{0}_selections` or `{0}_journey` and its seats".format(
+                    direction
+                )
+            )
+        if not selections:
+            raise ValueError("`{}_selections` is empty".format(direction))
+        journey_ids = [selection.journey.id for selection in selections]
+        if len(set(journey_ids)) != len(journey_ids):
+            raise ValueError(
+                "`{}_selections` has the same journey twice".format(direction)
+            )
+    else:
+        seat_ids = get_seat_ids(direction, wagon, seat, seats)
+        if journey is None and seat_ids is None:
+            return None
+        if journey is None or seat_ids is None:
+            raise ValueError(
+                "You are trying to book tickets, but not all `{}_*` arguments are set".format(
+                    direction
+                )
+            )
+        selections = [
+            RWJourneySelection(journey, list(seats) if seats else [(wagon, seat)])
+        ]
+
+    if trip_seats is not None:
+        validate_selections(trip_seats, selections)
+
+    return [
+        (selection.journey.id, get_seat_ids(direction, None, None, selection.seats))
+        for selection in selections
+    ]
@@ -1,14 +1,55 @@
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Union
 
 import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from . import json_codec, protocol
+from .pool import RWHTTPAdapter, RWPoolConfig, RWPoolStats
+from .rate_limit import RWRateLimiter
+from .protocol import RWRequest, RWResponse
+from .models import RWPassenger
+from .request_encoders import JSON_HEADERS, JourneySeatIds, SeatIds
+from .resilience import (
+    DEFAULT_BOOKING_RETRY_POLICY,
+    DEFAULT_RETRY_POLICY,
+    RWCircuitBreaker,
+    RWRetryPolicy,
+    RWTimeout,
+)
+
+
+class RWSession:
+    """Transport for `RWClient` on top of a `requests.Session`"""
+
+    def __init__(
+        self,
+        hostname: str,
+        pool_config: Optional[RWPoolConfig] = None,
+        timeout: Optional[RWTimeout] = None,
+        retry_policy: Optional[RWRetryPolicy] = None,
+        booking_retry_policy: Optional[RWRetryPolicy] = None,
+        circuit_breaker: Optional[RWCircuitBreaker] = None,
+        rate_limiter: Optional[RWRateLimiter] = None,
+    ) -> None:
+        self._hostname = hostname
 
+        timeout = timeout or RWTimeout()
+        self._timeout = (timeout.connect, timeout.read)
+        self._retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self._booking_retry_policy = booking_retry_policy or DEFAULT_BOOKING_RETRY_POLICY
+        self.circuit_breaker = circuit_breaker or RWCircuitBreaker()
+        self.rate_limiter = rate_limiter
 
-class RWSession(requests.Session):
-    def __init__(self, *args, hostname: str, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self._hostname = hostname
+        self.pool_stats = RWPoolStats()
+        adapter = RWHTTPAdapter(pool_config or RWPoolConfig(), self.pool_stats)
+        self._http_session = requests.Session()
+        self._http_session.mount("https://", adapter)
+        self._http_session.mount("http://", adapter)
+        self._http_session.headers.update(RWSession.get_default_headers())
 
-        self.headers.update(RWSession.get_default_headers())
+    def close(self) -> None:
+        self._http_session.close()
 
     @staticmethod
     def get_default_headers() -> Dict[str, str]:
@@ -31,26 +72,93 @@ class RWSession(requests.Session):
 
         return headers
 
-    # override
-    def get(self, path: str = "", *args, **kwargs) -> requests.Response:
-        response = super().get("https://" + self._hostname + path, *args, **kwargs)
-        response.raise_for_status()
-        return response
+    @staticmethod
+    def _is_connect_error(ex: requests.RequestException) -> bool:
+        """Whether request failed before it was sent to the server"""
+        if isinstance(ex, requests.ConnectTimeout):
+            return True
+
+        reason = getattr(ex.args[0], "reason", None) if ex.args else None
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
 
-    # override
-    def post(self, path: str = "", *args, **kwargs) -> requests.Response:
-        response = super().post("https://" + self._hostname + path, *args, **kwargs)
-        response.raise_for_status()
-        return response
+    def _send(
+        self, method: str, path: str, retry_policy: RWRetryPolicy, **kwargs
+    ) -> requests.Response:
+        """Send request with timeouts, retries and circuit breaker
+
+        The last response is returned whatever its status, see
+        `protocol.check_status`.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        if "json" in kwargs:
+            kwargs["data"] = json_codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **JSON_HEADERS)
+        attempt = 0
+
+        while True:
+            self.circuit_breaker.before_request()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                response = self._http_session.request(
+                    method, "https://" + self._hostname + path, **kwargs
+                )
+            except requests.RequestException as ex:
+                self.circuit_breaker.record_failure()
+
+                if not retry_policy.can_retry(
+                    attempt, 0, RWSession._is_connect_error(ex)
+                ):
+                    raise
+            else:
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+                if not retry_policy.can_retry(attempt, response.status_code):
+                    return response
+
+            time.sleep(retry_policy.get_delay(attempt))
+            attempt += 1
+
+    def get(self, path: str = "", **kwargs) -> requests.Response:
+        return self._send("GET", path, self._retry_policy, **kwargs)
+
+    def post(
+        self, path: str = "", idempotent: bool = True, **kwargs
+    ) -> requests.Response:
+        retry_policy = self._retry_policy if idempotent else self._booking_retry_policy
+        return self._send("POST", path, retry_policy, **kwargs)
 
     def get_hostname(self) -> str:
         return self._hostname
 
+    def _send_request(self, request: RWRequest) -> requests.Response:
+        retry_policy = (
+            self._retry_policy if request.idempotent else self._booking_retry_policy
+        )
+        return self._send(
+            request.method,
+            request.path,
+            retry_policy,
+            data=request.body,
+            headers=request.headers,
+        )
+
+    def send(self, request: RWRequest) -> RWResponse:
+        """Transport for `RWClient`, see `protocol`"""
+        response = self._send_request(request)
+        return RWResponse(response.status_code, response.headers, response.content)
+
     def get_main_page(self) -> requests.Response:
-        return self.get()
+        return self._send_request(protocol.build_main_page_request())
 
-    def get_stations(self) -> requests.Response:
-        return self.get("/railway-api/stations")
+    def get_stations(
+        self, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        return self._send_request(protocol.build_stations_request(headers))
 
     def search_trips(
         self,
@@ -60,26 +168,17 @@ class RWSession(requests.Session):
         adults: int,
         children: int = 0,
     ) -> requests.Response:
-        return self.post(
-            "/railway-api/trips",
-            json={
-                "source": str(src_location),
-                "destination": str(dest_location),
-                "date": date,
-                "adult": adults,
-                "child": children,
-            },
+        return self._send_request(
+            protocol.build_search_trips_request(
+                src_location, dest_location, date, adults, children
+            )
         )
 
     def get_price_summary(
         self, outbound_trip_id: int, inbound_trip_id: int = -1
     ) -> requests.Response:
-        if inbound_trip_id == -1:
-            return self.get(f"/railway-api/trips/{outbound_trip_id}/price_summary?")
-
-        return self.get(
-            "/railway-api/roundtrips"
-            f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}/price_summary?"
+        return self._send_request(
+            protocol.build_price_summary_request(outbound_trip_id, inbound_trip_id)
         )
 
     def get_seats(
@@ -91,25 +190,15 @@ class RWSession(requests.Session):
         inbound_trip_id: int = -1,
         inbound_wagon_id: int = -1,
     ) -> requests.Response:
-        if inbound_trip_id == -1:
-            return self.post(
-                f"/railway-api/trips/{outbound_trip_id}",
-                json={
-                    "adult": adults,
-                    "child": children,
-                    "outbound_wagon_type_id": outbound_wagon_id,
-                },
+        return self._send_request(
+            protocol.build_seats_request(
+                outbound_trip_id,
+                outbound_wagon_id,
+                adults,
+                children,
+                inbound_trip_id,
+                inbound_wagon_id,
             )
-
-        return self.post(
-            "/railway-api/roundtrips"
-            f"/outbound/{outbound_trip_id}/inbound/{inbound_trip_id}",
-            json={
-                "adult": adults,
-                "child": children,
-                "outbound_wagon_type_id": outbound_wagon_id,
-                "inbound_wagon_type_id": inbound_wagon_id,
-            },
         )
 
     def book_tickets(
@@ -117,10 +206,10 @@ class RWSession(requests.Session):
         contact_mobile: str,
         contact_email: str,
         contact_main_contact: str,
-        passengers: List[Dict[str, str]],
-        outbound_journey_id: int,
-        outbound_wagon_id: int,
-        outbound_seat_id: int,
+        passengers: List[Union[RWPassenger, Dict[str, str]]],
+        outbound_journey_id: int = -1,
+        outbound_wagon_id: int = -1,
+        outbound_seat_id: int = -1,
         api_client: str = "web",
         has_media_wifi: bool = False,
         has_lunchbox: bool = False,
@@ -128,53 +217,38 @@ class RWSession(requests.Session):
         inbound_journey_id: int = -1,
         inbound_wagon_id: int = -1,
         inbound_seat_id: int = -1,
+        outbound_seats: Optional[SeatIds] = None,
+        inbound_seats: Optional[SeatIds] = None,
+        outbound_journeys: Optional[JourneySeatIds] = None,
+        inbound_journeys: Optional[JourneySeatIds] = None,
     ) -> requests.Response:
-        if (
-            inbound_journey_id != -1
-            and inbound_wagon_id != -1
-            and inbound_seat_id != -1
-        ):
-            inbound = {
-                "selected_journeys": [
-                    {
-                        "id": inbound_journey_id,
-                        "seats": [
-                            {
-                                "id": inbound_seat_id,
-                                "train_wagon_id": inbound_wagon_id,
-                            },
-                        ],
-                    },
-                ],
-            }
-        else:
-            inbound = None
-
-        json_data = {
-            "has_media_wifi": has_media_wifi,
-            "has_lunchbox": has_lunchbox,
-            "bedding_type": bedding_type,
-            "api_client": api_client,
-            "contact": {
-                "mobile": contact_mobile,
-                "email": contact_email,
-                "main_contact": contact_main_contact,
-            },
-            "passengers": passengers,
-            "outbound": {
-                "selected_journeys": [
-                    {
-                        "id": outbound_journey_id,
-                        "seats": [
-                            {
-                                "id": outbound_seat_id,
-                                "train_wagon_id": outbound_wagon_id,
-                            },
-                        ],
-                    },
-                ],
-            },
-            "inbound": inbound,
-        }
-
-        return self.post("/railway-api/bookings", json=json_data)
+        """Book seats, `*_seats` are (wagon id, seat id) pairs
+
+        `outbound_seats`/`inbound_seats` book several seats, possibly
+        in different wagons, in one request and replace the single
+        `*_wagon_id`/`*_seat_id`. `outbound_journeys`/`inbound_journeys`
+        are (journey id, seats) for every journey of trips with
+        transfers and replace `*_journey_id` and its seats.
+        """
+        return self._send_request(
+            protocol.build_booking_request(
+                contact_mobile,
+                contact_email,
+                contact_main_contact,
+                passengers,
+                outbound_journey_id=outbound_journey_id,
+                outbound_wagon_id=outbound_wagon_id,
+                outbound_seat_id=outbound_seat_id,
+                api_client=api_client,
+                has_media_wifi=has_media_wifi,
+                has_lunchbox=has_lunchbox,
+                bedding_type=bedding_type,
+                inbound_journey_id=inbound_journey_id,
+                inbound_wagon_id=inbound_wagon_id,
+                inbound_seat_id=inbound_seat_id,
+                outbound_seats=outbound_seats,
+                inbound_seats=inbound_seats,
+                outbound_journeys=outbound_journeys,
+                inbound_journeys=inbound_journeys,
+            )
+        )
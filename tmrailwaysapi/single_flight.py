@@ -0,0 +1,40 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class RWSingleFlight:
+    """Coalesce concurrent identical calls into one in-flight call
+
+    While a call for `key` is running, later callers with the same key
+    await the same task instead of starting their own, and all of them
+    get the same result (or exception). The key is forgotten as soon
+    as the call finishes, so nothing is cached past that point.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # mark exception as retrieved if every waiter was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        # a cancelled waiter must not cancel the call shared with others
+        return await asyncio.shield(future)
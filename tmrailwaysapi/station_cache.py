@@ -0,0 +1,113 @@
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class RWStationCacheEntry(NamedTuple):
+    stations: List[Dict[str, Any]]
+    saved_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class RWStationCache:
+    """Persistent on-disk cache of the station catalog
+
+    Raw station json is stored in one file per hostname under `directory`.
+    Entries younger than `ttl` seconds are served without touching
+    the network. Older entries are revalidated with `ETag`/`Last-Modified`
+    when the server sent them, otherwise clients serve the stale
+    catalog and refresh it in the background.
+    """
+
+    def __init__(self, directory: str, ttl: float = 24 * 60 * 60) -> None:
+        self._directory = os.path.expanduser(directory)
+        self._ttl = ttl
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get_path(self, hostname: str) -> str:
+        filename = "stations-{}.json".format(re.sub(r"[^\w.-]", "_", hostname))
+        return os.path.join(self._directory, filename)
+
+    def load(self, hostname: str) -> Optional[RWStationCacheEntry]:
+        """Load cached catalog, returns None if missing or unreadable"""
+        try:
+            with open(self.get_path(hostname), "r", encoding="utf-8") as file:
+                json_data = json.load(file)
+
+            return RWStationCacheEntry(
+                stations=json_data["stations"],
+                saved_at=json_data["saved_at"],
+                etag=json_data.get("etag"),
+                last_modified=json_data.get("last_modified"),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(
+        self,
+        hostname: str,
+        stations: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> RWStationCacheEntry:
+        """Atomically write catalog to disk"""
+        entry = RWStationCacheEntry(
+            stations=stations,
+            saved_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+        os.makedirs(self._directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry._asdict(), file, ensure_ascii=False)
+            os.replace(tmp_path, self.get_path(hostname))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        return entry
+
+    def touch(self, hostname: str, entry: RWStationCacheEntry) -> RWStationCacheEntry:
+        """Mark entry as fresh again (e.g. after `304 Not Modified`)"""
+        return self.store(
+            hostname,
+            entry.stations,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+        )
+
+    def is_fresh(self, entry: RWStationCacheEntry) -> bool:
+        return time.time() - entry.saved_at < self._ttl
+
+    @staticmethod
+    def can_revalidate(entry: RWStationCacheEntry) -> bool:
+        return bool(entry.etag or entry.last_modified)
+
+    @staticmethod
+    def get_conditional_headers(entry: RWStationCacheEntry) -> Dict[str, str]:
+        headers = {}
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
@@ -0,0 +1,34 @@
+import threading
+
+
+class RWWaitStats:
+    """Thread-safe counters of how long callers waited for a resource"""
+
+    def __init__(self, wait_threshold: float = 0.001) -> None:
+        self._lock = threading.Lock()
+        self._wait_threshold = wait_threshold
+        self.acquisitions = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def __repr__(self) -> str:
+        return "<{}: {} acquired, {} waited, mean {:.4f}s, max {:.4f}s>".format(
+            type(self).__name__,
+            self.acquisitions,
+            self.waits,
+            self.mean_wait,
+            self.max_wait,
+        )
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if wait >= self._wait_threshold:
+                self.waits += 1
@@ -0,0 +1,256 @@
+import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .models import RWTrip
+
+Time = Union[datetime.datetime, float]
+
+COLUMNS = ("id", "departure", "arrival", "travel_time", "distance", "min_price")
+
+
+def _epoch(value: Time) -> float:
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class RWTripTable:
+    """Columnar view of search results for vectorized queries
+
+    Holds one NumPy array per column: trip `id`, `departure`/`arrival`
+    as epoch seconds, `travel_time`, `distance`, and a trips x wagon
+    types matrix of prices and availability (price is NaN where the
+    trip has no such wagon type). `filter`, `sort` and `top_k` return
+    new tables, `to_trips` gives back the original `RWTrip` objects.
+
+    Requires numpy (`pip install tmrailwaysapi[table]`).
+    """
+
+    def __init__(self, trips: Sequence[RWTrip]) -> None:
+        if np is None:
+            raise ImportError(
+                "RWTripTable requires numpy, install tmrailwaysapi[table]"
+            )
+
+        trips = list(trips)
+        wagon_type_ids = sorted(
+            {wagon.id for trip in trips for wagon in trip.wagon_types}
+        )
+        positions = {wagon_type_id: i for i, wagon_type_id in enumerate(wagon_type_ids)}
+
+        prices = np.full((len(trips), len(wagon_type_ids)), np.nan)
+        available = np.zeros((len(trips), len(wagon_type_ids)), dtype=bool)
+
+        for row, trip in enumerate(trips):
+            for wagon in trip.wagon_types:
+                column = positions[wagon.id]
+                prices[row, column] = wagon.price
+                available[row, column] = wagon.has_seats
+
+        self._init(
+            trips,
+            np.arange(len(trips)),
+            {
+                "id": np.fromiter((trip.id for trip in trips), np.int64, len(trips)),
+                "departure": np.fromiter(
+                    (trip.departure_time.timestamp() for trip in trips),
+                    np.float64,
+                    len(trips),
+                ),
+                "arrival": np.fromiter(
+                    (trip.arrival_time.timestamp() for trip in trips),
+                    np.float64,
+                    len(trips),
+                ),
+                "travel_time": np.fromiter(
+                    (trip.travel_time for trip in trips), np.float64, len(trips)
+                ),
+                "distance": np.fromiter(
+                    (trip.distance for trip in trips), np.float64, len(trips)
+                ),
+            },
+            np.array(wagon_type_ids, dtype=np.int64),
+            prices,
+            available,
+        )
+
+    def _init(
+        self,
+        trips: List[RWTrip],
+        rows: "np.ndarray",
+        columns: Dict[str, "np.ndarray"],
+        wagon_type_ids: "np.ndarray",
+        prices: "np.ndarray",
+        available: "np.ndarray",
+    ) -> None:
+        self._trips = trips
+        self._rows = rows
+        self._columns = columns
+        self._positions = {
+            int(wagon_type_id): i for i, wagon_type_id in enumerate(wagon_type_ids)
+        }
+        self.wagon_type_ids = wagon_type_ids
+        self.prices = prices
+        self.available = available
+
+        # cheapest wagon type that still has seats, NaN if all are sold out
+        available_prices = np.where(available, prices, np.inf)
+        min_price = (
+            available_prices.min(axis=1)
+            if len(wagon_type_ids)
+            else np.full(len(rows), np.inf)
+        )
+        min_price[np.isinf(min_price)] = np.nan
+        self._columns["min_price"] = min_price
+
+    def _take(self, indices: "np.ndarray") -> "RWTripTable":
+        table = RWTripTable.__new__(RWTripTable)
+        table._init(
+            self._trips,
+            self._rows[indices],
+            {
+                name: column[indices]
+                for name, column in self._columns.items()
+                if name != "min_price"
+            },
+            self.wagon_type_ids,
+            self.prices[indices],
+            self.available[indices],
+        )
+        return table
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> RWTrip:
+        return self._trips[self._rows[index]]
+
+    def column(self, name: str) -> "np.ndarray":
+        """One of `COLUMNS`"""
+        return self._columns[name]
+
+    def get_prices(self, wagon_type_id: int) -> "np.ndarray":
+        """Price of `wagon_type_id` per trip, NaN where it is missing"""
+        return self.prices[:, self._positions[wagon_type_id]]
+
+    def get_available(self, wagon_type_id: int) -> "np.ndarray":
+        """Whether `wagon_type_id` has seats, per trip"""
+        return self.available[:, self._positions[wagon_type_id]]
+
+    def mask(
+        self,
+        departure_from: Optional[Time] = None,
+        departure_to: Optional[Time] = None,
+        arrival_to: Optional[Time] = None,
+        max_travel_time: Optional[float] = None,
+        max_distance: Optional[float] = None,
+        max_price: Optional[float] = None,
+        wagon_type_id: Optional[int] = None,
+    ) -> "np.ndarray":
+        """Boolean mask of trips matching every given criterion
+
+        With `wagon_type_id` only trips having seats in that wagon type
+        match and `max_price` applies to its price, otherwise
+        `max_price` applies to the cheapest available wagon type.
+        Naive datetimes are taken as local time, like `timestamp()`.
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if departure_from is not None:
+            mask &= self._columns["departure"] >= _epoch(departure_from)
+        if departure_to is not None:
+            mask &= self._columns["departure"] <= _epoch(departure_to)
+        if arrival_to is not None:
+            mask &= self._columns["arrival"] <= _epoch(arrival_to)
+        if max_travel_time is not None:
+            mask &= self._columns["travel_time"] <= max_travel_time
+        if max_distance is not None:
+            mask &= self._columns["distance"] <= max_distance
+
+        if wagon_type_id is not None:
+            if wagon_type_id not in self._positions:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.get_available(wagon_type_id)
+            prices = self.get_prices(wagon_type_id)
+        else:
+            prices = self._columns["min_price"]
+
+        if max_price is not None:
+            # NaN compares False, so sold out trips drop out
+            mask &= prices <= max_price
+
+        return mask
+
+    def filter(self, mask: Optional["np.ndarray"] = None, **criteria) -> "RWTripTable":
+        """Trips where `mask` is true, or matching `mask(**criteria)`"""
+        if mask is None:
+            mask = self.mask(**criteria)
+        elif criteria:
+            mask = mask & self.mask(**criteria)
+        return self._take(np.flatnonzero(mask))
+
+    def _get_key(self, by: str, wagon_type_id: Optional[int]) -> "np.ndarray":
+        if by == "price" and wagon_type_id is not None:
+            return self.get_prices(wagon_type_id)
+        if by == "price":
+            return self._columns["min_price"]
+        return self._columns[by]
+
+    def argsort(
+        self,
+        by: str = "departure",
+        descending: bool = False,
+        wagon_type_id: Optional[int] = None,
+    ) -> "np.ndarray":
+        """Stable ordering by a column, NaN prices go last either way
+
+        `by` is one of `COLUMNS` or "price" (of `wagon_type_id`
+        if given, else the cheapest available wagon type).
+        """
+        key = self._get_key(by, wagon_type_id)
+        if descending:
+            key = -key
+        return np.argsort(key, kind="stable")
+
+    def sort(
+        self,
+        by: str = "departure",
+        descending: bool = False,
+        wagon_type_id: Optional[int] = None,
+    ) -> "RWTripTable":
+        return self._take(self.argsort(by, descending, wagon_type_id))
+
+    def top_k(
+        self,
+        k: int,
+        by: str = "price",
+        descending: bool = False,
+        wagon_type_id: Optional[int] = None,
+    ) -> "RWTripTable":
+        """First `k` trips of `sort(by, ...)` without sorting the rest"""
+        if k >= len(self):
+            return self.sort(by, descending, wagon_type_id)
+        if k <= 0:
+            return self._take(np.arange(0))
+
+        key = self._get_key(by, wagon_type_id)
+        if descending:
+            key = -key
+
+        threshold = key[np.argpartition(key, k - 1)[k - 1]]
+        if np.isnan(threshold):
+            # fewer than k trips have a value, nothing to skip
+            return self.sort(by, descending, wagon_type_id)
+
+        # keep every tie at the boundary so the result matches `sort`
+        candidates = np.flatnonzero(key <= threshold)
+        order = candidates[np.argsort(key[candidates], kind="stable")]
+        return self._take(order[:k])
+
+    def to_trips(self) -> List[RWTrip]:
+        return [self._trips[row] for row in self._rows]
@@ -0,0 +1,319 @@
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .models import RWSeats, RWTrip, RWWagon
+from .seat_diff import RWSeatTracker, RWTripSeatsDiff
+
+if TYPE_CHECKING:
+    from .async_client import RWAsyncClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RWPollPolicy:
+    """How often a watched trip is polled, in seconds
+
+    The interval is capped by `departure_factor` times the time left
+    until departure (bounded by `min_interval` and `max_interval`), so
+    trips leaving soon are polled more often. Within that cap it
+    shrinks by `speedup` after a poll that saw changes and grows by
+    `slowdown` after one that did not (or failed).
+
+    Polls closer together than the response cache's "seats" ttl are
+    served from the cache, keep `min_interval` at or above it.
+    """
+
+    min_interval: float = 10.0
+    max_interval: float = 600.0
+    departure_factor: float = 0.01
+    speedup: float = 0.5
+    slowdown: float = 1.5
+
+    def get_interval(
+        self, previous: Optional[float], changed: bool, time_to_departure: float
+    ) -> float:
+        cap = min(
+            self.max_interval,
+            max(self.min_interval, time_to_departure * self.departure_factor),
+        )
+
+        if previous is None:
+            interval = cap
+        elif changed:
+            interval = previous * self.speedup
+        else:
+            interval = previous * self.slowdown
+
+        return min(cap, max(self.min_interval, interval))
+
+
+class RWWatch(NamedTuple):
+    trip: RWTrip
+    wagon: RWWagon
+    adults: int
+    children: int = 0
+
+    def get_key(self) -> Tuple:
+        return (self.trip.id, self.wagon.id, self.adults, self.children)
+
+
+class RWSeatEvent(NamedTuple):
+    """Availability of a watched trip changed"""
+
+    watch: RWWatch
+    seats: RWSeats
+    diff: RWTripSeatsDiff
+    next_poll_in: float
+
+
+class _WatchState:
+    __slots__ = ["watch", "tracker", "interval"]
+
+    def __init__(self, watch: RWWatch) -> None:
+        self.watch = watch
+        self.tracker = RWSeatTracker()
+        self.interval: Optional[float] = None
+
+
+_CLOSED = object()
+
+
+class RWSubscription:
+    """Async iterator over the events published by `RWSeatWatcher`
+
+    Events are buffered in a bounded queue: once it is full the
+    watcher waits for this subscriber before publishing more, so a
+    slow consumer slows polling down instead of piling up events.
+    Closing the subscription releases a publish waiting on it.
+    """
+
+    def __init__(self, watcher: "RWSeatWatcher", maxsize: int) -> None:
+        self._watcher = watcher
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._closed = asyncio.Event()
+
+    def __aiter__(self) -> AsyncIterator[RWSeatEvent]:
+        return self
+
+    async def __anext__(self) -> RWSeatEvent:
+        if self._closed.is_set() and self._queue.empty():
+            raise StopAsyncIteration
+
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise StopAsyncIteration
+        return event
+
+    async def _put(self, event: RWSeatEvent) -> None:
+        if self._closed.is_set():
+            return
+        if not self._queue.full():
+            self._queue.put_nowait(event)
+            return
+
+        put = asyncio.ensure_future(self._queue.put(event))
+        closed = asyncio.ensure_future(self._closed.wait())
+        try:
+            await asyncio.wait({put, closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            put.cancel()
+            closed.cancel()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        self._watcher._subscriptions.discard(self)
+        # wake up a consumer waiting on an empty queue
+        if not self._queue.full():
+            self._queue.put_nowait(_CLOSED)
+
+
+class RWSeatWatcher:
+    """Poll many trips for seat availability on one schedule
+
+    Watched trips sit in a heap ordered by their next poll time. One
+    dispatcher pops due trips and polls them through
+    `RWAsyncClient.get_seats`, never running more than `concurrency`
+    polls at once, then reschedules each with `RWPollPolicy`. Trips
+    are dropped once they depart.
+
+    Changes (see `RWSeatTracker`) are published to every subscription,
+    the first poll of a trip reports all its free seats.
+
+    async with RWSeatWatcher(client) as watcher:
+        watcher.watch(trip, wagon, adults=2)
+        async for event in watcher.subscribe():
+            ...
+    """
+
+    def __init__(
+        self,
+        client: "RWAsyncClient",
+        concurrency: int = 8,
+        policy: Optional[RWPollPolicy] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._client = client
+        self._concurrency = concurrency
+        self._policy = policy or RWPollPolicy()
+        self._clock = clock
+
+        self._states: Dict[Tuple, _WatchState] = {}
+        self._heap: List[Tuple[float, int, _WatchState]] = []
+        self._sequence = 0
+        self._subscriptions: Set[RWSubscription] = set()
+        self._polls: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    async def __aenter__(self) -> "RWSeatWatcher":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def _schedule(self, state: _WatchState, delay: float) -> None:
+        self._sequence += 1
+        due = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._heap, (due, self._sequence, state))
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def watch(
+        self, trip: RWTrip, wagon: RWWagon, adults: int, children: int = 0
+    ) -> RWWatch:
+        """Start polling `trip`/`wagon`, right away"""
+        watch = RWWatch(trip, wagon, adults, children)
+        key = watch.get_key()
+
+        if key not in self._states:
+            state = _WatchState(watch)
+            self._states[key] = state
+            self._schedule(state, 0)
+
+        return watch
+
+    def unwatch(self, watch: RWWatch) -> None:
+        # its heap entry is skipped when popped
+        self._states.pop(watch.get_key(), None)
+
+    def subscribe(self, maxsize: int = 64) -> RWSubscription:
+        subscription = RWSubscription(self, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def _publish(self, event: RWSeatEvent) -> None:
+        for subscription in list(self._subscriptions):
+            await subscription._put(event)
+
+    def _get_time_to_departure(self, watch: RWWatch) -> float:
+        return watch.trip.departure_time.timestamp() - self._clock()
+
+    def _update_interval(self, state: _WatchState, changed: bool) -> None:
+        time_to_departure = self._get_time_to_departure(state.watch)
+
+        if time_to_departure <= 0:
+            self.unwatch(state.watch)
+            state.interval = None
+        else:
+            state.interval = self._policy.get_interval(
+                state.interval, changed, time_to_departure
+            )
+
+    async def _update(self, state: _WatchState) -> None:
+        watch = state.watch
+        seats = await self._client.get_seats(
+            watch.trip, watch.wagon, watch.adults, watch.children
+        )
+        diff = state.tracker.update(seats.outbound)
+        self._update_interval(state, diff.changed)
+
+        if diff.changed:
+            # a full subscriber holds this poll, and its share of the
+            # concurrency budget, until it catches up
+            await self._publish(RWSeatEvent(watch, seats, diff, state.interval or 0))
+
+    async def _poll(self, state: _WatchState) -> None:
+        watch = state.watch
+
+        try:
+            await self._update(state)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Failed to poll seats of %r", watch.trip, exc_info=True)
+            # polled again as after a poll without changes
+            self._update_interval(state, False)
+
+        if state.interval is not None and self._states.get(watch.get_key()) is state:
+            self._schedule(state, state.interval)
+
+    async def run(self) -> None:
+        """Dispatch polls until cancelled"""
+        loop = asyncio.get_running_loop()
+        budget = asyncio.Semaphore(self._concurrency)
+        self._wakeup = asyncio.Event()
+
+        def release(task: asyncio.Task) -> None:
+            self._polls.discard(task)
+            budget.release()
+
+        while True:
+            while self._heap and self._heap[0][0] <= loop.time():
+                _, _, state = heapq.heappop(self._heap)
+                if self._states.get(state.watch.get_key()) is not state:
+                    continue
+
+                await budget.acquire()
+                task = asyncio.ensure_future(self._poll(state))
+                self._polls.add(task)
+                task.add_done_callback(release)
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - loop.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def close(self) -> None:
+        """Stop polling and end every subscription"""
+        tasks = list(self._polls)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for subscription in list(self._subscriptions):
+            subscription.close()